@@ -10,7 +10,9 @@ import os, sys, re, yaml, time, stat, shutil, socket, argparse, platform, subpro
 from pathlib import Path
 from urllib.parse import quote_plus
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ckecker import connect_scan
 
 # ───── ثابت‌ها
 SUB_PORT, SUB_URL = 25500, "http://127.0.0.1:25500"
@@ -20,9 +22,7 @@ UUID_RE = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]
 
 # ───── ابزار
 def tcp_ok(host:str, port:int, timeout=2.0)->bool:
-    try:  # noqa: E722
-        with socket.create_connection((host, port), timeout): return True
-    except: return False
+    return connect_scan.connect(host, port, timeout).ok
 def uid_ok(v): return bool(UUID_RE.fullmatch(v.strip()))
 def port_ok(p): return str(p).isdigit() and 0<int(p)<65536
 
@@ -81,16 +81,15 @@ def fetch_yaml(urls:list[str])->str:
 def build(proxies):
     alive, dead, cnt = [], [], defaultdict(int)
     print(f"[INFO] تست TCP همزمان ({len(proxies)} نود)…")
-    def task(p): return p, tcp_ok(p["server"], int(p["port"]), 2)
-    with ThreadPoolExecutor(max_workers=40) as pool:
-        futs=[pool.submit(task,p) for p in proxies if node_valid(p)]
-        total=len(futs)
-        for i,f in enumerate(as_completed(futs),1):
-            p,ok=f.result()
-            base=p["name"]; cnt[base]+=1
-            if cnt[base]>1: p["name"]=f"{base} ({cnt[base]})"
-            (alive if ok else dead).append(p)
-            if i%20==0 or i==total: print(f"  … {i}/{total} تست شد")
+    valid=[p for p in proxies if node_valid(p)]; total=len(valid)
+    # همهٔ اتصال‌ها با یک اسکنر غیرمسدود (بدون thread برای هر نود)
+    scan=connect_scan.iter_scan(((p["server"], int(p["port"])) for p in valid), timeout=2)
+    for i,(j,res) in enumerate(scan,1):
+        p,ok=valid[j],res.ok
+        base=p["name"]; cnt[base]+=1
+        if cnt[base]>1: p["name"]=f"{base} ({cnt[base]})"
+        (alive if ok else dead).append(p)
+        if i%20==0 or i==total: print(f"  … {i}/{total} تست شد")
     if not alive: sys.exit("⛔ Alive پیدا نشد!")
     groups=[
         {"name":"Alive","type":"url-test","url":"http://www.gstatic.com/generate_204",
@@ -9,16 +9,18 @@ Provides functions for IP checks, connectivity tests, and batch health scans.
 from .health import (
     is_ip, resolve_host,
     tcp_check, tls_check, ws_check, udp_check, vmess_check,
-    check_node, health_check_nodes
+    check_node, health_check_nodes,
+    check_node_async, iter_health_checks, health_check_nodes_async, liveness_stage, EndpointGroups
 )
 from .ping import ping_host, ping_hosts
 from .region import get_country, ensure_geolite_db
-from .validator import validate_config, validate_configs
+from .validator import validate_config, validate_configs, validate_many, invalid_configs
 
 __all__ = [
     "is_ip", "resolve_host",
     "tcp_check", "tls_check", "ws_check", "udp_check", "vmess_check",
-    "check_node", "health_check_nodes"
+    "check_node", "health_check_nodes",
+    "check_node_async", "iter_health_checks", "health_check_nodes_async", "liveness_stage", "EndpointGroups"
     , "ping_host", "ping_hosts"
-    , "get_country", "ensure_geolite_db", "validate_config", "validate_configs"
+    , "get_country", "ensure_geolite_db", "validate_config", "validate_configs", "validate_many", "invalid_configs"
 ]
@@ -0,0 +1,162 @@
+"""
+Single-thread non-blocking TCP connect scanner.
+
+Every target gets a non-blocking socket whose connect() is started at once;
+a selector (epoll on Linux) reports completion, SO_ERROR tells success from
+refusal, and the socket is closed immediately (RST, no TIME_WAIT). Thousands of
+connects are in flight from one thread, so this is the cheapest liveness stage:
+it only proves that something accepts TCP on host:port.  Hostnames are
+resolved before the first connect (concurrently, through the shared resolver),
+so no DNS lookup ever blocks the selector loop.
+"""
+import errno
+import selectors
+import socket
+import struct
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover
+    resource = None
+
+from .resolver import default_resolver
+
+MAX_OPEN = 4096 if hasattr(selectors, "EpollSelector") or hasattr(selectors, "KqueueSelector") else 500
+TIMEOUT = 2.0
+_IN_PROGRESS = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, 10035}  # 10035: WSAEWOULDBLOCK
+_LINGER_RST = struct.pack("ii", 1, 0)
+_FILL_STEP = 64     # connects started between two polls, so RTTs are not inflated by a long fill
+
+
+class ConnectResult(NamedTuple):
+    ok: bool
+    rtt_ms: Optional[float]     # connect() → writable, in ms (None if it never completed)
+    error: Optional[str]        # errno name / "timed out" / "resolve_failed"
+    ip: Optional[str] = None    # address actually connected to
+
+
+def raise_nofile_limit(wanted: int) -> None:
+    """Each open probe holds a descriptor; lift the soft fd limit towards the hard one."""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = wanted + 256 if hard == resource.RLIM_INFINITY else min(wanted + 256, hard)
+    if soft != resource.RLIM_INFINITY and soft < target:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def _address(host: str, port: int, ips: Dict[str, Optional[str]]) -> Optional[tuple]:
+    """(family, sockaddr) for host:port from the prefetched host → ip map."""
+    ip = ips.get(host)
+    if ip is None:
+        return None
+    return (socket.AF_INET6 if ":" in ip else socket.AF_INET), (ip, port)
+
+
+def _close(sock: socket.socket, reset: bool) -> None:
+    if reset:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RST)
+        except OSError:
+            pass
+    sock.close()
+
+
+def iter_scan(targets: Iterable[Tuple[str, int]], timeout: float = TIMEOUT,
+              max_open: int = MAX_OPEN) -> Iterator[Tuple[int, ConnectResult]]:
+    """
+    Yield (index, ConnectResult) for each (host, port) as its connect settles.
+    At most *max_open* sockets are open at a time.  The targets are read up front
+    so every hostname can be resolved before the first connect.
+    """
+    raise_nofile_limit(max_open)
+    targets = list(targets)
+    ips = default_resolver().prefetch(host for host, _ in targets)
+    source = enumerate(targets)
+    sel = selectors.DefaultSelector()
+    # same timeout for everyone → start order is deadline order
+    started: deque = deque()
+    exhausted = False
+    try:
+        while True:
+            room = min(max_open - len(sel.get_map()), _FILL_STEP)
+            while not exhausted and room > 0:
+                item = next(source, None)
+                if item is None:
+                    exhausted = True
+                    break
+                i, (host, port) = item
+                addr = _address(host, int(port), ips)
+                if addr is None:
+                    yield i, ConnectResult(False, None, "resolve_failed")
+                    continue
+                sock = socket.socket(addr[0], socket.SOCK_STREAM)
+                sock.setblocking(False)
+                start = time.perf_counter()
+                err = sock.connect_ex(addr[1])
+                if err not in _IN_PROGRESS:
+                    sock.close()
+                    yield i, ConnectResult(False, None, errno.errorcode.get(err, str(err)), addr[1][0])
+                    continue
+                sel.register(sock, selectors.EVENT_WRITE, (i, start, addr[1][0]))
+                started.append((start + timeout, sock))
+                room -= 1
+
+            if not sel.get_map():
+                if exhausted:
+                    return
+                continue
+            # drop sockets that already settled, then wait until the oldest deadline
+            while started and started[0][1].fileno() == -1:
+                started.popleft()
+            if not exhausted and len(sel.get_map()) < max_open:
+                wait = 0.0      # more to start: just harvest what is ready
+            else:
+                wait = max(0.0, started[0][0] - time.perf_counter()) if started else timeout
+            for key, _ in sel.select(wait):
+                sock = key.fileobj
+                i, start, ip = key.data
+                rtt = (time.perf_counter() - start) * 1000
+                sel.unregister(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                _close(sock, reset=not err)
+                if err:
+                    yield i, ConnectResult(False, None, errno.errorcode.get(err, str(err)), ip)
+                else:
+                    yield i, ConnectResult(True, rtt, None, ip)
+            now = time.perf_counter()
+            while started and (started[0][1].fileno() == -1 or started[0][0] <= now):
+                _, sock = started.popleft()
+                if sock.fileno() == -1:
+                    continue
+                i, _, ip = sel.get_key(sock).data
+                sel.unregister(sock)
+                sock.close()
+                yield i, ConnectResult(False, None, "timed out", ip)
+    finally:
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+
+
+def scan(targets: Iterable[Tuple[str, int]], timeout: float = TIMEOUT,
+         max_open: int = MAX_OPEN) -> List[ConnectResult]:
+    """ConnectResult per (host, port), in input order."""
+    results: Dict[int, ConnectResult] = {}
+    for i, result in iter_scan(targets, timeout, max_open):
+        results[i] = result
+    return [results[i] for i in range(len(results))]
+
+
+def connect(host: str, port: int, timeout: float = TIMEOUT) -> ConnectResult:
+    """Single-target scan; same non-blocking path, no thread held while waiting."""
+    return scan([(host, port)], timeout)[0]
+
+
+__all__ = ["ConnectResult", "iter_scan", "scan", "connect", "raise_nofile_limit", "MAX_OPEN"]
@@ -1,8 +1,14 @@
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import json, socket, ssl, http.client, time, ipaddress, subprocess, shutil, re
+import json, socket, ssl, http.client, time, ipaddress
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from parsers.node import as_dict, set_meta
+from ckecker import connect_scan, nmap_batch, resolver
 
 # ───────────────────────────── Setup logging
 logger = logging.getLogger("health_checker")
@@ -23,7 +29,8 @@ except Exception as e:
     raise
 
 # ───────────────────────────── Nmap availability
-NMAP_PATH = shutil.which("nmap")
+# Concurrent tcp_check/udp_check calls share nmap runs through nmap_batch.default_scanner()
+NMAP_PATH = nmap_batch.NMAP_PATH
 if not NMAP_PATH:
     logger.warning("nmap not found in PATH, falling back to socket checks")
 
@@ -36,34 +43,28 @@ def is_ip(addr: str) -> bool:
         return False
 
 def resolve_host(host: str) -> Optional[str]:
-    if is_ip(host):
-        return host
-    try:
-        ip = socket.gethostbyname(host)
-        logger.debug(f"Resolved {host} → {ip}")
-        return ip
-    except Exception as e:
-        logger.warning(f"DNS resolution failed for {host}: {e}")
-        return None
+    """IPv4 for host through the shared TTL cache (resolver.default_resolver)."""
+    return resolver.default_resolver().resolve(host)
 
 # ───────────────────────────── Checkers
 def tcp_check(host: str, port: int, timeout: float, **_) -> bool:
-    """Use nmap TCP scan if available, else fallback to socket."""
+    """Use a batched nmap TCP scan if available, else fallback to socket."""
     if NMAP_PATH:
-        cmd = [NMAP_PATH, "-Pn", "-p", str(port), host]
         try:
-            out = subprocess.check_output(cmd, stderr=subprocess.DEVNULL, text=True, timeout=timeout+5)
-            # match lines like 'PORT STATE SERVICE'
-            match = re.search(rf"{port}/tcp\s+open", out)
-            return bool(match)
+            return nmap_batch.default_scanner().check(host, port, "tcp", timeout)
         except Exception:
             return False
-    # fallback
-    with socket.create_connection((host, port), timeout):
-        return True
+    # fallback: non-blocking connect, no thread parked in create_connection
+    result = connect_scan.connect(host, port, timeout)
+    if not result.ok:
+        raise ConnectionError(result.error)
+    return True
 
-def tls_check(host: str, port: int, timeout: float, server_name: Optional[str] = None, **_) -> bool:
+def tls_check(host: str, port: int, timeout: float, server_name: Optional[str] = None, insecure=False, **_) -> bool:
     ctx = ssl.create_default_context()
+    if insecure:
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
     with ctx.wrap_socket(socket.create_connection((host, port), timeout), server_hostname=server_name or host):
         return True
 
@@ -78,13 +79,10 @@ def ws_check(host: str, port: int, timeout: float, use_tls=False, path="/", head
         conn.close()
 
 def udp_check(host: str, port: int, timeout: float, payload=b"", expect_reply=False, **_) -> bool:
-    # Use nmap UDP scan if available
+    # Use a batched nmap UDP scan if available ("open|filtered" counts, as before)
     if NMAP_PATH:
-        cmd = [NMAP_PATH, "-Pn", "-sU", "-p", str(port), host]
         try:
-            out = subprocess.check_output(cmd, stderr=subprocess.DEVNULL, text=True, timeout=timeout+5)
-            match = re.search(rf"{port}/udp\s+open", out)
-            return bool(match)
+            return nmap_batch.default_scanner().check(host, port, "udp", timeout)
         except Exception:
             return False
     # fallback to socket
@@ -112,40 +110,257 @@ def vmess_check(host, port, timeout, transport="tcp", path="/", tls=False, heade
 
 CHECKERS["vmess_check"] = vmess_check
 
+# ───────────────────────────── Async checkers
+# Same contracts as the blocking checkers: return True or raise.  The caller
+# (check_node_async) bounds every probe with its deadline.  With nmap installed,
+# plain tcp_check / udp_check probes are queued on nmap_batch.default_scanner(),
+# so the probes in flight share a few batched nmap runs; the rest use sockets.
+_SSL_CONTEXTS: Dict[bool, ssl.SSLContext] = {}
+
+def _ssl_context(insecure: bool) -> ssl.SSLContext:
+    """Built once per mode: create_default_context() reloads the CA bundle each call."""
+    ctx = _SSL_CONTEXTS.get(insecure)
+    if ctx is None:
+        ctx = ssl.create_default_context()
+        if insecure:
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+        _SSL_CONTEXTS[insecure] = ctx
+    return ctx
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (OSError, ssl.SSLError):
+        pass
+
+async def tcp_check_async(host: str, port: int, timeout: float, **_) -> bool:
+    _, writer = await asyncio.open_connection(host, port)
+    await _close(writer)
+    return True
+
+async def tls_check_async(host: str, port: int, timeout: float, server_name: Optional[str] = None,
+                          insecure=False, **_) -> bool:
+    _, writer = await asyncio.open_connection(host, port, ssl=_ssl_context(insecure),
+                                              server_hostname=server_name or host)
+    await _close(writer)
+    return True
+
+async def ws_check_async(host: str, port: int, timeout: float, use_tls=False, path="/", headers=None,
+                         server_name: Optional[str] = None, **_) -> bool:
+    # host may be the resolved IP; server_name (the node's hostname) is used for SNI and Host
+    name = server_name or host
+    ctx = _ssl_context(False) if use_tls else None
+    reader, writer = await asyncio.open_connection(host, port, ssl=ctx, server_hostname=name if ctx else None)
+    try:
+        headers = headers or {}
+        host_header = next((v for k, v in headers.items() if k.lower() == "host"), name)
+        lines = [f"GET {path} HTTP/1.1", f"Host: {host_header}", "Connection: close"]
+        lines += [f"{k}: {v}" for k, v in headers.items() if k.lower() != "host"]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+        await writer.drain()
+        status = await reader.readline()
+        if not status.startswith(b"HTTP/"):
+            raise http.client.BadStatusLine(status.decode(errors="replace").strip())
+        return True
+    finally:
+        await _close(writer)
+
+class _UDPProbe(asyncio.DatagramProtocol):
+    def __init__(self, reply: asyncio.Future):
+        self.reply = reply
+
+    def datagram_received(self, data, addr):
+        if not self.reply.done():
+            self.reply.set_result(data)
+
+    def error_received(self, exc):
+        if not self.reply.done():
+            self.reply.set_exception(exc)
+
+async def udp_check_async(host: str, port: int, timeout: float, payload=b"", expect_reply=False, **_) -> bool:
+    loop = asyncio.get_running_loop()
+    reply = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(lambda: _UDPProbe(reply), remote_addr=(host, port))
+    try:
+        transport.sendto(payload)
+        if expect_reply:
+            await reply
+        return True
+    finally:
+        transport.close()
+
+async def vmess_check_async(host, port, timeout, transport="tcp", path="/", tls=False, headers=None,
+                            server_name=None, insecure=False, **_) -> bool:
+    if transport in ("ws", "ws+tls"):
+        return await ws_check_async(host, port, timeout, use_tls=tls or transport.endswith("+tls"),
+                                    path=path, headers=headers, server_name=server_name)
+    if tls:
+        return await tls_check_async(host, port, timeout, server_name=server_name, insecure=insecure)
+    return await tcp_check_async(host, port, timeout)
+
+async def _nmap_check_async(host: str, port: int, timeout: float, proto: str) -> bool:
+    # the scanner's batch threads run nmap; this coroutine only waits on its future
+    state = await asyncio.wrap_future(nmap_batch.default_scanner().submit(host, port, proto, timeout))
+    if not state.startswith("open"):     # udp "open|filtered" counts, as in udp_check
+        raise ConnectionError(f"nmap: {state}")
+    return True
+
+async def nmap_tcp_check_async(host: str, port: int, timeout: float, **_) -> bool:
+    return await _nmap_check_async(host, port, timeout, "tcp")
+
+async def nmap_udp_check_async(host: str, port: int, timeout: float, **_) -> bool:
+    return await _nmap_check_async(host, port, timeout, "udp")
+
+ASYNC_CHECKERS: Dict[str, Callable[..., Awaitable[bool]]] = {
+    "tcp_check": nmap_tcp_check_async if NMAP_PATH else tcp_check_async,
+    "tls_check": tls_check_async,
+    "ws_check": ws_check_async,
+    "udp_check": nmap_udp_check_async if NMAP_PATH else udp_check_async,
+    "vmess_check": vmess_check_async,
+}
+_NMAP_CHECKERS = ("tcp_check", "udp_check") if NMAP_PATH else ()
+
+def _deadline(checker_name: str, timeout: float) -> float:
+    """Probe deadline: *timeout*, or for nmap probes the batch window plus the nmap run bound."""
+    if checker_name in _NMAP_CHECKERS:
+        scanner = nmap_batch.default_scanner()
+        return scanner.window + scanner.wait_time(timeout)
+    return timeout
+
+async def resolve_host_async(host: str) -> Optional[str]:
+    """Cached and coalesced: concurrent probes of one hostname share a single lookup."""
+    return await resolver.default_resolver().resolve_async(host)
+
 # ───────────────────────────── Core checker
-def check_node(node: Dict[str, Any], timeout_default=3.0) -> Dict[str, Any]:
-    cfg = node.get("config", {})
-    proto = (cfg.get("type") or node.get("type") or "").lower()
-    host = cfg.get("server")
-    port = cfg.get("port")
-
-    if not host or not port:
-        logger.error(f"[{proto}] missing host/port")
-        return {"ok": False, "reason": "missing_host_or_port"}
-
-    schema = PROTOCOLS.get(proto)
-    if not schema:
-        logger.error(f"[{proto}] unsupported protocol")
-        return {"ok": False, "reason": f"unknown_protocol:{proto}"}
-
-    timeout = cfg.get("timeout") or schema.get("timeout") or timeout_default
-    ip = resolve_host(host)
-    if not ip:
-        return {"ok": False, "reason": "resolve_failed", "host": host, "port": port}
+CONCURRENCY = 2000   # probes in flight in the async engine
+
+class _Probe:
+    """What check_node needs to probe a node, or the early result when it cannot."""
+    __slots__ = ("original", "node", "proto", "host", "port", "timeout", "checker_name", "result")
+
+    def __init__(self, node: Dict[str, Any], timeout_default: float):
+        self.original = node               # results (meta latency) go back onto the caller's object
+        self.node = node = as_dict(node)   # ProxyNode → dict (a copy)
+        self.result: Optional[Dict[str, Any]] = None
+        cfg = node.get("config", {})
+        self.proto = proto = (cfg.get("type") or node.get("type") or "").lower()
+        self.host = host = cfg.get("server")
+        self.port = port = cfg.get("port")
+        if not host or not port:
+            logger.error(f"[{proto}] missing host/port")
+            self.result = {"ok": False, "reason": "missing_host_or_port"}
+            return
+        schema = PROTOCOLS.get(proto)
+        if not schema:
+            logger.error(f"[{proto}] unsupported protocol")
+            self.result = {"ok": False, "reason": f"unknown_protocol:{proto}"}
+            return
+        self.timeout = cfg.get("timeout") or schema.get("timeout") or timeout_default
+        self.checker_name = schema["checker"]
+        if self.checker_name not in CHECKERS:
+            logger.error(f"[{proto}] missing checker '{self.checker_name}'")
+            self.result = {"ok": False, "reason": f"checker_not_found:{self.checker_name}", "host": host}
+
+    def extra(self) -> Dict[str, Any]:
+        # plain tcp_check ignores them; skipping keeps parsers.LazyNode undecoded
+        if self.checker_name == "tcp_check":
+            return {}
+        return _checker_args(self.node.get("config", {}), PROTOCOLS[self.proto], self.checker_name)
+
+    def ok(self, ip: str, latency: int) -> Dict[str, Any]:
+        logger.info(f"[{self.proto}] ✅ {self.host}:{self.port} ({latency}ms)")
+        set_meta(self.original, "latency_ms", latency)
+        return {"ok": True, "host": self.host, "ip": ip, "port": self.port, "latency_ms": latency}
+
+    def fail(self, ip: str, reason: str) -> Dict[str, Any]:
+        logger.warning(f"[{self.proto}] ❌ {self.host}:{self.port} → {reason}")
+        return {"ok": False, "host": self.host, "ip": ip, "port": self.port, "reason": reason}
+
+# checkers that send the hostname (SNI / Host); for the others it would only split endpoint groups
+_NAMED_CHECKERS = ("tls_check", "ws_check", "vmess_check")
+
+async def _run_probe(checker_name: str, ip: str, port: int, timeout: float,
+                     extra: Dict[str, Any]) -> Tuple[Optional[int], Optional[str]]:
+    """(latency_ms, None) or (None, reason); the whole probe is bounded by _deadline()."""
+    try:
+        start = time.monotonic()
+        await asyncio.wait_for(ASYNC_CHECKERS[checker_name](ip, port, timeout, **extra),
+                               _deadline(checker_name, timeout))
+        return int((time.monotonic() - start) * 1000), None
+    except asyncio.TimeoutError:
+        return None, "timed out"
+    except Exception as e:
+        return None, str(e)
+
+class EndpointGroups:
+    """
+    One probe per (resolved IP, port, probe kind) within a run.  Nodes that differ
+    only in credentials or name cannot be told apart by a TCP/TLS/WS probe, so the
+    first one starts it and the rest await the same task.  The probe kind is the
+    checker plus every argument it receives (SNI, path, Host, payload, timeout …).
+    """
+
+    def __init__(self):
+        self._probes: Dict[Tuple, "asyncio.Task"] = {}
+        self.nodes = 0
+
+    @property
+    def probes(self) -> int:
+        return len(self._probes)
+
+    @property
+    def reduction(self) -> float:
+        return self.nodes / self.probes if self.probes else 1.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {"nodes": self.nodes, "probes": self.probes, "reduction": round(self.reduction, 2)}
+
+    async def cancel(self) -> None:
+        """Cancel the probes still running (their members were shielded from it) and wait for them."""
+        running = [t for t in self._probes.values() if not t.done()]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
 
-    checker_name = schema["checker"]
-    checker = CHECKERS.get(checker_name)
-    if not checker:
-        logger.error(f"[{proto}] missing checker '{checker_name}'")
-        return {"ok": False, "reason": f"checker_not_found:{checker_name}", "host": host}
+    async def probe(self, checker_name: str, ip: str, port: int, timeout: float,
+                    extra: Dict[str, Any]) -> Tuple[Optional[int], Optional[str]]:
+        self.nodes += 1
+        key = (ip, port, checker_name, timeout, repr(sorted(extra.items())))
+        task = self._probes.get(key)
+        if task is None:
+            task = self._probes[key] = asyncio.ensure_future(_run_probe(checker_name, ip, port, timeout, extra))
+        # shielded: one member's cancellation must not cancel the probe for the others
+        return await asyncio.shield(task)
 
-    # Extra args
+async def check_node_async(node: Dict[str, Any], timeout_default=3.0,
+                           endpoints: Optional[EndpointGroups] = None) -> Dict[str, Any]:
+    """One node; with *endpoints*, nodes sharing IP:port and probe kind share one probe."""
+    probe = _Probe(node, timeout_default)
+    if probe.result:
+        return probe.result
+    ip = await resolve_host_async(probe.host)
+    if not ip:
+        return {"ok": False, "reason": "resolve_failed", "host": probe.host, "port": probe.port}
+    extra = probe.extra()
+    if probe.checker_name in _NAMED_CHECKERS:
+        extra.setdefault("server_name", probe.host)   # connect to the resolved IP, keep the name for SNI/Host
+    if endpoints is not None:
+        latency, reason = await endpoints.probe(probe.checker_name, ip, probe.port, probe.timeout, extra)
+    else:
+        latency, reason = await _run_probe(probe.checker_name, ip, probe.port, probe.timeout, extra)
+    return probe.ok(ip, latency) if reason is None else probe.fail(ip, reason)
+
+def _checker_args(cfg: Dict[str, Any], schema: Dict[str, Any], checker_name: str) -> Dict[str, Any]:
     extra: Dict[str, Any] = {}
-    transport = cfg.get("transport", {}).get("type", schema.get("transports", [None])[0])
+    transport_cfg = cfg.get("transport") or {}
+    transport = transport_cfg.get("type", schema.get("transports", [None])[0])
     if transport:
         extra["transport"] = transport
-        extra["path"] = cfg.get("transport", {}).get("path", "/")
-        extra["headers"] = cfg.get("transport", {}).get("headers")
+        extra["path"] = transport_cfg.get("path") or "/"
+        extra["headers"] = transport_cfg.get("headers") or (
+            {"Host": transport_cfg["host"]} if transport_cfg.get("host") else None)
         extra["tls"] = transport.endswith("+tls")
 
     if checker_name == "udp_check":
@@ -158,34 +373,139 @@ def check_node(node: Dict[str, Any], timeout_default=3.0) -> Dict[str, Any]:
 
     if schema.get("tls_supported"):
         extra["tls"] = extra.get("tls") or cfg.get("tls", {}).get("enabled", False)
+    tls_cfg = cfg.get("tls") or {}
+    if tls_cfg.get("sni"):
+        extra["server_name"] = tls_cfg["sni"]
+    if tls_cfg.get("insecure"):
+        extra["insecure"] = True
+    return extra
 
+# ───────────────────────────── Async engine
+async def _indexed(i: int, node: Dict[str, Any], timeout_default: float,
+                   endpoints: Optional[EndpointGroups]) -> Tuple[int, Dict[str, Any]]:
     try:
-        start = time.time()
-        ok = checker(host, port, timeout, **extra)
-        latency = int((time.time() - start) * 1000)
-        logger.info(f"[{proto}] ✅ {host}:{port} ({latency}ms)")
-        node.setdefault("meta", {})["latency_ms"] = latency
-        return {"ok": True, "host": host, "ip": ip, "port": port, "latency_ms": latency}
+        return i, await check_node_async(node, timeout_default, endpoints)
     except Exception as e:
-        logger.warning(f"[{proto}] ❌ {host}:{port} → {e}")
-        return {"ok": False, "host": host, "ip": ip, "port": port, "reason": str(e)}
-
-# ───────────────────────────── Parallel execution
-def health_check_nodes(nodes: List[Dict[str, Any]], max_workers=20) -> List[Dict[str, Any]]:
-    results: Dict[int, Dict[str, Any]] = {}
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_index = {executor.submit(check_node, node): i for i, node in enumerate(nodes)}
-        for future in as_completed(future_to_index):
-            i = future_to_index[future]
-            try:
-                results[i] = future.result()
-            except Exception as e:
-                logger.error(f"Unhandled error in thread {i}: {e}")
-                results[i] = {"ok": False, "reason": "unexpected_error"}
-
-    # حفظ ترتیب
-    return [results[i] for i in range(len(nodes))]
+        logger.error(f"Unhandled error in probe {i}: {e}")
+        return i, {"ok": False, "reason": "unexpected_error"}
+
+async def iter_health_checks(nodes: Iterable[Dict[str, Any]], concurrency: int = CONCURRENCY,
+                             timeout_default: float = 3.0, coalesce: bool = True,
+                             summary: Optional[Dict[str, Any]] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Probe *nodes* with at most *concurrency* probes in flight and yield
+    (index, result) as each one completes.  Nodes are pulled from the
+    iterable only when a slot frees up, so it may be a lazy stream.
+    coalesce: one probe per EndpointGroups key, fanned out to every member.
+    summary: if given, filled with nodes / probes / reduction when the run ends.
+    If the consumer stops early (break / aclose), the probes still in flight are
+    cancelled and awaited before the generator closes.
+    """
+    connect_scan.raise_nofile_limit(concurrency)
+    endpoints = EndpointGroups() if coalesce else None
+    source = enumerate(nodes)
+    pending: set = set()
+
+    def fill() -> None:
+        while len(pending) < concurrency:
+            item = next(source, None)
+            if item is None:
+                return
+            pending.add(asyncio.ensure_future(_indexed(*item, timeout_default, endpoints)))
+
+    try:
+        fill()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            fill()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if endpoints is not None:
+            await endpoints.cancel()
+
+    if endpoints is not None:
+        stats = endpoints.summary()
+        logger.info(f"Health run: {stats['nodes']} probed nodes → {stats['probes']} endpoint probes "
+                    f"(x{stats['reduction']} coalesced)")
+        if summary is not None:
+            summary.update(stats)
+
+async def health_check_nodes_async(nodes: List[Dict[str, Any]], concurrency: int = CONCURRENCY,
+                                   timeout_default: float = 3.0, liveness_first: bool = False,
+                                   coalesce: bool = True, summary: Optional[Dict[str, Any]] = None
+                                   ) -> List[Dict[str, Any]]:
+    results: List[Optional[Dict[str, Any]]] = [None] * len(nodes)
+    if liveness_first:
+        results = await asyncio.to_thread(liveness_stage, nodes)
+    todo = [i for i, r in enumerate(results) if r is None]
+    async for j, result in iter_health_checks([nodes[i] for i in todo], concurrency, timeout_default,
+                                              coalesce, summary):
+        results[todo[j]] = result
+    return results  # حفظ ترتیب
+
+# ───────────────────────────── Liveness stage
+def liveness_stage(nodes: List[Dict[str, Any]], timeout: float = connect_scan.TIMEOUT) -> List[Optional[Dict[str, Any]]]:
+    """
+    Cheapest first pass: one connect_scan over every TCP node at once.  Returns the
+    final result for nodes it settles (unreachable ones, and reachable ones whose
+    checker is plain tcp_check) and None for those that still need a protocol probe.
+    """
+    probes = [_Probe(node, timeout) for node in nodes]
+    results = [p.result for p in probes]
+    tcp = [i for i, p in enumerate(probes) if p.result is None and p.checker_name != "udp_check"]
+    ips = resolver.default_resolver().prefetch(probes[i].host for i in tcp)
+    for i in tcp:
+        if ips[probes[i].host] is None:
+            results[i] = {"ok": False, "reason": "resolve_failed", "host": probes[i].host, "port": probes[i].port}
+    tcp = [i for i in tcp if results[i] is None]
+    # a bare connect cannot tell nodes on the same IP:port apart: scan each endpoint once
+    endpoints = list(dict.fromkeys((ips[probes[i].host], probes[i].port) for i in tcp))
+    scanned = dict(zip(endpoints, connect_scan.scan(endpoints, timeout)))
+    for i in tcp:
+        probe = probes[i]
+        r = scanned[(ips[probe.host], probe.port)]
+        if not r.ok:
+            results[i] = probe.fail(r.ip, r.error)
+        elif probe.checker_name == "tcp_check":
+            results[i] = probe.ok(r.ip, int(r.rtt_ms))
+    return results
+
+# ───────────────────────────── Sync API (thin wrappers over the async engine)
+def _run_sync(coro: Awaitable):
+    """asyncio.run, or, if this thread already runs a loop, asyncio.run on a helper
+    thread (the caller blocks, as with the old thread-pool API); async code should
+    await the *_async variants instead."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+def check_node(node: Dict[str, Any], timeout_default=3.0) -> Dict[str, Any]:
+    return _run_sync(check_node_async(node, timeout_default))
+
+def health_check_nodes(nodes: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                       liveness_first: bool = False, coalesce: bool = True,
+                       summary: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """max_workers: probes in flight (default CONCURRENCY).  liveness_first: run
+    liveness_stage first so only TCP-reachable nodes get a protocol probe.
+    coalesce / summary: see iter_health_checks."""
+    return _run_sync(health_check_nodes_async(list(nodes), max_workers or CONCURRENCY,
+                                                liveness_first=liveness_first, coalesce=coalesce,
+                                                summary=summary))
+
+def health_check_table(table, mask=None, max_workers: Optional[int] = None, liveness_first: bool = False) -> None:
+    """Check the rows of a parsers.table.NodeTable (all, or those in mask) and
+    write status / latency / resolved IPv4 / last_checked back into its columns."""
+    rows = table.rows(mask)
+    results = health_check_nodes([table.nodes[i] for i in rows], max_workers=max_workers,
+                                 liveness_first=liveness_first)
+    table.apply_health(results, rows)
 
 # ───────────────────────────── CLI demo
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+"""
+Batched nmap scanning.
+
+Instead of one ``nmap -Pn -p PORT host`` process per node, pending
+(host, port, proto) targets are grouped by protocol and port and scanned
+with one nmap run per batch (targets on stdin via ``-iL -``, results as
+XML via ``-oX -``). The XML port states are then mapped back to each target.
+A per-call timeout becomes nmap's ``--host-timeout`` (the whole batch is one
+host group, so it bounds the run) and the process is waited on for that long
+plus PROCESS_SLACK.
+"""
+import logging
+import shutil
+import subprocess
+import threading
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("health_checker")
+
+NMAP_PATH = shutil.which("nmap")
+BATCH_SIZE = 256          # hosts per nmap invocation
+TIMING = 4                # nmap timing template, -T0 (paranoid) … -T5 (insane)
+WINDOW = 0.05             # seconds submit() waits for more targets before a partial batch runs
+PROCESS_TIMEOUT = 120.0   # hard cap on one nmap run
+PROCESS_SLACK = 5.0       # nmap start-up and report on top of --host-timeout
+
+Target = Tuple[str, int, str]   # (host, port, "tcp" | "udp")
+UNKNOWN = "unknown"             # host missing from the report (down, unresolvable, nmap failed)
+
+
+def parse_xml(xml: str) -> Dict[Target, str]:
+    """Map every (address-or-hostname, port, proto) in an nmap XML report to its state."""
+    states: Dict[Target, str] = {}
+    root = ET.fromstring(xml)
+    for host in root.iter("host"):
+        names = {a.get("addr") for a in host.findall("address") if a.get("addrtype") in ("ipv4", "ipv6")}
+        names |= {h.get("name").lower() for h in host.iter("hostname") if h.get("name")}
+        for port in host.iter("port"):
+            state = port.find("state")
+            key = (int(port.get("portid")), port.get("protocol"))
+            for name in names:
+                states[(name, *key)] = state.get("state") if state is not None else UNKNOWN
+    return states
+
+
+class NmapBatchScanner:
+    """
+    scan(targets) runs the batches synchronously; submit()/check() queue single
+    targets from many threads and flush them together once batch_size targets are
+    pending or `window` seconds have passed.  Targets queued with different
+    timeouts are flushed as separate (parallel) runs.
+    """
+
+    def __init__(self, nmap_path: Optional[str] = NMAP_PATH, batch_size: int = BATCH_SIZE,
+                 timing: int = TIMING, window: float = WINDOW, host_timeout: Optional[float] = None,
+                 process_timeout: float = PROCESS_TIMEOUT, extra_args: Iterable[str] = ()):
+        if not nmap_path:
+            raise RuntimeError("nmap not found in PATH")
+        if not 0 <= timing <= 5:
+            raise ValueError(f"timing template must be 0-5, got {timing}")
+        self.nmap_path = nmap_path
+        self.batch_size = max(1, batch_size)
+        self.timing = timing
+        self.window = window
+        self.host_timeout = host_timeout
+        self.process_timeout = process_timeout
+        self.extra_args = list(extra_args)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[Target, Optional[float], Future]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    # ─── Synchronous batches
+    def command(self, proto: str, port: int, ipv6: bool = False,
+                host_timeout: Optional[float] = None) -> List[str]:
+        cmd = [self.nmap_path, "-Pn", "-n", f"-T{self.timing}", "-p", str(port), "-oX", "-", "-iL", "-"]
+        if proto == "udp":
+            cmd.insert(1, "-sU")
+        if ipv6:
+            cmd.insert(1, "-6")
+        host_timeout = host_timeout or self.host_timeout
+        if host_timeout:
+            cmd[1:1] = ["--host-timeout", f"{int(host_timeout * 1000)}ms",
+                        "--min-hostgroup", str(self.batch_size)]
+        return cmd + self.extra_args
+
+    def wait_time(self, host_timeout: Optional[float] = None) -> float:
+        """How long one run may take: --host-timeout plus start-up, capped at process_timeout."""
+        host_timeout = host_timeout or self.host_timeout
+        if not host_timeout:
+            return self.process_timeout
+        return min(self.process_timeout, host_timeout + PROCESS_SLACK)
+
+    def _run(self, proto: str, port: int, ipv6: bool, hosts: List[str],
+             host_timeout: Optional[float] = None) -> Dict[Target, str]:
+        cmd = self.command(proto, port, ipv6, host_timeout)
+        try:
+            out = subprocess.run(cmd, input="\n".join(hosts), capture_output=True, text=True,
+                                 timeout=self.wait_time(host_timeout)).stdout
+            return parse_xml(out)
+        except (subprocess.SubprocessError, OSError, ET.ParseError) as e:
+            logger.warning(f"nmap batch ({proto}/{port}, {len(hosts)} hosts) failed: {e}")
+            return {}
+
+    def scan(self, targets: Iterable[Target], timeout: Optional[float] = None) -> Dict[Target, str]:
+        """
+        State ("open", "closed", "filtered", "open|filtered", … or UNKNOWN) for every
+        target; *timeout* (seconds per host) overrides the scanner's host_timeout.
+        """
+        groups: Dict[Tuple[str, int, bool], List[str]] = defaultdict(list)
+        wanted = set()
+        for host, port, proto in targets:
+            target = (host, int(port), proto.lower())
+            if target in wanted:
+                continue
+            wanted.add(target)
+            groups[(target[2], target[1], ":" in host)].append(host)
+
+        found: Dict[Target, str] = {}
+        for (proto, port, ipv6), hosts in groups.items():
+            for i in range(0, len(hosts), self.batch_size):
+                found.update(self._run(proto, port, ipv6, hosts[i:i + self.batch_size], timeout))
+        return {t: found.get((t[0].lower(), t[1], t[2]), UNKNOWN) for t in wanted}
+
+    def scan_nodes(self, nodes: List[Dict[str, Any]], proto: str = "tcp") -> List[Dict[str, Any]]:
+        """One result per node (input order); ok means nmap reported the port open."""
+        targets = [(n["config"]["server"], n["config"]["port"], proto) for n in nodes]
+        states = self.scan(targets)
+        results = []
+        for host, port, _ in targets:
+            state = states[(host, int(port), proto)]
+            results.append({"ok": state.startswith("open"), "host": host, "port": port, "state": state})
+        return results
+
+    # ─── Coalescing queue
+    def submit(self, host: str, port: int, proto: str = "tcp", timeout: Optional[float] = None) -> "Future[str]":
+        future: Future = Future()
+        with self._lock:
+            self._pending.append(((host, int(port), proto.lower()), timeout, future))
+            if len(self._pending) >= self.batch_size:
+                self._dispatch_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+
+    def check(self, host: str, port: int, proto: str = "tcp", timeout: Optional[float] = None) -> bool:
+        """
+        Blocking single-target check that shares an nmap run with concurrent callers;
+        waits at most window + wait_time(timeout) (concurrent.futures.TimeoutError).
+        """
+        state = self.submit(host, port, proto, timeout).result(self.window + self.wait_time(timeout))
+        return state.startswith("open")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._dispatch_locked()
+
+    def _dispatch_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batches: Dict[Optional[float], List[Tuple[Target, Future]]] = defaultdict(list)
+        for target, timeout, future in self._pending:
+            batches[timeout].append((target, future))
+        self._pending = []
+        for timeout, batch in batches.items():
+            threading.Thread(target=self._resolve, args=(batch, timeout), daemon=True).start()
+
+    def _resolve(self, batch: List[Tuple[Target, Future]], timeout: Optional[float]) -> None:
+        try:
+            states = self.scan((t for t, _ in batch), timeout)
+            for target, future in batch:
+                future.set_result(states[target])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+_default: Optional[NmapBatchScanner] = None
+_default_lock = threading.Lock()
+
+
+def default_scanner() -> NmapBatchScanner:
+    """Shared scanner behind health.tcp_check / udp_check (module defaults)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = NmapBatchScanner()
+        return _default
+
+
+__all__ = ["NmapBatchScanner", "default_scanner", "parse_xml", "BATCH_SIZE", "TIMING", "PROCESS_SLACK", "UNKNOWN"]
@@ -2,10 +2,12 @@
 Modular ping utilities for single and batch host reachability tests.
 """
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import subprocess, shutil, socket
+import subprocess, shutil
 from typing import List, Dict, Any
 import logging
 
+from . import connect_scan
+
 # Locate tcping
 TCPING_PATH = shutil.which("tcping")
 if not TCPING_PATH:
@@ -23,17 +25,19 @@ def ping_host(host: str, count: int = 1, timeout: int = 1, port: int = 80) -> bo
         except Exception:
             # Fall through to socket check
             pass
-    # Fallback to TCP socket connection check
+    # Fallback to a non-blocking TCP connect (retried up to count times)
     for _ in range(count):
-        try:
-            with socket.create_connection((host, port), timeout):
-                return True
-        except Exception:
-            continue
+        if connect_scan.connect(host, port, timeout).ok:
+            return True
     return False
 
 def ping_hosts(hosts: List[str], count: int = 1, timeout: int = 1, port: int = 80, concurrency: int = 10) -> List[Dict[str, Any]]:
     """Check multiple hosts concurrently, return list of statuses."""
+    if not TCPING_PATH:
+        # one connect scan over all hosts (count attempts each) instead of a thread per host
+        scanned = connect_scan.scan([(host, port) for host in hosts for _ in range(count)], timeout)
+        return [{"host": host, "reachable": any(r.ok for r in scanned[i * count:(i + 1) * count])}
+                for i, host in enumerate(hosts)]
     results: List[Dict[str, Any]] = []
     with ThreadPoolExecutor(max_workers=concurrency) as executor:
         future_to_host = {executor.submit(ping_host, host, count, timeout, port): host for host in hosts}
@@ -1,10 +1,8 @@
 """
 Module for determining server region (country) based on IP using MaxMind GeoLite2 database.
 """
-import ipaddress
 from pathlib import Path
 from typing import Optional
-import socket
 try:
     from geoip2.database import Reader
 except ImportError:
@@ -14,6 +12,8 @@ import gzip
 import shutil
 import os
 
+from .resolver import default_resolver
+
 # Default path to the GeoLite2-Country.mmdb file
 DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "GeoLite2-Country.mmdb"
 
@@ -51,16 +51,10 @@ def get_country(ip: str, db_path: Optional[str] = None) -> Optional[str]:
     Return the ISO country code for the given IP using the MaxMind database.
     Returns None if lookup fails or IP is invalid.
     """
-    # Resolve domain names to IP
-    try:
-        # If valid IP literal, keep
-        ip_obj = ipaddress.ip_address(ip)
-        ip_str = ip
-    except ValueError:
-        try:
-            ip_str = socket.gethostbyname(ip)
-        except Exception:
-            return None
+    # Resolve domain names to IP (shared cache: health checks usually resolved it already)
+    ip_str = default_resolver().resolve(ip)
+    if not ip_str:
+        return None
 
     # Determine database path
     path = Path(db_path) if db_path else DEFAULT_DB_PATH
@@ -71,13 +65,13 @@ def get_country(ip: str, db_path: Optional[str] = None) -> Optional[str]:
     if Reader and path.exists():
         try:
             with Reader(str(path)) as reader:
-                response = reader.country(ip)
+                response = reader.country(ip_str)
                 return response.country.iso_code
         except Exception:
             pass
     # Fallback to external IP geolocation API
     try:
-        url = f"http://ip-api.com/json/{ip}?fields=status,countryCode"
+        url = f"http://ip-api.com/json/{ip_str}?fields=status,countryCode"
         resp = requests.get(url, timeout=5)
         data = resp.json()
         if data.get("status") == "success":
@@ -85,3 +79,11 @@ def get_country(ip: str, db_path: Optional[str] = None) -> Optional[str]:
     except Exception:
         pass
     return None
+
+
+def assign_regions(table, mask=None, db_path: Optional[str] = None) -> None:
+    """
+    Fill the region column of a parsers.table.NodeTable for rows that have a
+    resolved IPv4 and no region yet; each distinct IP is looked up once.
+    """
+    table.assign_regions_by_ip(lambda ip: get_country(ip, db_path), mask)
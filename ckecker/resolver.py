@@ -0,0 +1,201 @@
+"""
+Shared DNS resolution cache.
+
+Many nodes share a hostname, and health checks, the liveness scan and region
+lookup all need its address. Resolver keeps answers in memory for `ttl`
+seconds (failures for `negative_ttl`) and coalesces concurrent lookups of the
+same name, from threads or coroutines, into one getaddrinfo call. prefetch()
+resolves a whole node set up front.
+"""
+import asyncio
+import ipaddress
+import logging
+import socket
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("health_checker")
+
+TTL = 300.0             # getaddrinfo does not expose record TTLs; one fixed lifetime for positive answers
+NEGATIVE_TTL = 30.0     # failed names are retried after this long
+MAX_ENTRIES = 100_000
+PREFETCH_CONCURRENCY = 256
+
+
+def _literal(host: str) -> Optional[str]:
+    try:
+        return str(ipaddress.ip_address(host))
+    except ValueError:
+        return None
+
+
+class Resolver:
+    """Hostname → IPv4 (or None) with TTL / negative caching and in-flight coalescing."""
+
+    def __init__(self, ttl: float = TTL, negative_ttl: float = NEGATIVE_TTL, max_entries: int = MAX_ENTRIES,
+                 family: int = socket.AF_INET):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.family = family
+        self._cache: Dict[str, Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}                 # thread callers
+        # coroutine callers, per event loop: a task can only be awaited on the loop that runs it
+        self._inflight_async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = \
+            weakref.WeakKeyDictionary()
+        self.lookups = 0    # real getaddrinfo calls, for tests / stats
+
+    # ─── Cache
+    def cached(self, host: str) -> Tuple[bool, Optional[str]]:
+        """(hit, ip); a hit with ip None is a cached failure."""
+        entry = self._cache.get(host.lower())
+        if entry is not None and entry[1] > time.monotonic():
+            return True, entry[0]
+        return False, None
+
+    def _store(self, key: str, ip: Optional[str]) -> None:
+        expires = time.monotonic() + (self.ttl if ip else self.negative_ttl)
+        with self._lock:
+            if len(self._cache) >= self.max_entries:
+                # insertion order ≈ age; drop the oldest tenth in one go
+                for old in list(self._cache)[: self.max_entries // 10 or 1]:
+                    del self._cache[old]
+            self._cache.pop(key, None)
+            self._cache[key] = (ip, expires)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _answer(self, host: str, infos) -> Optional[str]:
+        ip = infos[0][4][0] if infos else None
+        logger.debug(f"Resolved {host} → {ip}")
+        return ip
+
+    def _failed(self, host: str, e: Exception) -> None:
+        logger.warning(f"DNS resolution failed for {host}: {e}")
+
+    # ─── Blocking
+    def resolve(self, host: str) -> Optional[str]:
+        literal = _literal(host)
+        if literal:
+            return literal
+        hit, ip = self.cached(host)
+        if hit:
+            return ip
+        key = host.lower()
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+        ip = None
+        try:
+            self.lookups += 1
+            ip = self._answer(host, socket.getaddrinfo(host, None, family=self.family, type=socket.SOCK_STREAM))
+        except (OSError, UnicodeError) as e:
+            self._failed(host, e)
+        finally:
+            self._store(key, ip)
+            with self._lock:
+                del self._inflight[key]
+            future.set_result(ip)
+        return ip
+
+    # ─── Async
+    async def resolve_async(self, host: str) -> Optional[str]:
+        literal = _literal(host)
+        if literal:
+            return literal
+        hit, ip = self.cached(host)
+        if hit:
+            return ip
+        key = host.lower()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._inflight_async.setdefault(loop, {})
+        task = inflight.get(key)
+        if task is None:
+            task = inflight[key] = loop.create_task(self._lookup_async(host, key, inflight))
+        # a cancelled caller (probe deadline) must not cancel the lookup others wait on
+        return await asyncio.shield(task)
+
+    async def _lookup_async(self, host: str, key: str, inflight: Dict[str, asyncio.Task]) -> Optional[str]:
+        ip = None
+        try:
+            self.lookups += 1
+            infos = await asyncio.get_running_loop().getaddrinfo(host, None, family=self.family,
+                                                                  type=socket.SOCK_STREAM)
+            ip = self._answer(host, infos)
+        except (OSError, UnicodeError) as e:
+            self._failed(host, e)
+        finally:
+            inflight.pop(key, None)     # a cancelled lookup must not be handed to later callers
+        self._store(key, ip)
+        return ip
+
+    def _known(self, hosts: Iterable[str]) -> Tuple[Dict[str, Optional[str]], list]:
+        """(answers for IP literals and cache hits, distinct names still to look up)."""
+        known: Dict[str, Optional[str]] = {}
+        missing = []
+        for name in dict.fromkeys(h for h in hosts if h):
+            literal = _literal(name)
+            hit, ip = (True, literal) if literal else self.cached(name)
+            if hit:
+                known[name] = ip
+            else:
+                missing.append(name)
+        return known, missing
+
+    async def prefetch_async(self, hosts: Iterable[str],
+                             concurrency: int = PREFETCH_CONCURRENCY) -> Dict[str, Optional[str]]:
+        """Resolve every distinct host (at most *concurrency* lookups at once); host → ip or None."""
+        known, names = self._known(hosts)
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(name: str) -> Optional[str]:
+            async with gate:
+                return await self.resolve_async(name)
+
+        known.update(zip(names, await asyncio.gather(*(one(n) for n in names))))
+        return known
+
+    def prefetch(self, hosts: Iterable[str], concurrency: int = PREFETCH_CONCURRENCY) -> Dict[str, Optional[str]]:
+        """
+        Blocking prefetch_async; no event loop is started when every host is an IP
+        literal or cached, and inside a running loop the lookups run on a helper thread.
+        """
+        known, names = self._known(hosts)
+        if not names:
+            return known
+        coro = self.prefetch_async(names, concurrency)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            known.update(asyncio.run(coro))
+            return known
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            known.update(pool.submit(asyncio.run, coro).result())
+        return known
+
+
+_default: Optional[Resolver] = None
+_default_lock = threading.Lock()
+
+
+def default_resolver() -> Resolver:
+    """Process-wide resolver shared by health, liveness and region lookups."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Resolver()
+        return _default
+
+
+__all__ = ["Resolver", "default_resolver", "TTL", "NEGATIVE_TTL"]
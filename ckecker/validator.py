@@ -1,15 +1,20 @@
 import json
+import os
+import sys
 from pathlib import Path
-from jsonschema import validate, ValidationError
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from jsonschema import Draft202012Validator
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 
-# Module logger
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from parsers.valid import is_marked
+
+# Module logger (no handler here: the application configures logging)
 logger = logging.getLogger("ckecker.validator")
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()
-handler.setFormatter(logging.Formatter("[%(levelname)s] %(asctime)s - %(message)s"))
-logger.addHandler(handler)
+
+PARALLEL_THRESHOLD = 5_000   # smaller inputs are validated in this process
+CHUNK_SIZE = 2_000
 
 # Load the standard schema
 SCHEMA_PATH = Path(__file__).resolve().parent.parent / "config/schema.json"
@@ -25,33 +30,134 @@ if not SCHEMA_PATH.exists():
 with open(SCHEMA_PATH, encoding="utf-8") as f:
     SCHEMA = json.load(f)
 
+# ─── Compiled validators ─────────────────────────────────────────────
+def _compile(schema: Dict[str, Any]) -> Dict[str, Draft202012Validator]:
+    """
+    Split the top-level `config.oneOf` into one validator per protocol.
+
+    Every branch pins `config.type` with a const, so dispatching on it gives
+    the same verdict as the oneOf while testing a node against one branch
+    instead of all of them.  Validators are built once, at import.
+    """
+    Draft202012Validator.check_schema(schema)
+    validators = {}
+    for branch in schema["properties"]["config"]["oneOf"]:
+        name = branch["$ref"].rsplit("/", 1)[-1]
+        proto = schema["$defs"][name]["properties"]["type"]["const"]
+        sub = dict(schema)
+        sub["properties"] = {**schema["properties"], "config": {"$ref": branch["$ref"]}}
+        validators[proto] = Draft202012Validator(sub)
+    return validators
+
+VALIDATORS = _compile(SCHEMA)
+
+def _error(path: str, message: str, keyword: str) -> Dict[str, str]:
+    return {"path": path, "message": message, "keyword": keyword}
+
+def node_errors(node: Any) -> List[Dict[str, str]]:
+    """
+    Structured errors for one node (empty list = valid):
+    [{"path": "config.tls.sni", "message": ..., "keyword": "type"}, ...]
+    Unmodified parser output (parsers.valid marker) is trusted without a schema pass.
+    """
+    if not isinstance(node, dict):
+        return [_error("", "node must be an object", "type")]
+    if is_marked(node):
+        return []
+    config = node.get("config")
+    proto = config.get("type") if isinstance(config, dict) else None
+    validator = VALIDATORS.get(proto or node.get("type"))
+    if validator is None:
+        return [_error("config.type", f"unknown protocol type: {proto!r}", "const")]
+    return [
+        _error(".".join(str(p) for p in e.absolute_path), e.message, e.validator)
+        for e in sorted(validator.iter_errors(node), key=lambda e: list(map(str, e.absolute_path)))
+    ]
+
+def _describe(errors: List[Dict[str, str]]) -> str:
+    return "; ".join(f"{e['path'] or '<root>'}: {e['message']}" for e in errors)
+
 def validate_config(config_dict):
     """
     Validate a config dictionary against the project's standard schema.
     Returns True if valid, otherwise returns False and the error message.
     """
-    try:
-        validate(instance=config_dict, schema=SCHEMA)
-        logger.debug("Config valid")
+    errors = node_errors(config_dict)
+    if not errors:
         return True, None
-    except ValidationError as e:
-        logger.warning(f"Validation error: {e}")
-        return False, str(e)
+    error = _describe(errors)
+    logger.warning(f"Validation error: {error}")
+    return False, error
+
+def validate_many(nodes: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Bulk path: validate every node in this thread (the compiled validators make
+    a thread pool pointless for this CPU-bound work) without per-node logging.
+    Returns [{"index", "valid", "errors"}] in input order.
+    """
+    results = []
+    for i, node in enumerate(nodes):
+        errors = node_errors(node)
+        results.append({"index": i, "valid": not errors, "errors": errors})
+    invalid = sum(not r["valid"] for r in results)
+    if invalid:
+        logger.warning(f"{invalid}/{len(results)} configs failed validation")
+    return results
+
+# ─── Bulk validation ─────────────────────────────────────────────────
+def _invalid_chunk(start: int, chunk: List[Any]) -> List[Tuple[int, str, str]]:
+    """Worker side: (index, error code, path) of the first error of each invalid node."""
+    out = []
+    for i, node in enumerate(chunk, start):
+        errors = node_errors(node)
+        if errors:
+            out.append((i, errors[0]["keyword"], errors[0]["path"]))
+    return out
 
-def validate_configs(configs, max_workers: int = 10):
+def _message_chunk(start: int, chunk: List[Any]) -> List[Tuple[int, str]]:
+    """Worker side: (index, validate_config-style message) of each invalid node."""
+    out = []
+    for i, node in enumerate(chunk, start):
+        errors = node_errors(node)
+        if errors:
+            out.append((i, _describe(errors)))
+    return out
+
+def _run_chunks(worker, configs: List[Any], max_workers: Optional[int]) -> list:
+    """
+    Inputs of PARALLEL_THRESHOLD nodes or more are split into CHUNK_SIZE chunks
+    over a process pool (default: one worker per core). Each worker compiles the
+    validators once, at import, and sends back only its invalid nodes.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    starts = range(0, len(configs), CHUNK_SIZE)
+    chunks = [configs[i:i + CHUNK_SIZE] for i in starts]
+    if workers == 1 or len(configs) < PARALLEL_THRESHOLD:
+        parts = map(worker, starts, chunks)
+        invalid = [r for part in parts for r in part]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            invalid = [r for part in pool.map(worker, starts, chunks) for r in part]
+    if invalid:
+        logger.warning(f"{len(invalid)}/{len(configs)} configs failed validation")
+    return invalid
+
+def validate_configs(configs, max_workers: Optional[int] = None):
     """
     Validate a list of config dictionaries in parallel.
-    Returns a list of dicts with 'index', 'valid', and 'error'.
-    """
-    results = [None] * len(configs)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_map = {executor.submit(validate_config, cfg): i for i, cfg in enumerate(configs)}
-        for future in as_completed(future_map):
-            idx = future_map[future]
-            try:
-                valid, error = future.result()
-            except Exception as e:
-                logger.error(f"Unexpected error validating config at index {idx}: {e}")
-                valid, error = False, str(e)
-            results[idx] = {"index": idx, "valid": valid, "error": error}
+    Returns a list of dicts with 'index', 'valid', and 'error' (the same
+    message validate_config gives, None when valid), in input order.
+    """
+    configs = list(configs)
+    results = [{"index": i, "valid": True, "error": None} for i in range(len(configs))]
+    for idx, message in _run_chunks(_message_chunk, configs, max_workers):
+        results[idx] = {"index": idx, "valid": False, "error": message}
     return results
+
+def invalid_configs(configs, max_workers: Optional[int] = None) -> List[Tuple[int, str, str]]:
+    """
+    Compact bulk form: (index, schema keyword, path) for the first error of each
+    invalid config only, e.g. (12, "required", "config"). Cheaper to ship back
+    from the workers than full messages when only counts or codes are needed.
+    """
+    return _run_chunks(_invalid_chunk, list(configs), max_workers)
@@ -19,17 +19,23 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 from jsonschema import ValidationError
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from parsers.node import as_dict
+from parsers.valid import is_marked
+
 # Central logger
 logger = logging.getLogger("ckecker.converter")
 
 try:
-    from jsonschema import validate  # optional – skip if not installed
+    from jsonschema import Draft202012Validator  # optional – skip if not installed
 except ImportError:  # pragma: no cover
-    validate = None  # type: ignore
+    Draft202012Validator = None  # type: ignore
 
 # ───────────────────────── paths ──────────────────────────────
 BASE = Path(__file__).resolve().parent.parent
 NODE_SCHEMA = BASE / "config" / "schema.json"
+if not NODE_SCHEMA.exists():  # the file name may carry an invisible character
+    NODE_SCHEMA = next(iter(sorted((BASE / "config").glob("schema*.json"))), NODE_SCHEMA)
 XRAY_SCHEMA = BASE / "config" / "xray.json"  # (not used here, but handy)
 
 # ───────────────────── registry helper ───────────────────────
@@ -44,25 +50,77 @@ def register(protocol: str):
 
 # ────────────────────── util helpers ─────────────────────────
 
+# transport["type"] → Xray network name
+_NETWORKS = {"": "tcp", "none": "tcp", "raw": "tcp", "h2": "http", "splithttp": "xhttp"}
+
+
+def _drop_empty(d: Dict) -> Dict:
+    return {k: v for k, v in d.items() if v not in (None, "", [], {}, False)}
+
+
+def _tls_settings(tls: Dict) -> Dict:
+    return _drop_empty({
+        "serverName": tls.get("sni"),
+        "allowInsecure": tls.get("insecure"),
+        "alpn": tls.get("alpn"),
+        "fingerprint": tls.get("fingerprint"),
+    })
+
+
+def _reality_settings(tls: Dict) -> Dict:
+    reality = tls["reality"]
+    return _drop_empty({
+        "serverName": tls.get("sni"),
+        "fingerprint": tls.get("fingerprint") or "chrome",  # REALITY requires a uTLS fingerprint
+        "publicKey": reality.get("public_key"),
+        "shortId": reality.get("short_id"),
+        "spiderX": reality.get("spider_x"),
+    })
+
+
+def _network_settings(network: str, t: Dict) -> Dict:
+    path, host = t.get("path"), t.get("host")
+    if network == "ws":
+        return _drop_empty({"path": path or "/", "headers": _drop_empty({"Host": host})})
+    if network == "grpc":
+        return _drop_empty({"serviceName": t.get("service_name") or path, "multiMode": t.get("mode") == "multi"})
+    if network == "http":
+        return _drop_empty({"path": path or "/", "host": host.split(",") if host else None})
+    if network in ("httpupgrade", "xhttp"):
+        return _drop_empty({"path": path or "/", "host": host, "mode": t.get("mode") if network == "xhttp" else None})
+    if network == "tcp" and t.get("header_type") == "http":
+        request = _drop_empty({"path": [path or "/"], "headers": _drop_empty({"Host": host.split(",") if host else None})})
+        return {"header": {"type": "http", "request": request}}
+    if network in ("kcp", "quic"):
+        return _drop_empty({"header": {"type": t.get("header_type") or "none"},
+                            "seed": path if network == "kcp" else None})
+    return {}
+
+
 def _add_stream(node: Dict, outbound: Dict) -> None:
-    """Propagate optional TLS / transport settings into outbound."""
+    """Map the node's TLS / transport settings onto Xray streamSettings."""
     cfg = node.get("config", {})
     if tls := cfg.get("tls"):
-        sec = "tls" if tls.get("enabled") else "none"
-        outbound.setdefault("streamSettings", {})["security"] = sec
-        if sec == "tls":
-            outbound["streamSettings"]["tlsSettings"] = {
-                k: v for k, v in tls.items() if k != "enabled"
-            }
+        stream = outbound.setdefault("streamSettings", {})
+        if not tls.get("enabled"):
+            stream["security"] = "none"
+        elif tls.get("reality"):
+            stream["security"] = "reality"
+            stream["realitySettings"] = _reality_settings(tls)
+        else:
+            stream["security"] = "tls"
+            stream["tlsSettings"] = _tls_settings(tls)
+            # clients fall back to the CDN host header when the link carries no sni
+            host = (cfg.get("transport") or {}).get("host")
+            if host and "serverName" not in stream["tlsSettings"]:
+                stream["tlsSettings"]["serverName"] = host.split(",")[0]
     if transport := cfg.get("transport"):
-        outbound.setdefault("streamSettings", {}).update(
-            {
-                "network": transport.get("type", "tcp"),
-                f"{transport.get('type', 'tcp')}Settings": {
-                    k: v for k, v in transport.items() if k not in ("type",)
-                },
-            }
-        )
+        kind = (transport.get("type") or "").lower()
+        network = _NETWORKS.get(kind, kind)
+        stream = outbound.setdefault("streamSettings", {})
+        stream["network"] = network
+        if settings := _network_settings(network, transport):
+            stream[f"{network}Settings"] = settings
 
 # ───────────────────── protocol converters ───────────────────
 @register("ss")
@@ -98,7 +156,8 @@ def convert_vmess(node: Dict) -> Dict:
                 {
                     "address": c["server"],
                     "port": c["port"],
-                    "users": [{"id": c["uuid"], "alterId": c.get("alter_id", 0)}],
+                    "users": [{"id": c["uuid"], "alterId": c.get("alter_id", 0),
+                               "security": c.get("cipher") or "auto"}],
                 }
             ]
         },
@@ -109,7 +168,7 @@ def convert_vmess(node: Dict) -> Dict:
 @register("vless")
 def convert_vless(node: Dict) -> Dict:
     c = node["config"]
-    user: Dict = {"id": c["uuid"]}
+    user: Dict = {"id": c["uuid"], "encryption": "none"}
     if c.get("flow"):
         user["flow"] = c["flow"]
     ob = {
@@ -178,7 +237,7 @@ def convert_tuic(node: Dict) -> Dict:
                     "uuid": c["uuid"],
                     "congestion_control": c.get("congestion_control"),
                     "udp_relay_mode": c.get("udp_relay_mode"),
-                    "alpn": c.get("alpn"),
+                    "alpn": c.get("alpn") or c.get("tls", {}).get("alpn"),
                 }
             ]
         },
@@ -193,18 +252,31 @@ def load_nodes(path: Path) -> List[Dict]:
     if not isinstance(data, list):
         logger.error("Node file must be a JSON array.")
         raise ValueError("Node file must be a JSON array.")
-    if validate and NODE_SCHEMA.exists():
-        schema = json.loads(NODE_SCHEMA.read_text())
+    if Draft202012Validator and NODE_SCHEMA.exists():
+        validator = Draft202012Validator(json.loads(NODE_SCHEMA.read_text(encoding="utf-8")))
         for n in data:
+            if is_marked(n):   # unmodified parser output is already structurally valid
+                continue
             try:
-                validate(instance=n, schema=schema)
+                validator.validate(n)
             except ValidationError as e:
                 logger.error(f"Validation error for node '{n.get('tag', '<unknown>')}': {e.message}")
                 raise
     return data
 
 
+def convert_node(node: Dict) -> Dict:
+    """Single node (dict or ProxyNode) → Xray outbound; ValueError if the protocol has no converter."""
+    node = as_dict(node)
+    conv = _converters.get(node.get("type", "").lower())
+    if conv is None:
+        raise ValueError(f"unsupported protocol: {node.get('type')}")
+    return conv(node)
+
+
 def convert_nodes(nodes: List[Dict], workers: int = 6) -> List[Dict]:
+    """Nodes may be dicts or parsers.node.ProxyNode objects."""
+    nodes = [as_dict(n) for n in nodes]
     outbounds: List[Dict] = []
     with ThreadPoolExecutor(max_workers=workers) as exe:
         fut = {
@@ -7,12 +7,15 @@ check_xray_links.py – تست سلامت لینک‌های ss://, vmess://, vle
     ▸ dead.txt     → لینک‌های خراب یا فرمت نامعتبر
 """
 
-import base64, json, os, re, subprocess, sys, tempfile, time
+import json, os, re, subprocess, sys, tempfile, time
 from pathlib import Path
-from urllib.parse import urlparse
 
 import requests
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from parsers import parse_link
+from converters.to_xray import convert_node
+
 # ─────────────── تنظیمات ───────────────
 XRAY_BIN = os.path.join(os.path.dirname(__file__), "xray_core", "xray")
 RAW_URL  = ("https://raw.githubusercontent.com/4n0nymou3/multi-proxy-config-"
@@ -20,6 +23,7 @@ RAW_URL  = ("https://raw.githubusercontent.com/4n0nymou3/multi-proxy-config-"
 TEST_URL = "https://www.gstatic.com/generate_204"  # درخواست کوچکِ سریع
 SOCKS_PORT = 51837                                # پورت inbounds موقّت Xray
 TIMEOUT = 10                                     # ثانیه برای هر تست
+XRAY_PROTOCOLS = ("ss", "vmess", "vless", "trojan")  # بقیه را Xray نمی‌شناسد
 # ────────────────────────────────────────
 
 
@@ -33,86 +37,22 @@ def fetch_links(url: str) -> list[str]:
     ]
 
 
-def _pad_b64(s: str) -> str:
-    """اضافه‌کردن = تا طول رشته مضرب ۴ شود"""
-    return s + "=" * ((4 - len(s) % 4) % 4)
-
-
 def build_outbound(link: str) -> dict:
-    """تبدیل هر لینک به یک outbound مناسب Xray"""
-    up = urlparse(link)
-    tag = f"ob-{hash(link) & 0xffff:04x}"
-
-    if up.scheme in ("ss", "shadowsocks"):
-        # ss://{base64}  یا  ss://method:pwd@host:port
-        if up.hostname:                       # فرمت method:pwd@host:port
-            m = re.match(r"^ss://([^:]+):([^@]+)@([^:]+):(\d+)", link)
-            if not m:
-                raise ValueError("bad-ss-format")
-            method, pwd, host, port = m.groups()
-        else:                                 # فرمت base64
-            plain = base64.b64decode(_pad_b64(up.netloc + up.path)).decode()
-            method, rest = plain.split(":", 1)
-            pwd, hostport = rest.split("@")
-            host, port = hostport.split(":")
-        return {
-            "tag": tag,
-            "protocol": "shadowsocks",
-            "settings": {
-                "servers": [{
-                    "address": host, "port": int(port),
-                    "method": method, "password": pwd, "udp": True
-                }]
-            },
-        }
-
-    if up.scheme == "trojan":
-        m = re.match(r"^trojan://([^@]+)@([^:]+):(\d+)", link)
-        if not m:
-            raise ValueError("bad-trojan-format")
-        pwd, host, port = m.groups()
-        return {
-            "tag": tag,
-            "protocol": "trojan",
-            "settings": {"servers": [{
-                "address": host, "port": int(port), "password": pwd
-            }]},
-        }
-
-    if up.scheme == "vless":
-        if not (up.hostname and up.username):
-            raise ValueError("bad-vless-format")
-        return {
-            "tag": tag,
-            "protocol": "vless",
-            "settings": {"vnext": [{
-                "address": up.hostname,
-                "port": up.port or 443,
-                "users": [{"id": up.username, "encryption": "none"}],
-            }]},
-        }
-
-    if up.scheme == "vmess":
-        try:
-            b64 = _pad_b64((up.netloc + up.path).strip("/").split("#")[0])
-            raw = json.loads(base64.b64decode(b64).decode())
-            return {
-                "tag": tag,
-                "protocol": "vmess",
-                "settings": {"vnext": [{
-                    "address": raw["add"],
-                    "port": int(raw["port"]),
-                    "users": [{
-                        "id": raw["id"],
-                        "alterId": int(raw.get("aid", 0)),
-                        "security": raw.get("scy", "auto"),
-                    }],
-                }]},
-            }
-        except Exception as e:
-            raise ValueError(f"bad-vmess-json: {e}")
-
-    raise ValueError("unsupported-scheme")
+    """تبدیل هر لینک به یک outbound مناسب Xray (از روی نود پارس‌شده، با tls/transport کامل)"""
+    node = parse_link(link)
+    if node is None:
+        raise ValueError("bad-link-format")
+    if node["type"] not in XRAY_PROTOCOLS:
+        raise ValueError("unsupported-scheme")
+    cfg = node["config"]
+    # لینک‌هایی که حتماً در handshake شکست می‌خورند، Xray را بالا نمی‌آورند
+    if node["type"] == "ss" and not cfg.get("cipher"):
+        raise ValueError("bad-ss-format")
+    if (cfg.get("tls") or {}).get("reality") is not None and not cfg["tls"]["reality"].get("public_key"):
+        raise ValueError("reality-without-pbk")
+    outbound = convert_node(node)
+    outbound["tag"] = f"ob-{hash(link) & 0xffff:04x}"
+    return outbound
 
 
 def test_link(link: str) -> bool:
@@ -1,5 +1,10 @@
 
 # لایه مرکزی برای پارس کردن لینک‌ها
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
 from .ss import parse_ss
 from .vmess import parse_vmess
 from .vless import parse_vless
@@ -8,6 +13,12 @@ from .hysteria import parse_hysteria
 
 from .hysteria2 import parse_hysteria2
 from .tuic import parse_tuic
+from .fingerprint import fingerprint
+from .cache import default_cache, link_key
+from .lazy import LazyNode, lazy_node, lazy_nodes
+
+PARALLEL_THRESHOLD = 50_000   # کمتر از این در همین پردازه پارس می‌شود
+CHUNK_SIZE = 5_000
 
 
 PARSER_MAP = {
@@ -17,16 +28,132 @@ PARSER_MAP = {
     "trojan": parse_trojan,
     "hysteria": parse_hysteria,
     "hysteria2": parse_hysteria2,
+    "hy2": parse_hysteria2,
     "tuic": parse_tuic,
 }
 
-def parse_link(link):
+_MISS = object()
+
+def parse_link(link, cache=True):
     """
     نوع پروتکل را از ابتدای لینک تشخیص داده و به پارسر مناسب ارجاع می‌دهد.
+    اول کش پارس (parsers.cache) بررسی می‌شود؛ cache=False برای دور زدن آن.
     خروجی: dict استاندارد یا None
     """
     link = link.strip()
-    for proto, parser in PARSER_MAP.items():
-        if link.lower().startswith(proto+"://"):
-            return parser(link)
-    return None
+    store = default_cache() if cache else None
+    if store is not None:
+        key = link_key(link)
+        node = store.get(key, _MISS)
+        if node is not _MISS:
+            return node
+    scheme, sep, _ = link.partition("://")
+    parser = PARSER_MAP.get(scheme.lower()) if sep else None
+    node = parser(link) if parser else None
+    if store is not None:
+        store.put(key, node)
+    return node
+
+def _parse_chunk(links):
+    get = PARSER_MAP.get
+    out = []
+    for link in links:
+        link = link.strip()
+        scheme, sep, _ = link.partition("://")
+        parser = get(scheme.lower()) if sep else None
+        out.append(parser(link) if parser else None)
+    return out
+
+class _Lookup:
+    """یک تکه پس از خواندن کش: نتیجه‌های آماده + لینک‌هایی که باید پارس شوند."""
+    __slots__ = ("keys", "out", "miss", "links")
+
+    def __init__(self, chunk, store):
+        chunk = [link.strip() for link in chunk]
+        self.out = [None] * len(chunk)
+        if store is None:
+            self.keys, self.miss, self.links = None, range(len(chunk)), chunk
+            return
+        self.keys = [link_key(link) for link in chunk]
+        hits = store.get_many(self.keys)
+        self.miss, self.links = [], []
+        for i, key in enumerate(self.keys):
+            node = hits.get(key, _MISS)
+            if node is _MISS:
+                self.miss.append(i)
+                self.links.append(chunk[i])
+            else:
+                self.out[i] = node
+
+    def fill(self, parsed, store):
+        out, keys = self.out, self.keys
+        for i, node in zip(self.miss, parsed):
+            out[i] = node
+            if store is not None:
+                store.put(keys[i], node)
+        return out
+
+def parse_links(links, workers=None, cache=True):
+    """
+    پارس دسته‌ای لینک‌ها؛ نتیجه‌ها به همان ترتیب ورودی و به‌صورت جریانی برمی‌گردند
+    (None برای لینک نامعتبر).
+    هر تکه اول یک‌جا از کش پارس خوانده می‌شود و فقط لینک‌های جدید پارس می‌شوند.
+    ورودی بزرگ‌تر از PARALLEL_THRESHOLD در تکه‌های CHUNK_SIZE تایی بین
+    workers پردازه (پیش‌فرض: تعداد هسته‌ها) پخش می‌شود؛ کش فقط در پردازهٔ اصلی است.
+    workers بیشتر از هسته‌ها به همان تعداد هسته کم می‌شود و با یک هسته همه‌چیز
+    در همین پردازه پارس می‌شود: آنجا pool فقط هزینهٔ pickle اضافه می‌کند.
+    """
+    cores = os.cpu_count() or 1
+    workers = min(workers or cores, cores)
+    store = default_cache() if cache else None
+    it = iter(links)
+    head = list(islice(it, PARALLEL_THRESHOLD))
+    chunks = chain(
+        (head[i:i + CHUNK_SIZE] for i in range(0, len(head), CHUNK_SIZE)),
+        iter(lambda: list(islice(it, CHUNK_SIZE)), []),
+    )
+    if workers == 1 or len(head) < PARALLEL_THRESHOLD:
+        for chunk in chunks:
+            part = _Lookup(chunk, store)
+            yield from part.fill(_parse_chunk(part.links) if part.links else (), store)
+        if store is not None:
+            store.flush()
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            part = _Lookup(chunk, store)
+            pending.append((part, pool.submit(_parse_chunk, part.links) if part.links else None))
+            if len(pending) >= workers * 2:   # bounded read-ahead
+                part, future = pending.popleft()
+                yield from part.fill(future.result() if future else (), store)
+        while pending:
+            part, future = pending.popleft()
+            yield from part.fill(future.result() if future else (), store)
+    if store is not None:
+        store.flush()
+
+def link_fingerprint(link):
+    """
+    اثر انگشت نودِ یک لینک؛ لینکی که پارسر ندارد با خودش (بدون #نام) شناخته می‌شود.
+    """
+    node = parse_link(link)
+    if node:
+        return node["meta"]["fingerprint"]
+    return link.strip().split("#", 1)[0]
+
+def dedupe_links(links, seen=None):
+    """
+    لینک‌های هم‌ارز (اثر انگشت یکسان) را حذف می‌کند؛ اولین نمونه می‌ماند.
+    seen: مجموعه اثر انگشت‌های دیده‌شده، برای حذف تکراری‌ها بین چند منبع.
+    خروجی: (لینک‌های یکتا، تعداد تکراری‌ها)
+    """
+    seen = set() if seen is None else seen
+    kept = []
+    for link in links:
+        fp = link_fingerprint(link)
+        if fp in seen:
+            continue
+        seen.add(fp)
+        kept.append(link)
+    return kept, len(links) - len(kept)
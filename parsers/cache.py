@@ -0,0 +1,148 @@
+# کش پایدار نتیجهٔ پارس، با کلید هش لینک خام
+import atexit
+import marshal
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+PARSERS_DIR = Path(__file__).resolve().parent
+CACHE_DB = PARSERS_DIR.parent / "data" / "cache" / "parse_cache.sqlite3"
+LRU_SIZE = 50_000
+# هر تغییری در این فایل‌ها نسخهٔ کش را عوض می‌کند و کش قدیمی پاک می‌شود
+PARSER_MODULES = ("ss", "vmess", "vless", "trojan", "hysteria", "hysteria2", "tuic", "fingerprint", "uri", "valid")
+
+_SQL_BATCH = 500   # کلیدها در هر SELECT ... IN (...)
+_MISSING = object()
+
+
+def parser_version() -> str:
+    """هش سورس پارسرها + نسخهٔ پایتون (قالب marshal به نسخه وابسته است)."""
+    h = blake2b(sys.version.encode(), digest_size=8)
+    for name in PARSER_MODULES:
+        h.update((PARSERS_DIR / f"{name}.py").read_bytes())
+    return h.hexdigest()
+
+
+def link_key(link: str) -> bytes:
+    return blake2b(link.encode(), digest_size=16).digest()
+
+
+class ParseCache:
+    """
+    SQLite (key → marshal(node)) با یک LRU از بایت‌های سریال‌شده در حافظه.
+    هر get یک dict تازه برمی‌گرداند، پس تغییر نود (مثل meta.latency_ms) به کش نشت نمی‌کند.
+    None (لینک نامعتبر) هم کش می‌شود.
+    یک نمونه بین threadها مشترک است: اتصال با check_same_thread=False و همهٔ
+    دسترسی‌ها (SQLite، LRU، بافر نوشتن) پشت یک قفل.
+    """
+
+    def __init__(self, path: Path = CACHE_DB, lru_size: int = LRU_SIZE, version: Optional[str] = None):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.executescript(
+            "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;"
+            "CREATE TABLE IF NOT EXISTS nodes (key BLOB PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value TEXT);"
+        )
+        self.version = version or parser_version()
+        row = self.db.execute("SELECT value FROM info WHERE name = 'version'").fetchone()
+        if not row or row[0] != self.version:
+            self.db.execute("DELETE FROM nodes")
+            self.db.execute("INSERT OR REPLACE INTO info VALUES ('version', ?)", (self.version,))
+            self.db.commit()
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._pending: Dict[bytes, bytes] = {}
+
+    def _remember(self, key: bytes, blob: bytes) -> None:
+        self._lru[key] = blob
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get(self, key: bytes, default: Any = _MISSING) -> Any:
+        with self._lock:
+            blob = self._get_blob(key)
+        if blob is None:
+            return None if default is _MISSING else default
+        return marshal.loads(blob)
+
+    def _get_blob(self, key: bytes) -> Optional[bytes]:
+        blob = self._lru.get(key)
+        if blob is not None:
+            self._lru.move_to_end(key)
+        else:
+            blob = self._pending.get(key)
+        if blob is None:
+            row = self.db.execute("SELECT value FROM nodes WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            blob = row[0]
+            self._remember(key, blob)
+        return blob
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, Any]:
+        """فقط کلیدهای موجود در کش را برمی‌گرداند."""
+        found: Dict[bytes, bytes] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                blob = self._lru.get(key) or self._pending.get(key)
+                if blob is None:
+                    missing.append(key)
+                else:
+                    found[key] = blob
+            for i in range(0, len(missing), _SQL_BATCH):
+                batch = missing[i:i + _SQL_BATCH]
+                sql = f"SELECT key, value FROM nodes WHERE key IN ({','.join('?' * len(batch))})"
+                for key, blob in self.db.execute(sql, batch):
+                    found[key] = blob
+                    self._remember(key, blob)
+        return {k: marshal.loads(b) for k, b in found.items()}
+
+    def put(self, key: bytes, node: Optional[dict]) -> None:
+        blob = marshal.dumps(node)
+        with self._lock:
+            self._pending[key] = blob
+            self._remember(key, blob)
+            if len(self._pending) >= 10_000:
+                self.flush()
+
+    def put_many(self, items: Iterable) -> None:
+        for key, node in items:
+            self.put(key, node)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self.db.executemany("INSERT OR REPLACE INTO nodes VALUES (?, ?)", self._pending.items())
+                self.db.commit()
+                self._pending.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self.db.close()
+
+
+_default: Optional[ParseCache] = None
+_default_lock = threading.Lock()
+ENABLED = True
+
+
+def default_cache() -> Optional[ParseCache]:
+    """کش مشترک پردازه (تنبل)؛ اگر باز نشود، پارس بدون کش ادامه می‌یابد."""
+    global _default, ENABLED
+    if _default is None and ENABLED:
+        with _default_lock:
+            if _default is None and ENABLED:
+                try:
+                    _default = ParseCache()
+                    atexit.register(_default.close)
+                except (sqlite3.Error, OSError):
+                    ENABLED = False
+    return _default
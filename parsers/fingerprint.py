@@ -0,0 +1,60 @@
+# اثر انگشت یکتای نود، مستقل از قالب ورودی (لینک، YAML کلش، JSON سینگ‌باکس)
+from hashlib import blake2b
+
+# ss:// and shadowsocks outbounds are the same protocol
+_PROTO_ALIASES = {"shadowsocks": "ss"}
+_UUID_PROTOS = ("vmess", "vless")
+# transports that mean "plain TCP"
+_PLAIN = {"", "none", "tcp", "raw"}
+
+
+def node_fingerprint(proto, server, port, credential, transport="tcp", security="none"):
+    """
+    مسیر سریع برای پارسرها که فیلدها را از قبل دارند.
+    credential باید نرمال شده باشد (cipher و uuid با حروف کوچک).
+    """
+    key = f"{proto}\x1f{server.strip().strip('[]').rstrip('.').lower()}\x1f{port}\x1f{credential}\x1f{transport}\x1f{security}"
+    return blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def transport_key(transport):
+    """«tcp» برای ترنسپورت ساده، وگرنه «نوع:مسیر»."""
+    if not transport:
+        return "tcp"
+    kind = (transport.get("type") or "").lower()
+    if kind in _PLAIN:
+        return "tcp"
+    return f"{kind}:{transport.get('path') or transport.get('service_name') or ''}"
+
+
+def security_key(tls):
+    if tls and tls.get("enabled"):
+        return "reality" if tls.get("reality") else "tls"
+    return "none"
+
+
+def fingerprint(config):
+    """
+    اثر انگشت ۱۶ کاراکتری روی (پروتکل، سرور، پورت، اعتبارنامه، ترنسپورت، امنیت).
+    نام/تگ و ترتیب پارامترها در آن اثری ندارند؛ پس یک سرور که به چند قالب آمده یکی می‌شود.
+    """
+    get = config.get
+    proto = (get("type") or "").lower()
+    proto = _PROTO_ALIASES.get(proto, proto)
+    server = get("server") or ""
+    try:
+        port = int(get("port") or 0)
+    except (TypeError, ValueError):
+        port = 0
+
+    if proto == "ss":
+        credential = f"{(get('cipher') or '').lower()}:{get('password') or ''}"
+    elif proto in _UUID_PROTOS:
+        credential = (get("uuid") or "").lower()
+    elif proto == "tuic":
+        credential = f"{(get('uuid') or '').lower()}:{get('password') or ''}"
+    else:
+        credential = get("password") or ""
+
+    return node_fingerprint(proto, server, port, credential,
+                            transport_key(get("transport")), security_key(get("tls")))
@@ -1,27 +1,38 @@
-import re
+from .fingerprint import node_fingerprint
+from .valid import mark
+from .uri import split_uri, tls_settings
+
+# پارامتر query → کلید opts
+_OPTS = (("protocol", "protocol"), ("up_mbps", "upmbps"), ("down_mbps", "downmbps"),
+         ("obfs", "obfs"), ("obfs_password", "obfsparam"))
 
 def parse_hysteria(link):
-    pattern = re.compile(r"^hysteria://(.+)", re.IGNORECASE)
-    m = pattern.match(link.strip())
-    if not m:
+    link = link.strip()
+    uri = split_uri(link)
+    if not uri or uri.scheme != "hysteria" or not uri.host or uri.port is None:
         return None
-    raw = m.group(1)
-    try:
-        passw, rest = raw.split("@", 1)
-        server, port = rest.split(":", 1)
-        port = int(port.split("?")[0])
-    except Exception:
-        passw, server, port = "", "", 0
-    return {
-        "raw": link.strip(),
+    params = uri.params
+    # hysteria v1 رمز را معمولاً در auth می‌گذارد، نه در userinfo
+    passw = uri.userinfo or params.get("auth", "") or params.get("auth_str", "")
+    server, port = uri.host, uri.port
+    config = {
+        "type": "hysteria",
+        "server": server,
+        "port": port,
+        "password": passw,
+        "tls": tls_settings(params, "tls")
+    }
+    opts = {key: params[param] for key, param in _OPTS if params.get(param)}
+    if opts:
+        config["opts"] = opts
+    node = {
+        "raw": link,
         "tag": f"hysteria-{server}-{port}",
         "type": "hysteria",
-        "config": {
-            "type": "hysteria",
-            "server": server,
-            "port": int(port),
-            "password": passw,
-            "tls": {"enabled": True, "insecure": False}
-        },
+        "config": config,
         "meta": {}
     }
+    if uri.name:
+        node["meta"]["name"] = uri.name
+    node["meta"]["fingerprint"] = node_fingerprint("hysteria", server, port, passw, security="tls")
+    return mark(node)
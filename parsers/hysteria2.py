@@ -1,27 +1,38 @@
-import re
+from .fingerprint import node_fingerprint
+from .valid import mark
+from .uri import split_uri, tls_settings
+
+# پارامتر query → کلید opts
+_OPTS = (("obfs", "obfs"), ("obfs_password", "obfs-password"), ("pin_sha256", "pinsha256"))
 
 def parse_hysteria2(link):
-    pattern = re.compile(r"^hysteria2://(.+)", re.IGNORECASE)
-    m = pattern.match(link.strip())
-    if not m:
+    link = link.strip()
+    uri = split_uri(link)
+    if not uri or uri.scheme not in ("hysteria2", "hy2") or not uri.host or uri.port is None:
         return None
-    raw = m.group(1)
-    try:
-        passw, rest = raw.split("@", 1)
-        server, port = rest.split(":", 1)
-        port = int(port.split("?")[0])
-    except Exception:
-        passw, server, port = "", "", 0
-    return {
-        "raw": link.strip(),
+    params = uri.params
+    passw = uri.userinfo or params.get("auth", "")
+    server, port = uri.host, uri.port
+    config = {
+        "type": "hysteria2",
+        "server": server,
+        "port": port,
+        "password": passw,
+        "tls": tls_settings(params, "tls")
+    }
+    opts = {key: params[param] for key, param in _OPTS if params.get(param)}
+    if uri.port_spec != str(port):
+        opts["ports"] = uri.port_spec     # port hopping، مثل 443,5000-6000
+    if opts:
+        config["opts"] = opts
+    node = {
+        "raw": link,
         "tag": f"hysteria2-{server}-{port}",
         "type": "hysteria2",
-        "config": {
-            "type": "hysteria2",
-            "server": server,
-            "port": int(port),
-            "password": passw,
-            "tls": {"enabled": True, "insecure": False}
-        },
+        "config": config,
         "meta": {}
     }
+    if uri.name:
+        node["meta"]["name"] = uri.name
+    node["meta"]["fingerprint"] = node_fingerprint("hysteria2", server, port, passw, security="tls")
+    return mark(node)
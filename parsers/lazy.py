@@ -0,0 +1,186 @@
+# نمای تنبل نود: type/server/port با یک اسکن ارزان؛ بقیه فقط وقتی خوانده شوند دیکود می‌شوند
+import json
+import re
+from binascii import a2b_base64
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator, Optional, Tuple
+
+_PORT = re.compile(r"\d+")
+_VMESS_ADD = re.compile(r'"add"\s*:\s*"([^"\\]*)"')
+_VMESS_PORT = re.compile(r'"port"\s*:\s*"?(\d+)"?\s*[,}]')
+# کلیدهای config که بدون دیکود کامل معلوم‌اند
+_CHEAP = ("type", "server", "port")
+# کلیدهایی که هیچ پارسری نمی‌سازد (تنظیمات دستی مثل timeout)؛ نبودنشان هم دیکود نمی‌خواهد
+_NEVER_PARSED = frozenset(("timeout", "udp_payload", "udp"))
+_KEYS = ("raw", "tag", "type", "config", "meta")
+_SCHEMES = {"ss": "ss", "vmess": "vmess", "vless": "vless", "trojan": "trojan", "hysteria": "hysteria",
+            "hysteria2": "hysteria2", "hy2": "hysteria2", "tuic": "tuic"}
+
+
+def _b64(text: str) -> str:
+    padded = text.replace("-", "+").replace("_", "/") + "=" * (-len(text) % 4)
+    return a2b_base64(padded).decode(errors="ignore")
+
+
+def _host_port(authority: str) -> Tuple[str, Optional[int]]:
+    hostport = authority.rpartition("@")[2].partition("/")[0]
+    if hostport.startswith("["):
+        host, _, port = hostport[1:].partition("]")
+        port = port[1:]
+    else:
+        host, sep, port = hostport.rpartition(":")
+        if not sep:
+            host, port = port, ""
+    m = _PORT.match(port)
+    return host, int(m.group()) if m else None
+
+
+def scan(link: str) -> Optional[Tuple[str, str, int]]:
+    """
+    (type, server, port) بدون پارس query، unquote یا ساخت dict.
+    فقط vmess (JSON) و ss قدیمی یک base64 کوتاه دیکود می‌کنند؛ json.loads هرگز.
+    """
+    scheme, sep, rest = link.partition("://")
+    proto = _SCHEMES.get(scheme.lower()) if sep else None
+    if proto is None:
+        return None
+    body = rest.partition("#")[0]
+    authority = body.partition("?")[0]
+    if proto == "vmess" and "@" not in authority:
+        try:
+            text = _b64(body)
+        except Exception:
+            return None
+        add, port = _VMESS_ADD.search(text), _VMESS_PORT.search(text)
+        if not add or not port:
+            # escape یا قالب غیرعادی: همان مسیر کامل
+            try:
+                data = json.loads(text)
+                return proto, data.get("add", ""), int(data.get("port", 0) or 0)
+            except Exception:
+                return None
+        return proto, add.group(1), int(port.group(1))
+    if proto == "ss" and "@" not in authority:
+        try:
+            authority = _b64(authority.rstrip("/"))
+        except Exception:
+            return None
+        if "@" not in authority:
+            return None
+    host, port = _host_port(authority)
+    if not host or port is None:
+        return None
+    return proto, host, port
+
+
+class LazyConfig(MutableMapping):
+    """config نود؛ type/server/port از اسکن، بقیهٔ کلیدها از دیکود کامل."""
+    __slots__ = ("_node",)
+
+    def __init__(self, node: "LazyNode"):
+        self._node = node
+
+    def __getitem__(self, key):
+        node = self._node
+        if node._full is None:
+            if key in _CHEAP:
+                return node._cheap[_CHEAP.index(key)]
+            if key in _NEVER_PARSED:
+                raise KeyError(key)
+        return node._decode()["config"][key]
+
+    def __setitem__(self, key, value):
+        self._node._decode()["config"][key] = value
+
+    def __delitem__(self, key):
+        del self._node._decode()["config"][key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._node._decode()["config"])
+
+    def __len__(self) -> int:
+        return len(self._node._decode()["config"])
+
+    def __bool__(self) -> bool:
+        return True     # «config or {}» نباید دیکود را اجبار کند
+
+    def __repr__(self) -> str:
+        return f"LazyConfig({dict(self)!r})"
+
+
+class LazyNode(MutableMapping):
+    """
+    همان کلیدهای خروجی parse_link (raw/tag/type/config/meta)، ولی دیکود کامل
+    (base64، JSON، query، fingerprint) تا اولین دسترسی به کلیدی غیر از
+    raw/tag/type و config["type"|"server"|"port"] عقب می‌افتد و بعد memoize می‌شود.
+    نوشتن هم نود را کامل دیکود می‌کند. با lazy_node بسازید، نه مستقیم.
+    """
+    __slots__ = ("raw", "_cheap", "_full", "_config")
+
+    def __init__(self, raw: str, cheap: Tuple[str, str, int]):
+        self.raw = raw
+        self._cheap = cheap
+        self._full = None
+        self._config = LazyConfig(self)
+
+    @property
+    def decoded(self) -> bool:
+        return self._full is not None
+
+    def _decode(self) -> dict:
+        if self._full is None:
+            from . import parse_link     # حلقهٔ import با parsers/__init__
+            node = parse_link(self.raw)
+            if node is None:
+                raise KeyError(f"undecodable link: {self.raw[:60]}")
+            self._full = node
+        return self._full
+
+    def __getitem__(self, key):
+        if self._full is not None:
+            return self._full[key] if key != "config" else self._config
+        if key == "raw":
+            return self.raw
+        if key == "type":
+            return self._cheap[0]
+        if key == "tag":
+            proto, server, port = self._cheap
+            return f"{proto}-{server}-{port}"
+        if key == "config":
+            return self._config
+        return self._decode()[key]
+
+    def __setitem__(self, key, value):
+        self._decode()[key] = value
+
+    def __delitem__(self, key):
+        del self._decode()[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._full if self._full is not None else _KEYS)
+
+    def __len__(self) -> int:
+        return len(self._full) if self._full is not None else len(_KEYS)
+
+    def to_dict(self) -> dict:
+        """dict کامل (همان parse_link)؛ دیکود را اجبار می‌کند."""
+        return self._decode()
+
+    def __repr__(self) -> str:
+        state = "decoded" if self._full is not None else "lazy"
+        return f"LazyNode({self['tag']!r}, {state})"
+
+
+def lazy_node(link: str) -> Optional[LazyNode]:
+    """LazyNode یا None اگر حتی اسکن ارزان هم host/port پیدا نکرد."""
+    link = link.strip()
+    cheap = scan(link)
+    return LazyNode(link, cheap) if cheap else None
+
+
+def lazy_nodes(links: Iterable[str]) -> Iterator[LazyNode]:
+    """LazyNode برای هر لینک معتبر، به ترتیب ورودی (نامعتبرها حذف می‌شوند)."""
+    for link in links:
+        node = lazy_node(link)
+        if node is not None:
+            yield node
@@ -0,0 +1,195 @@
+# نمایش فشردهٔ نود: dataclass با __slots__ به‌جای dictهای تو در تو
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+_intern = sys.intern
+
+_CONFIG_KEYS = ("server", "port", "cipher", "password", "uuid", "alter_id", "flow")
+_TLS_KEYS = ("enabled", "sni", "insecure")
+_TRANSPORT_KEYS = ("type", "path", "host")
+
+# ترتیب کلیدهای ورودی نگه داشته می‌شود تا to_dict همان JSON را بسازد؛
+# نودهای یک پارسر ترتیب یکسان دارند، پس همه به یک tuple مشترک اشاره می‌کنند
+_ORDERS: Dict[tuple, tuple] = {}
+
+
+def _order(d) -> tuple:
+    keys = tuple(d)
+    return _ORDERS.setdefault(keys, keys)
+
+
+def _ordered(values: Dict[str, Any], order: Optional[tuple]) -> Dict[str, Any]:
+    """values به ترتیب order؛ کلیدهایی که بعداً اضافه شده‌اند در انتها."""
+    if not order:
+        return values
+    out = {k: values.pop(k) for k in order if k in values}
+    out.update(values)
+    return out
+
+
+def _interned(value):
+    return _intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
+class TLS:
+    enabled: Optional[bool] = None
+    sni: Optional[str] = None
+    insecure: Optional[bool] = None
+    extra: Optional[Dict[str, Any]] = None      # کلیدهای ناشناخته، بدون تغییر
+    order: Optional[tuple] = None               # ترتیب کلیدهای ورودی (مشترک)
+
+    @classmethod
+    def from_dict(cls, d):
+        extra = {k: v for k, v in d.items() if k not in _TLS_KEYS}
+        return cls(d.get("enabled"), d.get("sni"), d.get("insecure"), extra or None, _order(d))
+
+    def to_dict(self):
+        out = {k: v for k in _TLS_KEYS if (v := getattr(self, k)) is not None}
+        if self.extra:
+            out.update(self.extra)
+        return _ordered(out, self.order)
+
+
+@dataclass(slots=True)
+class Transport:
+    type: Optional[str] = None
+    path: Optional[str] = None
+    host: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+    order: Optional[tuple] = None
+
+    @classmethod
+    def from_dict(cls, d):
+        extra = {k: v for k, v in d.items() if k not in _TRANSPORT_KEYS}
+        return cls(_interned(d.get("type")), d.get("path"), d.get("host"), extra or None, _order(d))
+
+    def to_dict(self):
+        out = {k: v for k in _TRANSPORT_KEYS if (v := getattr(self, k)) is not None}
+        if self.extra:
+            out.update(self.extra)
+        return _ordered(out, self.order)
+
+
+@dataclass(slots=True)
+class ProxyNode:
+    """
+    یک نود با فیلدهای تخت. None یعنی «این کلید در dict نبود»؛ پس
+    ProxyNode.from_dict(d).to_dict() == d برای خروجی پارسرها برقرار است،
+    با همان ترتیب کلیدها (order)، پس JSON خروجی هم تغییری نمی‌کند.
+    tls و transport فقط وقتی ساخته می‌شوند که دادهٔ واقعی داشته باشند.
+    """
+    raw: Optional[str] = None
+    tag: Optional[str] = None
+    type: Optional[str] = None                   # interned
+    config_type: Optional[str] = None            # config["type"], interned
+    server: Optional[str] = None
+    port: Optional[int] = None
+    cipher: Optional[str] = None                 # interned
+    password: Optional[str] = None
+    uuid: Optional[str] = None
+    alter_id: Optional[int] = None
+    flow: Optional[str] = None
+    tls: Optional[TLS] = None
+    transport: Optional[Transport] = None
+    extra: Optional[Dict[str, Any]] = None       # کلیدهای دیگر config
+    fingerprint: Optional[str] = None            # meta["fingerprint"]
+    meta: Optional[Dict[str, Any]] = None        # بقیهٔ meta
+    attrs: Optional[Dict[str, Any]] = None       # کلیدهای دیگر سطح بالا
+    order: Optional[tuple] = None                # (ترتیب کلیدهای config، ترتیب کلیدهای meta)، مشترک
+
+    # ─── ساخت تنبل زیرشیءها ─────────────────────────────────────────
+    def tls_settings(self) -> TLS:
+        if self.tls is None:
+            self.tls = TLS()
+        return self.tls
+
+    def transport_settings(self) -> Transport:
+        if self.transport is None:
+            self.transport = Transport()
+        return self.transport
+
+    # ─── تبدیل به/از ساختار dict فعلی ───────────────────────────────
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ProxyNode":
+        cfg = d.get("config") or {}
+        meta = d.get("meta")
+        node = cls(
+            raw=d.get("raw"),
+            tag=d.get("tag"),
+            type=_interned(d.get("type")),
+            config_type=_interned(cfg.get("type")),
+            server=cfg.get("server"),
+            port=cfg.get("port"),
+            cipher=_interned(cfg.get("cipher")),
+            password=cfg.get("password"),
+            uuid=cfg.get("uuid"),
+            alter_id=cfg.get("alter_id"),
+            flow=_interned(cfg.get("flow")),
+        )
+        if isinstance(cfg.get("tls"), dict):
+            node.tls = TLS.from_dict(cfg["tls"])
+        if isinstance(cfg.get("transport"), dict):
+            node.transport = Transport.from_dict(cfg["transport"])
+        extra = {k: v for k, v in cfg.items()
+                 if k not in _CONFIG_KEYS and k != "type"
+                 and not (k in ("tls", "transport") and isinstance(v, dict))}
+        node.extra = extra or None
+        if isinstance(meta, dict):
+            node.fingerprint = meta.get("fingerprint")
+            rest = {k: v for k, v in meta.items() if k != "fingerprint"}
+            node.meta = rest or ({} if node.fingerprint is None else None)
+        attrs = {k: v for k, v in d.items() if k not in ("raw", "tag", "type", "config", "meta")}
+        node.attrs = attrs or None
+        node.order = _order((_order(cfg), _order(meta) if isinstance(meta, dict) else ()))
+        return node
+
+    def config(self) -> Dict[str, Any]:
+        cfg = {}
+        if self.config_type is not None:
+            cfg["type"] = self.config_type
+        for k in _CONFIG_KEYS:
+            v = getattr(self, k)
+            if v is not None:
+                cfg[k] = v
+        if self.tls is not None:
+            cfg["tls"] = self.tls.to_dict()
+        if self.transport is not None:
+            cfg["transport"] = self.transport.to_dict()
+        if self.extra:
+            cfg.update(self.extra)
+        return _ordered(cfg, self.order[0] if self.order else None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {}
+        if self.raw is not None:
+            out["raw"] = self.raw
+        if self.tag is not None:
+            out["tag"] = self.tag
+        if self.type is not None:
+            out["type"] = self.type
+        out["config"] = self.config()
+        if self.meta is not None or self.fingerprint is not None:
+            meta = dict(self.meta or {})
+            if self.fingerprint is not None:
+                meta["fingerprint"] = self.fingerprint
+            out["meta"] = _ordered(meta, self.order[1] if self.order else None)
+        if self.attrs:
+            out.update(self.attrs)
+        return out
+
+
+def as_dict(node):
+    """نود را به dict تبدیل می‌کند؛ dict ورودی همان‌طور برمی‌گردد."""
+    return node.to_dict() if isinstance(node, ProxyNode) else node
+
+
+def set_meta(node, key: str, value) -> None:
+    """meta[key] را روی خود نود (ProxyNode یا dict) می‌نویسد، نه روی کپی as_dict."""
+    if isinstance(node, ProxyNode):
+        if node.meta is None:
+            node.meta = {}
+        node.meta[key] = value
+    else:
+        node.setdefault("meta", {})[key] = value
@@ -1,27 +1,56 @@
-import re
-import base64
+from binascii import a2b_base64
+from .fingerprint import node_fingerprint
+from .valid import mark
+from .uri import split_uri
+
+def _b64(text):
+    # urlsafe alphabet; a2b_base64 directly skips the base64-module wrappers
+    padded = text.replace("-", "+").replace("_", "/") + "=" * (-len(text) % 4)
+    return a2b_base64(padded).decode(errors="ignore")
 
 def parse_ss(link):
-    pattern = re.compile(r"^ss://([^@]+)@([\w\.-]+):(\d+)", re.IGNORECASE)
-    m = pattern.match(link.strip())
-    if not m:
+    link = link.strip()
+    uri = split_uri(link)
+    if not uri or uri.scheme != "ss":
+        return None
+    if not uri.userinfo:
+        # قالب قدیمی: ss://base64(method:password@host:port)#name
+        try:
+            decoded = _b64(link[5:].partition("#")[0].partition("?")[0].rstrip("/"))
+        except Exception:
+            return None
+        inner = split_uri(f"ss://{decoded}")
+        if not inner or not inner.userinfo:
+            return None
+        userinfo, server, port = inner.userinfo, inner.host, inner.port
+    else:
+        userinfo, server, port = uri.userinfo, uri.host, uri.port
+    if not server or port is None:
         return None
-    userinfo, server, port = m.groups()
     try:
-        userinfo_dec = base64.urlsafe_b64decode(userinfo + '=' * (-len(userinfo) % 4)).decode(errors="ignore")
-        cipher, password = userinfo_dec.split(":", 1)
+        # SIP002: userinfo base64 است؛ بعضی کلاینت‌ها method:password خام می‌فرستند
+        cipher, password = (userinfo if ":" in userinfo else _b64(userinfo)).split(":", 1)
     except Exception:
         cipher, password = "", ""
-    return {
-        "raw": link.strip(),
+    config = {
+        "type": "ss",
+        "server": server,
+        "port": port,
+        "cipher": cipher,
+        "password": password
+    }
+    plugin, _, plugin_opts = uri.params.get("plugin", "").partition(";")
+    if plugin:
+        config["plugin"] = plugin
+        config["plugin_opts"] = plugin_opts
+    node = {
+        "raw": link,
         "tag": f"ss-{server}-{port}",
         "type": "ss",
-        "config": {
-            "type": "ss",
-            "server": server,
-            "port": int(port),
-            "cipher": cipher,
-            "password": password
-        },
+        "config": config,
         "meta": {}
     }
+    if uri.name:
+        node["meta"]["name"] = uri.name
+    node["meta"]["fingerprint"] = node_fingerprint("ss", server, port, f"{cipher.lower()}:{password}")
+    return mark(node)
@@ -0,0 +1,194 @@
+# جدول ستونی نودها روی آرایه‌های NumPy برای فیلتر و رتبه‌بندی دسته‌ای
+import ipaddress
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # NodeTable needs numpy; the rest of parsers does not
+
+from .lazy import LazyNode
+from .node import ProxyNode, as_dict
+
+TYPE_CODES = {"ss": 1, "vmess": 2, "vless": 3, "trojan": 4, "hysteria": 5, "hysteria2": 6, "tuic": 7}
+TYPE_NAMES = {v: k for k, v in TYPE_CODES.items()}
+
+STATUS_UNKNOWN, STATUS_OK, STATUS_FAIL = 0, 1, 2
+STATUS_NAMES = {STATUS_UNKNOWN: "unknown", STATUS_OK: "ok", STATUS_FAIL: "fail"}
+
+
+def ipv4_to_int(addr: Optional[str]) -> int:
+    """IPv4 رشته‌ای → uint32؛ برای دامنه یا IPv6 صفر."""
+    try:
+        return int(ipaddress.IPv4Address(addr))
+    except (ipaddress.AddressValueError, ValueError, TypeError):
+        return 0
+
+
+def int_to_ipv4(value: int) -> Optional[str]:
+    return str(ipaddress.IPv4Address(int(value))) if value else None
+
+
+class NodeTable:
+    """
+    ستون‌های داغ در آرایه‌های NumPy (یک سطر برای هر نود):
+        type_code  uint8    کد پروتکل (TYPE_CODES، صفر = ناشناخته)
+        port       uint16
+        ipv4       uint32   صفر = هنوز resolve نشده
+        latency_ms float32  NaN = اندازه‌گیری نشده
+        status     uint8    STATUS_*
+        region     uint16   اندیس در self.regions (صفر = ناشناخته)
+        last_checked float64  epoch؛ NaN = هرگز
+    رشته‌های raw و خود نودها (dict یا ProxyNode) در لیست‌های کناری با همان اندیس‌اند.
+    """
+
+    def __init__(self, nodes: Iterable[Any] = ()):
+        if np is None:
+            raise ImportError("NodeTable requires numpy (pip install numpy)")
+        nodes = list(nodes)
+        n = len(nodes)
+        self.nodes: List[Any] = nodes
+        self.raw: List[Optional[str]] = []
+        self.regions: List[str] = [""]
+        self._region_index: Dict[str, int] = {"": 0}
+
+        self.type_code = np.zeros(n, dtype=np.uint8)
+        self.port = np.zeros(n, dtype=np.uint16)
+        self.ipv4 = np.zeros(n, dtype=np.uint32)
+        self.latency_ms = np.full(n, np.nan, dtype=np.float32)
+        self.status = np.zeros(n, dtype=np.uint8)
+        self.region = np.zeros(n, dtype=np.uint16)
+        self.last_checked = np.full(n, np.nan, dtype=np.float64)
+
+        for i, node in enumerate(nodes):
+            if isinstance(node, ProxyNode):
+                proto, server, port, raw, meta = node.type, node.server, node.port, node.raw, node.meta
+            elif isinstance(node, LazyNode):
+                cfg = node["config"]     # فقط ستون‌های ارزان؛ meta تا دیکود نشده خالی است
+                proto, server, port, raw = node["type"], cfg["server"], cfg["port"], node.raw
+                meta = node["meta"] if node.decoded else None
+            else:
+                cfg = node.get("config") or {}
+                proto, server, port, raw, meta = (node.get("type") or cfg.get("type"), cfg.get("server"),
+                                                  cfg.get("port"), node.get("raw"), node.get("meta"))
+            self.raw.append(raw)
+            self.type_code[i] = TYPE_CODES.get((proto or "").lower(), 0)
+            try:
+                self.port[i] = int(port or 0)
+            except (TypeError, ValueError, OverflowError):
+                pass
+            self.ipv4[i] = ipv4_to_int(server)
+            if meta:
+                if meta.get("latency_ms") is not None:
+                    self.latency_ms[i] = meta["latency_ms"]
+                if meta.get("region"):
+                    self.region[i] = self.region_code(meta["region"])
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    # ─── Codes ───────────────────────────────────────────────────────────
+    def region_code(self, region: Optional[str]) -> int:
+        region = (region or "").upper()
+        code = self._region_index.get(region)
+        if code is None:
+            code = self._region_index[region] = len(self.regions)
+            self.regions.append(region)
+        return code
+
+    def type_mask(self, *protocols: str):
+        return np.isin(self.type_code, [TYPE_CODES.get(p, -1) for p in protocols])
+
+    def region_mask(self, *regions: str):
+        return np.isin(self.region, [self._region_index.get(r.upper(), -1) for r in regions])
+
+    # ─── Selection ───────────────────────────────────────────────────────
+    def rows(self, mask=None):
+        """اندیس سطرها: همه، یا سطرهای True در ماسک بولی، یا خود آرایهٔ اندیس."""
+        if mask is None:
+            return np.arange(len(self))
+        mask = np.asarray(mask)
+        return np.flatnonzero(mask) if mask.dtype == bool else mask.astype(np.intp)
+
+    def take(self, idx) -> "NodeTable":
+        """زیرجدول با سطرهای idx (آرایهٔ اندیس یا ماسک بولی)، به همان ترتیب."""
+        idx = self.rows(idx)
+        sub = NodeTable.__new__(NodeTable)
+        sub.nodes = [self.nodes[i] for i in idx]
+        sub.raw = [self.raw[i] for i in idx]
+        sub.regions, sub._region_index = list(self.regions), dict(self._region_index)
+        for col in ("type_code", "port", "ipv4", "latency_ms", "status", "region", "last_checked"):
+            setattr(sub, col, getattr(self, col)[idx].copy())
+        return sub
+
+    def argsort(self, by: str = "latency_ms", descending: bool = False):
+        """اندیس‌های مرتب (پایدار؛ NaN همیشه آخر)."""
+        col = getattr(self, by)
+        if descending:
+            col = -col.astype(np.float64)
+        return np.argsort(col, kind="stable")
+
+    def top_k(self, k: int, by: str = "latency_ms", mask=None, descending: bool = False):
+        """اندیس k سطر برتر بر اساس ستون by (پیش‌فرض: کمترین تأخیر) میان سطرهای mask."""
+        col = getattr(self, by).astype(np.float64)
+        if descending:
+            col = -col
+        col = np.where(np.isnan(col), np.inf, col)
+        rows = self.rows(mask)
+        if k >= len(rows):
+            return rows[np.argsort(col[rows], kind="stable")]
+        part = rows[np.argpartition(col[rows], k)[:k]]
+        return part[np.argsort(col[part], kind="stable")]
+
+    def region_counts(self, mask=None) -> Dict[str, int]:
+        codes = self.region if mask is None else self.region[mask]
+        counts = np.bincount(codes, minlength=len(self.regions))
+        return {self.regions[c] or "unknown": int(n) for c, n in enumerate(counts) if n}
+
+    # ─── Stage hooks ─────────────────────────────────────────────────────
+    def apply_health(self, results: List[Dict[str, Any]], rows=None, now: Optional[float] = None) -> None:
+        """نتیجه‌های check_node (به ترتیب rows یا کل جدول) را در ستون‌ها می‌نویسد."""
+        rows = self.rows(rows)
+        now = now or time.time()
+        ok = np.fromiter((bool(r.get("ok")) for r in results), dtype=bool, count=len(rows))
+        self.status[rows] = np.where(ok, STATUS_OK, STATUS_FAIL)
+        self.latency_ms[rows] = [r.get("latency_ms", np.nan) if r.get("ok") else np.nan for r in results]
+        ips = np.fromiter((ipv4_to_int(r.get("ip")) for r in results), dtype=np.uint32, count=len(rows))
+        self.ipv4[rows] = np.where(ips > 0, ips, self.ipv4[rows])
+        self.last_checked[rows] = now
+
+    def set_regions(self, rows, regions: Iterable[Optional[str]]) -> None:
+        self.region[self.rows(rows)] = [self.region_code(r) for r in regions]
+
+    def assign_regions_by_ip(self, lookup, rows=None) -> None:
+        """
+        برای سطرهایی که IPv4 دارند و منطقه ندارند، lookup(ip) را برای هر IP
+        یکتا فقط یک بار صدا می‌زند و کد منطقه را در همهٔ سطرهای آن IP می‌نویسد.
+        """
+        rows = self.rows(rows)
+        rows = rows[(self.ipv4[rows] > 0) & (self.region[rows] == 0)]
+        uniq, inverse = np.unique(self.ipv4[rows], return_inverse=True)
+        if len(rows):
+            codes = np.array([self.region_code(lookup(int_to_ipv4(ip))) for ip in uniq], dtype=np.uint16)
+            self.region[rows] = codes[inverse]
+
+    def to_nodes(self, rows=None) -> List[Dict[str, Any]]:
+        """خروجی dict (ساختار فعلی) با status/latency/region/ip در meta."""
+        out = []
+        for i in self.rows(rows):
+            node = self.nodes[i]
+            node = node.to_dict() if isinstance(node, LazyNode) else as_dict(node)
+            node = {**node, "meta": dict(node.get("meta") or {})}
+            meta = node["meta"]
+            meta["status"] = STATUS_NAMES[int(self.status[i])]
+            if not np.isnan(self.latency_ms[i]):
+                meta["latency_ms"] = int(self.latency_ms[i])
+            if self.region[i]:
+                meta["region"] = self.regions[self.region[i]]
+            if self.ipv4[i]:
+                meta["ip"] = int_to_ipv4(self.ipv4[i])
+            if not np.isnan(self.last_checked[i]):
+                meta["last_checked"] = float(self.last_checked[i])
+            out.append(node)
+        return out
@@ -1,21 +1,33 @@
-import re
+from .fingerprint import node_fingerprint, security_key, transport_key
+from .valid import mark
+from .uri import split_uri, tls_settings, transport_settings
 
 def parse_trojan(link):
-    pattern = re.compile(r"^trojan://([^@]+)@([\w\.-]+):(\d+)", re.IGNORECASE)
-    m = pattern.match(link.strip())
-    if not m:
+    link = link.strip()
+    uri = split_uri(link)
+    if not uri or uri.scheme != "trojan" or not uri.userinfo or not uri.host or uri.port is None:
         return None
-    password, server, port = m.groups()
-    return {
-        "raw": link.strip(),
+    params = uri.params
+    password, server, port = uri.userinfo, uri.host, uri.port
+    # تروجان بدون security همان tls است
+    tls = tls_settings(params, params.get("security") or "tls")
+    transport = transport_settings(params)
+    node = {
+        "raw": link,
         "tag": f"trojan-{server}-{port}",
         "type": "trojan",
         "config": {
             "type": "trojan",
             "server": server,
-            "port": int(port),
+            "port": port,
             "password": password,
-            "tls": {"enabled": True}
+            "tls": tls,
+            "transport": transport
         },
         "meta": {}
     }
+    if uri.name:
+        node["meta"]["name"] = uri.name
+    node["meta"]["fingerprint"] = node_fingerprint("trojan", server, port, password,
+                                                   transport_key(transport), security_key(tls))
+    return mark(node)
@@ -1,21 +1,34 @@
-import re
+from .fingerprint import node_fingerprint
+from .valid import mark
+from .uri import split_uri, tls_settings
 
 def parse_tuic(link):
-    pattern = re.compile(r"^tuic://([^@]+)@([\w\.-]+):(\d+)", re.IGNORECASE)
-    m = pattern.match(link.strip())
-    if not m:
+    link = link.strip()
+    uri = split_uri(link)
+    if not uri or uri.scheme != "tuic" or not uri.userinfo or not uri.host or uri.port is None:
         return None
-    password, server, port = m.groups()
-    return {
-        "raw": link.strip(),
+    params = uri.params
+    uuid, _, password = uri.userinfo.partition(":")
+    server, port = uri.host, uri.port
+    config = {
+        "type": "tuic",
+        "server": server,
+        "port": port,
+        "uuid": uuid,
+        "password": password,
+        "tls": tls_settings(params, "tls")
+    }
+    for key in ("congestion_control", "udp_relay_mode"):
+        if params.get(key):
+            config[key] = params[key]
+    node = {
+        "raw": link,
         "tag": f"tuic-{server}-{port}",
         "type": "tuic",
-        "config": {
-            "type": "tuic",
-            "server": server,
-            "port": int(port),
-            "password": password,
-            "tls": {"enabled": True}
-        },
+        "config": config,
         "meta": {}
     }
+    if uri.name:
+        node["meta"]["name"] = uri.name
+    node["meta"]["fingerprint"] = node_fingerprint("tuic", server, port, f"{uuid.lower()}:{password}", security="tls")
+    return mark(node)
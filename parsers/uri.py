@@ -0,0 +1,95 @@
+# دیکود تک‌گذر لینک‌های URI شکل: userinfo، host، port، پارامترهای query و #نام
+import re
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import unquote
+
+_PORT = re.compile(r"\d+")
+_TRUE = {"1", "true", "yes"}
+TLS_SECURITIES = {"tls", "xtls", "reality"}
+
+
+class URI(NamedTuple):
+    scheme: str             # با حروف کوچک
+    userinfo: str           # unquote شده
+    host: str               # بدون [] برای IPv6
+    port: Optional[int]     # None اگر نبود یا عدد نبود
+    port_spec: str          # متن خام پورت (مثلاً «443,5000-6000» در hysteria2)
+    params: Dict[str, str]  # کلیدها با حروف کوچک، مقدارها unquote شده
+    name: str               # #نام، unquote شده
+
+
+def _unquote(s: str) -> str:
+    return unquote(s) if "%" in s else s
+
+
+def split_uri(link: str) -> Optional[URI]:
+    """scheme://userinfo@host:port/path?query#name → URI (یا None اگر «://» نداشت)."""
+    scheme, sep, rest = link.partition("://")
+    if not sep:
+        return None
+    rest, _, name = rest.partition("#")
+    rest, _, query = rest.partition("?")
+    # userinfo می‌تواند «/» داشته باشد (base64 استاندارد در ss)، پس اول @ جدا می‌شود
+    userinfo, _, hostport = rest.rpartition("@")
+    hostport = hostport.partition("/")[0]
+    if hostport.startswith("["):
+        host, _, port = hostport[1:].partition("]")
+        port = port[1:]
+    else:
+        host, sep, port = hostport.rpartition(":")
+        if not sep:
+            host, port = port, ""
+    m = _PORT.match(port)
+    params = {}
+    if query:
+        for part in query.split("&"):
+            key, _, value = part.partition("=")
+            if key:
+                params[key.lower()] = _unquote(value)
+    return URI(scheme.lower(), _unquote(userinfo), host, int(m.group()) if m else None,
+               port, params, _unquote(name))
+
+
+def flag(params: Dict[str, str], *keys: str) -> bool:
+    for key in keys:
+        if key in params and params[key].lower() in _TRUE:
+            return True
+    return False
+
+
+def tls_settings(params: Dict[str, str], security: str) -> dict:
+    """
+    tls کامل از روی security و پارامترها:
+    sni (یا peer)، insecure، alpn، fingerprint (fp) و برای reality: pbk/sid/spx.
+    """
+    security = (security or "").lower()
+    if security not in TLS_SECURITIES:
+        return {"enabled": False}
+    tls = {"enabled": True}
+    sni = params.get("sni") or params.get("peer")
+    if sni:
+        tls["sni"] = sni
+    tls["insecure"] = flag(params, "allowinsecure", "insecure", "allow_insecure")
+    if params.get("alpn"):
+        tls["alpn"] = [a for a in params["alpn"].split(",") if a]
+    if params.get("fp"):
+        tls["fingerprint"] = params["fp"]
+    if security == "reality":
+        reality = {"public_key": params.get("pbk", ""), "short_id": params.get("sid", "")}
+        if params.get("spx"):
+            reality["spider_x"] = params["spx"]
+        tls["reality"] = reality
+    return tls
+
+
+def transport_settings(params: Dict[str, str], kind: Optional[str] = None) -> dict:
+    """transport از type/path/host/serviceName/headerType/mode؛ پیش‌فرض tcp."""
+    kind = (kind or params.get("type") or "tcp").lower()
+    transport = {"type": kind}
+    if not params:
+        return transport
+    for key, param in (("path", "path"), ("host", "host"), ("service_name", "servicename"),
+                       ("header_type", "headertype"), ("mode", "mode")):
+        if params.get(param):
+            transport[key] = params[param]
+    return transport
@@ -0,0 +1,185 @@
+# نشانگر «از نظر ساختاری معتبر» برای نودهای پارسر، تا اعتبارسنجی JSON-schema دوباره اجرا نشود
+import json
+import re
+from hashlib import blake2b
+from pathlib import Path
+from zlib import crc32
+
+from .cache import parser_version
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+MARKER_KEY = "validated"          # در node["meta"]
+# یک encoder ثابت: json.dumps با آرگومان غیرپیش‌فرض برای هر نود encoder تازه می‌سازد
+_canonical = json.JSONEncoder(sort_keys=True, separators=(",", ":"), check_circular=False, default=str).encode
+
+SS_CIPHERS = frozenset((
+    "aes-128-gcm", "aes-192-gcm", "aes-256-gcm",
+    "chacha20-ietf-poly1305", "chacha20-poly1305", "xchacha20-ietf-poly1305", "xchacha20-poly1305",
+    "2022-blake3-aes-128-gcm", "2022-blake3-aes-256-gcm", "2022-blake3-chacha20-poly1305",
+    "aes-128-cfb", "aes-192-cfb", "aes-256-cfb", "aes-128-ctr", "aes-192-ctr", "aes-256-ctr",
+    "chacha20", "chacha20-ietf", "rc4-md5", "none", "plain",
+))
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_UUID_PROTOS = ("vmess", "vless", "tuic")
+
+
+def _schema_bytes() -> bytes:
+    # نام فایل اسکیما ممکن است کاراکتر نامرئی داشته باشد (مثل validator)
+    for path in sorted(CONFIG_DIR.glob("schema*.json")):
+        return path.read_bytes()
+    return b""
+
+
+# تغییر پارسرها یا اسکیما همهٔ نشانگرهای قبلی را بی‌اثر می‌کند
+_SCHEMA_BYTES = _schema_bytes()
+MARKER_VERSION = blake2b(parser_version().encode() + _SCHEMA_BYTES, digest_size=4).hexdigest()
+
+# ─── چک سریع از روی خود اسکیما
+# زیرمجموعهٔ کلیدواژه‌هایی که اسکیمای ما به کار می‌برد به تابع‌های پایتون کامپایل می‌شود.
+# کلیدواژهٔ ناشناخته یعنی «نشانگر نزن»، تا jsonschema در ckecker.validator تصمیم بگیرد.
+_TYPES = {"string": (str,), "integer": (int,), "number": (int, float), "boolean": (bool,),
+          "object": (dict,), "array": (list,), "null": (type(None),)}
+_ANNOTATIONS = frozenset(("$schema", "$defs", "title", "description", "default"))
+
+
+def _never(_):
+    return False
+
+
+def _always(_):
+    return True
+
+
+def _all(checks):
+    if not checks:
+        return _always
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(v):
+        for c in checks:
+            if not c(v):
+                return False
+        return True
+    return check
+
+
+def _compile(sub, root):
+    """sub-schema → check(value) -> bool."""
+    if sub is True or sub == {} or (isinstance(sub, dict) and not set(sub) - _ANNOTATIONS):
+        return _always
+    if sub is False or not isinstance(sub, dict) or set(sub) - _ANNOTATIONS - {
+            "$ref", "type", "const", "enum", "required", "properties", "additionalProperties", "items"}:
+        return _never
+    checks = []
+    if "$ref" in sub:
+        ref = sub["$ref"]
+        if not ref.startswith("#/$defs/"):
+            return _never
+        checks.append(_compile(root["$defs"][ref[len("#/$defs/"):]], root))
+    if "type" in sub:
+        kinds = sub["type"] if isinstance(sub["type"], list) else [sub["type"]]
+        if any(k not in _TYPES for k in kinds):
+            return _never
+        # type(v) is دقیق است: bool زیرنوع int نیست، مثل JSON
+        allowed = frozenset(t for k in kinds for t in _TYPES[k])
+        checks.append(lambda v: type(v) in allowed)
+    if "const" in sub:
+        const = sub["const"]
+        checks.append(lambda v: type(v) is type(const) and v == const)
+    if "enum" in sub:
+        try:
+            enum = frozenset((type(e), e) for e in sub["enum"])
+        except TypeError:       # عضو شیء/آرایه: به jsonschema واگذار
+            return _never
+
+        def check_enum(v):
+            try:
+                return (type(v), v) in enum
+            except TypeError:
+                return False
+        checks.append(check_enum)
+    if "required" in sub:
+        required = frozenset(sub["required"])
+        checks.append(lambda v: type(v) is not dict or required <= v.keys())
+    if "properties" in sub or "additionalProperties" in sub:
+        props = {k: _compile(v, root) for k, v in sub.get("properties", {}).items()}
+        extra = _compile(sub.get("additionalProperties", True), root)
+        get = props.get
+
+        def check_object(v):
+            if type(v) is not dict:
+                return True
+            for k, item in v.items():
+                if not get(k, extra)(item):
+                    return False
+            return True
+        checks.append(check_object)
+    if "items" in sub:
+        item_check = _compile(sub["items"], root)
+        checks.append(lambda v: type(v) is not list or all(map(item_check, v)))
+    return _all(checks)
+
+
+def _compile_protocols(raw: bytes):
+    """مثل ckecker.validator: شاخه‌های oneOf با const نوع پروتکل جدا می‌شوند → {proto: check}."""
+    try:
+        schema = json.loads(raw)
+        branches = schema["properties"]["config"]["oneOf"]
+    except (ValueError, KeyError, TypeError):
+        return {}
+    checks = {}
+    for branch in branches:
+        name = branch["$ref"].rsplit("/", 1)[-1]
+        proto = schema["$defs"][name]["properties"]["type"]["const"]
+        sub = dict(schema)
+        sub["properties"] = {**schema["properties"], "config": {"$ref": branch["$ref"]}}
+        del sub["$schema"]
+        checks[proto] = _compile(sub, schema)
+    return checks
+
+
+SCHEMA_CHECKS = _compile_protocols(_SCHEMA_BYTES)
+
+
+def _checksum(node) -> int:
+    # شکل کانونیک (کلیدهای مرتب): ProxyNode.to_dict ترتیب کلیدهای config را عوض می‌کند
+    body = _canonical([node.get("type"), node.get("tag"), node.get("raw"), node.get("config")])
+    return crc32(body.encode())
+
+
+def structurally_valid(node) -> bool:
+    """اسکیمای کامپایل‌شده (enumها، کلیدهای لازم، نوع‌ها) و چک‌های ارزانِ بیشتر: بازهٔ پورت، قالب UUID، cipher مجاز برای ss."""
+    schema_check = SCHEMA_CHECKS.get(node.get("type"))
+    if schema_check is None or not schema_check(node):
+        return False
+    cfg = node["config"]
+    port = cfg.get("port")
+    if type(port) is not int or not 0 < port < 65536 or not cfg.get("server"):
+        return False
+    proto = node["type"]
+    if proto in _UUID_PROTOS and not _UUID.fullmatch(cfg.get("uuid") or ""):
+        return False
+    if proto == "ss" and (cfg.get("cipher") or "").lower() not in SS_CIPHERS:
+        return False
+    return True
+
+
+def mark(node):
+    """اگر چک‌ها رد نشوند، meta["validated"] = "نسخه:crc32" را می‌گذارد؛ خود نود را برمی‌گرداند."""
+    if structurally_valid(node):
+        node["meta"][MARKER_KEY] = f"{MARKER_VERSION}:{_checksum(node):08x}"
+    return node
+
+
+def is_marked(node) -> bool:
+    """
+    True فقط برای نودی که پارسرِ همین نسخه ساخته و محتوایش بعد از آن
+    تغییر نکرده؛ JSON دستی یا ورودی DB (بدون نشانگر یا با crc نامطابق) False است.
+    """
+    meta = node.get("meta") if isinstance(node, dict) else None
+    marker = meta.get(MARKER_KEY) if isinstance(meta, dict) else None
+    if not isinstance(marker, str):
+        return False
+    version, _, crc = marker.partition(":")
+    return version == MARKER_VERSION and crc == f"{_checksum(node):08x}"
@@ -1,23 +1,33 @@
-import re
+from .fingerprint import node_fingerprint, security_key, transport_key
+from .valid import mark
+from .uri import split_uri, tls_settings, transport_settings
 
 def parse_vless(link):
-    pattern = re.compile(r"^vless://([^@]+)@([\w\.-]+):(\d+)", re.IGNORECASE)
-    m = pattern.match(link.strip())
-    if not m:
+    link = link.strip()
+    uri = split_uri(link)
+    if not uri or uri.scheme != "vless" or not uri.userinfo or not uri.host or uri.port is None:
         return None
-    uuid, server, port = m.groups()
-    return {
-        "raw": link.strip(),
+    params = uri.params
+    uuid, server, port = uri.userinfo, uri.host, uri.port
+    tls = tls_settings(params, params.get("security", "none"))
+    transport = transport_settings(params)
+    node = {
+        "raw": link,
         "tag": f"vless-{server}-{port}",
         "type": "vless",
         "config": {
             "type": "vless",
             "server": server,
-            "port": int(port),
+            "port": port,
             "uuid": uuid,
-            "flow": "",
-            "tls": {"enabled": False},
-            "transport": {"type": "none"}
+            "flow": params.get("flow", ""),
+            "tls": tls,
+            "transport": transport
         },
         "meta": {}
     }
+    if uri.name:
+        node["meta"]["name"] = uri.name
+    node["meta"]["fingerprint"] = node_fingerprint("vless", server, port, uuid.lower(),
+                                                   transport_key(transport), security_key(tls))
+    return mark(node)
@@ -1,6 +1,8 @@
-import re
 import base64
 import json
+from .fingerprint import fingerprint
+from .valid import mark
+from .uri import split_uri, tls_settings, transport_settings
 
 def decode_vmess_payload(payload):
     try:
@@ -10,27 +12,60 @@ def decode_vmess_payload(payload):
     except Exception:
         return None
 
+def _from_json(data):
+    """قالب v2rayN: vmess://base64(JSON) → (server, port, uuid, aid, cipher, params, name)"""
+    params = {k.lower(): str(v) for k, v in data.items() if v not in (None, "")}
+    # در JSON «type» نوع هدر است و «net» نوع ترنسپورت
+    params["headertype"] = params.pop("type", "")
+    params["type"] = params.pop("net", "tcp")
+    if params.get("type") == "grpc" and "path" in params:
+        params.setdefault("servicename", params["path"])
+    return (data.get("add", ""), data.get("port", 0), data.get("id", ""), data.get("aid", 0),
+            data.get("scy", ""), params, params.get("tls", ""), data.get("ps", ""))
+
+def _from_uri(uri):
+    """قالب URI: vmess://uuid@host:port?type=&security=&...#name"""
+    p = uri.params
+    return (uri.host, uri.port, uri.userinfo, p.get("aid", 0), p.get("encryption", ""), p,
+            p.get("security", ""), uri.name)
+
 def parse_vmess(link):
-    pattern = re.compile(r"^vmess://(.+)", re.IGNORECASE)
-    m = pattern.match(link.strip())
-    if not m:
+    link = link.strip()
+    uri = split_uri(link)
+    if not uri or uri.scheme != "vmess":
+        return None
+    data = decode_vmess_payload(link[8:].partition("#")[0])
+    if isinstance(data, dict):
+        fields = _from_json(data)
+    elif uri.userinfo and uri.host:
+        fields = _from_uri(uri)
+    else:
         return None
-    payload = m.group(1)
-    data = decode_vmess_payload(payload)
-    if not data:
+    server, port, uuid, aid, cipher, params, security, name = fields
+    try:
+        port, aid = int(port or 0), int(aid or 0)
+    except (TypeError, ValueError):
         return None
-    return {
-        "raw": link.strip(),
-        "tag": f"vmess-{data.get('add','')}-{data.get('port','')}",
+    tls = tls_settings(params, security)
+    config = {
+        "type": "vmess",
+        "server": server,
+        "port": port,
+        "uuid": uuid,
+        "alter_id": aid,
+        "tls": tls,
+        "transport": transport_settings(params)
+    }
+    if cipher:
+        config["cipher"] = cipher
+    node = {
+        "raw": link,
+        "tag": f"vmess-{server}-{port}",
         "type": "vmess",
-        "config": {
-            "type": "vmess",
-            "server": data.get("add", ""),
-            "port": int(data.get("port", 0)),
-            "uuid": data.get("id", ""),
-            "alter_id": int(data.get("aid", 0)),
-            "tls": {"enabled": data.get("tls", "") == "tls", "sni": data.get("sni", ""), "insecure": False},
-            "transport": {"type": data.get("net", "none"), "path": data.get("path", ""), "host": data.get("host", "")}
-        },
+        "config": config,
         "meta": {}
     }
+    if name:
+        node["meta"]["name"] = name
+    node["meta"]["fingerprint"] = fingerprint(config)
+    return mark(node)
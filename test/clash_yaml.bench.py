@@ -0,0 +1,62 @@
+# Benchmark: utils/clash_yaml.py event streaming vs yaml.safe_load in extract_from_clash_yaml
+import base64
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import yaml
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.clash_yaml import Loader
+from utils.extract import extract_from_clash_yaml, find_urls
+
+ROOT = Path(__file__).resolve().parent.parent
+FILES = [ROOT / "backup" / "merged_clean.yaml"]
+ROUNDS = 3
+
+
+def old_extract_from_clash_yaml(text):
+    """extract_from_clash_yaml as it was before the streaming reader."""
+    links = defaultdict(list)
+    extra = set()
+    try:
+        data = yaml.safe_load(text)
+        for proxy in data.get("proxies", []):
+            ptype = proxy.get("type")
+            if ptype == "ss":
+                userinfo = f"{proxy.get('cipher','')}:{proxy.get('password','')}"
+                b64 = base64.urlsafe_b64encode(userinfo.encode()).decode().rstrip("=")
+                links["ss"].append(f"ss://{b64}@{proxy.get('server')}:{proxy.get('port')}")
+            elif ptype == "vmess":
+                vm_b64 = base64.urlsafe_b64encode(json.dumps(proxy).encode()).decode().rstrip("=")
+                links["vmess"].append(f"vmess://{vm_b64}")
+            elif ptype == "vless":
+                links["vless"].append(f"vless://{proxy.get('uuid')}@{proxy.get('server')}:{proxy.get('port')}")
+            elif ptype == "trojan":
+                links["trojan"].append(f"trojan://{proxy.get('password')}@{proxy.get('server')}:{proxy.get('port')}")
+        extra |= find_urls(data)
+    except Exception:
+        pass
+    return links, extra
+
+
+def best_of(fn, text):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    print(f"loader: {Loader.__name__}")
+    for path in FILES:
+        text = path.read_text(encoding="utf-8")
+        assert old_extract_from_clash_yaml(text) == extract_from_clash_yaml(text), f"output mismatch on {path.name}"
+        old = best_of(old_extract_from_clash_yaml, text)
+        new = best_of(extract_from_clash_yaml, text)
+        print(f"{path.name:20} {len(text)//1024:5}KB | safe_load {old*1000:7.1f}ms | "
+              f"streaming {new*1000:7.1f}ms | x{old/new:.1f}")
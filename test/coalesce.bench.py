@@ -0,0 +1,47 @@
+# Benchmark: endpoint coalescing in the health engine (one probe per IP:port + probe kind)
+import collections
+import importlib.util
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ckecker import health
+from parsers import lazy_nodes
+
+# the bench file name has dots, so load it by path to reuse its slow loopback HTTP server
+_spec = importlib.util.spec_from_file_location("health_async_bench", Path(__file__).with_name("health_async.bench.py"))
+_bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_bench)
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "input"
+NODES = 2_000
+ENDPOINTS = 40      # distinct ws paths on one listener → distinct probe kinds
+LIMIT = 500
+
+
+def corpus_factor():
+    links = [l for f in sorted(INPUT_DIR.glob("*.txt")) for l in f.read_text(encoding="utf-8").splitlines() if l.strip()]
+    nodes = list(lazy_nodes(links))
+    groups = collections.Counter((n["type"], n["config"]["server"].lower(), n["config"]["port"]) for n in nodes)
+    return len(nodes), len(groups)
+
+
+if __name__ == "__main__":
+    logging.getLogger("health_checker").setLevel(logging.ERROR)
+    total, groups = corpus_factor()
+    # hostnames only; after DNS, names that share an IP merge further, so this is a lower bound
+    print(f"corpus: {total:,} nodes on {groups:,} type+host:port groups  (x{total/groups:.2f} at least)")
+
+    port = _bench.serve()
+    nodes = [{"config": {"type": "vmess", "server": "127.0.0.1", "port": port, "timeout": 10,
+                         "transport": {"type": "ws", "path": f"/ws{i % ENDPOINTS}"}}} for i in range(NODES)]
+    for coalesce in (False, True):
+        summary = {}
+        start = time.perf_counter()
+        results = health.health_check_nodes(nodes, max_workers=LIMIT, coalesce=coalesce, summary=summary)
+        took = time.perf_counter() - start
+        assert all(r["ok"] for r in results)
+        probes = summary.get("probes", NODES)
+        print(f"coalesce={coalesce!s:5}  {NODES:,} nodes  {probes:5,} probes  {took:6.2f}s  {NODES/took:8,.0f} nodes/s")
@@ -0,0 +1,88 @@
+# Benchmark: connect_scan (one thread, selectors) vs a thread pool of blocking create_connection, on loopback
+import selectors
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ckecker import connect_scan
+
+TARGETS = 4_000
+HOLD = 0.3          # injected delay: black-holed targets hang until the probe deadline
+THREADS = 40        # backup/app.py's old pool size
+LIVE_PORTS = 8
+
+
+def listeners():
+    """LIVE_PORTS accepting listeners (drained by one thread) and one black hole
+    (accept queue full, so the kernel drops further SYNs and connects hang)."""
+    sel = selectors.DefaultSelector()
+    live = []
+    for _ in range(LIVE_PORTS):
+        s = socket.socket()
+        s.bind(("127.0.0.1", 0))
+        s.listen(4096)
+        s.setblocking(False)
+        sel.register(s, selectors.EVENT_READ)
+        live.append(s.getsockname()[1])
+
+    def drain():
+        while True:
+            for key, _ in sel.select():
+                try:
+                    key.fileobj.accept()[0].close()
+                except OSError:
+                    pass
+
+    threading.Thread(target=drain, daemon=True).start()
+
+    hole = socket.socket()
+    hole.bind(("127.0.0.1", 0))
+    hole.listen(0)
+    fillers = []
+    for _ in range(3):
+        s = socket.socket()
+        s.setblocking(False)
+        s.connect_ex(hole.getsockname())
+        fillers.append(s)
+    time.sleep(0.1)
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))   # bound, never listening → ECONNREFUSED
+    return live, hole.getsockname()[1], closed.getsockname()[1], (hole, closed, fillers)
+
+
+def blocking(host, port):
+    try:
+        with socket.create_connection((host, port), HOLD):
+            return True
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":
+    live, hole, closed, _keep = listeners()
+    # half dead-and-silent (the common case for scraped proxy lists), a quarter live, a quarter refused
+    targets = []
+    for i in range(TARGETS):
+        kind = i % 4
+        port = hole if kind < 2 else live[i % LIVE_PORTS] if kind == 2 else closed
+        targets.append(("127.0.0.1", port))
+    expected = [t[1] in live for t in targets]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        old = list(pool.map(lambda t: blocking(*t), targets))
+    base = time.perf_counter() - start
+    assert old == expected
+    print(f"threads x{THREADS:<4} {TARGETS:,} targets  {base:6.2f}s  {TARGETS/base:9,.0f}/s")
+
+    start = time.perf_counter()
+    results = connect_scan.scan(targets, timeout=HOLD)
+    took = time.perf_counter() - start
+    assert [r.ok for r in results] == expected
+    rtts = sorted(r.rtt_ms for r in results if r.ok)
+    print(f"connect_scan     {TARGETS:,} targets  {took:6.2f}s  {TARGETS/took:9,.0f}/s  (x{base/took:.1f})"
+          f"  live rtt p50 {rtts[len(rtts)//2]:.2f}ms")
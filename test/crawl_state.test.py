@@ -0,0 +1,59 @@
+# utils.crawl_state: a crawl killed (SIGKILL) early still resumes with its roots and finished pages
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.crawl_state import CrawlState
+from utils.crawler import Crawler
+
+
+async def child(db: str) -> None:
+    """Crawl /fast and /slow from a local server; /slow never answers before the kill."""
+    from aiohttp import web
+
+    async def slow(_):
+        await asyncio.sleep(60)
+        return web.Response(text="late")
+
+    app = web.Application()
+    app.router.add_get("/fast", lambda _: web.Response(text="ss://YWVzLTI1Ni1nY206cHc=@h.example.com:8388"))
+    app.router.add_get("/slow", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    state = CrawlState(Path(db), checkpoint_interval=0.2)
+
+    def on_page(url, typ, page, depth):
+        print("fetched", url, flush=True)
+        return ()
+
+    await Crawler(on_page, state=state, timeout=120).run([(f"{base}/fast", "plain"), (f"{base}/slow", "plain")])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        asyncio.run(child(sys.argv[1]))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = str(Path(tmp) / "state.sqlite3")
+        proc = subprocess.Popen([sys.executable, __file__, db], stdout=subprocess.PIPE, text=True)
+        assert proc.stdout.readline().startswith("fetched"), "child did not fetch /fast"
+        time.sleep(0.5)     # past checkpoint_interval; /slow is still in flight
+        os.kill(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+        state = CrawlState(Path(db))
+        assert state.resume(), "the killed run must be resumable"
+        entries = {url.rsplit("/", 1)[1]: status for url, _, _, status, _, _ in state.entries()}
+        assert entries == {"fast": "ok", "slow": None}, entries
+        state.close()
+    print("crawl state survives SIGKILL ok")
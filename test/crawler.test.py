@@ -0,0 +1,49 @@
+# utils.crawler.fetch: base64 bodies stream into tokens; a base64-looking head followed by plain
+# text falls back to the buffered text body so the plain links are not lost
+import asyncio
+import base64
+import sys
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.crawler import SNIFF_SIZE, Crawler
+from utils.tokenizer import scan_lines
+
+B64_LINKS = [f"trojan://pw{i}@b64-{i}.example.com:443#b{i}" for i in range(400)]
+PLAIN_LINKS = [f"ss://YWVzLTI1Ni1nY206cHc=@plain-{i}.example.com:8388#p{i}" for i in range(50)]
+ENCODED = base64.b64encode("\n".join(B64_LINKS).encode())
+assert len(ENCODED) > SNIFF_SIZE
+BODIES = {
+    "/b64": ENCODED,
+    "/mixed": ENCODED + b"\n" + "\n".join(PLAIN_LINKS).encode() + b"\n",
+}
+
+
+async def main():
+    app = web.Application()
+    app.router.add_get("/{name}", lambda r: web.Response(body=BODIES["/" + r.match_info["name"]]))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    crawler = Crawler(lambda *a: ())
+    try:
+        async with aiohttp.ClientSession() as session:
+            page = await crawler.fetch(session, f"http://127.0.0.1:{port}/b64")
+            assert page.body is None and [l for _, l in page.tokens] == B64_LINKS
+
+            page = await crawler.fetch(session, f"http://127.0.0.1:{port}/mixed")
+            assert page.tokens is None and page.body is not None, "mixed body must not be streamed"
+            links = [l for _, l in scan_lines(page.body.splitlines())[0]]
+            assert links[-len(PLAIN_LINKS):] == PLAIN_LINKS, links[-3:]
+    finally:
+        await runner.cleanup()
+    print("crawler fetch ok")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+# Benchmark: async health engine vs the old 20-thread pool, against a loopback server that answers after DELAY
+import asyncio
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ckecker import health
+
+PROBES = 2_000
+DELAY = 0.2            # simulated server RTT; probes spend their time waiting, not computing
+THREADS = 20           # old health_check_nodes default
+LIMITS = (100, 500, 2_000)
+
+
+async def _handle(reader, writer):
+    await reader.readuntil(b"\r\n\r\n")
+    await asyncio.sleep(DELAY)
+    writer.write(b"HTTP/1.1 101 Switching Protocols\r\nConnection: close\r\n\r\n")
+    await writer.drain()
+    writer.close()
+
+
+def serve():
+    """Slow HTTP server on its own loop/thread; returns its port."""
+    ready, box = threading.Event(), {}
+
+    async def main():
+        server = await asyncio.start_server(_handle, "127.0.0.1", 0, backlog=4096)
+        box["port"] = server.sockets[0].getsockname()[1]
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(main()), daemon=True).start()
+    ready.wait()
+    return box["port"]
+
+
+def threaded(nodes):
+    # the pre-async engine: one blocking ws_check per worker thread
+    cfgs = [n["config"] for n in nodes]
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(lambda c: health.ws_check(c["server"], c["port"], 10.0, path="/ws"), cfgs))
+
+
+if __name__ == "__main__":
+    logging.getLogger("health_checker").setLevel(logging.ERROR)
+    port = serve()
+    nodes = [{"config": {"type": "vmess", "server": "127.0.0.1", "port": port, "timeout": 10,
+                         "transport": {"type": "ws", "path": "/ws"}}} for _ in range(PROBES)]
+
+    start = time.perf_counter()
+    assert all(threaded(nodes))
+    base = time.perf_counter() - start
+    print(f"threads x{THREADS:<5}  {PROBES:,} probes  {base:6.2f}s  {PROBES/base:8,.0f}/s")
+
+    for limit in LIMITS:
+        start = time.perf_counter()
+        results = health.health_check_nodes(nodes, max_workers=limit)
+        took = time.perf_counter() - start
+        assert all(r["ok"] for r in results), [r for r in results if not r["ok"]][:3]
+        print(f"async  x{limit:<5}  {PROBES:,} probes  {took:6.2f}s  {PROBES/took:8,.0f}/s  (x{base/took:.1f})")
@@ -0,0 +1,48 @@
+# ckecker.health async engine: stopping iter_health_checks early cancels its probes;
+# the shared resolver coalesces lookups per event loop
+import asyncio
+import importlib.util
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ckecker import health
+from ckecker.resolver import Resolver
+
+# the bench file name has dots, so load it by path to reuse its slow loopback HTTP server
+_spec = importlib.util.spec_from_file_location("health_async_bench", Path(__file__).with_name("health_async.bench.py"))
+_bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_bench)
+
+
+async def early_break(port: int, coalesce: bool) -> None:
+    nodes = [{"config": {"type": "vmess", "server": "127.0.0.1", "port": port, "timeout": 10,
+                         "transport": {"type": "ws", "path": f"/ws{i}"}}} for i in range(50)]
+    before = asyncio.all_tasks()
+    results = health.iter_health_checks(nodes, concurrency=20, coalesce=coalesce)
+    async for _ in results:
+        break
+    await results.aclose()
+    left = [t for t in asyncio.all_tasks() - before if t is not asyncio.current_task()]
+    assert not left, f"{len(left)} probe tasks left running (coalesce={coalesce})"
+
+
+async def lookup(resolver: Resolver, host: str):
+    return await asyncio.gather(*(resolver.resolve_async(host) for _ in range(5)))
+
+
+if __name__ == "__main__":
+    logging.getLogger("health_checker").setLevel(logging.ERROR)
+    port = _bench.serve()
+    for coalesce in (False, True):
+        asyncio.run(early_break(port, coalesce))
+    print("early break cancels probes ok")
+
+    # two loops in turn: each coalesces its own five callers into one lookup task
+    resolver = Resolver()
+    assert asyncio.run(lookup(resolver, "localhost")) == ["127.0.0.1"] * 5
+    resolver.clear()
+    assert asyncio.run(lookup(resolver, "localhost")) == ["127.0.0.1"] * 5
+    assert resolver.lookups == 2, resolver.lookups
+    print("resolver per-loop coalescing ok")
@@ -0,0 +1,53 @@
+# Benchmark: parsers.lazy_nodes (cheap host/port scan) vs full parse_links, for stages that only read type/server/port
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from parsers import lazy_nodes, parse_links
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "input"
+FILES = ["ss.txt", "trojan.txt", "hysteria.txt"]
+VMESS = 20_000     # synthetic v2rayN links; the bundled corpus has no vmess
+ROUNDS = 3
+
+
+def vmess_link(i):
+    data = {"v": "2", "ps": f"node-{i}", "add": f"h{i}.example.com", "port": str(1000 + i % 60000),
+            "id": "b831381d-6324-4d53-ad4f-8cda48b30811", "aid": "0", "scy": "auto", "net": "ws",
+            "type": "none", "host": "cdn.example.com", "path": "/ws", "tls": "tls", "sni": "cdn.example.com"}
+    return "vmess://" + base64.b64encode(json.dumps(data).encode()).decode()
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def endpoints_full(links):
+    return [(n["type"], n["config"]["server"], n["config"]["port"]) for n in parse_links(links, workers=1, cache=False) if n]
+
+
+def endpoints_lazy(links):
+    return [(n["type"], n["config"]["server"], n["config"]["port"]) for n in lazy_nodes(links)]
+
+
+if __name__ == "__main__":
+    corpus = {
+        "ss/trojan/hysteria": [l for f in FILES for l in (INPUT_DIR / f).read_text(encoding="utf-8").splitlines() if l.strip()],
+        "vmess (synthetic)": [vmess_link(i) for i in range(VMESS)],
+    }
+    for name, links in corpus.items():
+        assert endpoints_lazy(links) == endpoints_full(links), f"{name}: endpoint mismatch"
+        nodes = list(lazy_nodes(links))
+        assert not any(n.decoded for n in nodes)
+        assert [n.to_dict() for n in nodes[:200]] == [n for n in parse_links(links[:200], cache=False) if n]
+        full = best_of(lambda: endpoints_full(links))
+        lazy = best_of(lambda: endpoints_lazy(links))
+        print(f"{name:20} {len(links):7,} links  full {len(links)/full:10,.0f}/s  lazy {len(links)/lazy:10,.0f}/s  (x{full/lazy:.1f})")
@@ -0,0 +1,92 @@
+# nmap_batch: XML report → per-target states; a fake nmap for batching and timeouts through
+# the async health engine; with nmap installed, also a live loopback batch
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ckecker import health, nmap_batch
+from ckecker.nmap_batch import NMAP_PATH, UNKNOWN, NmapBatchScanner, parse_xml
+
+SAMPLE = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap" args="nmap -Pn -n -T4 -p 443 -oX - -iL -">
+<host><status state="up"/>
+<address addr="104.16.1.1" addrtype="ipv4"/>
+<hostnames><hostname name="Example.com" type="user"/></hostnames>
+<ports><port protocol="tcp" portid="443"><state state="open" reason="syn-ack"/></port></ports>
+</host>
+<host><status state="up"/>
+<address addr="10.0.0.7" addrtype="ipv4"/>
+<ports><port protocol="tcp" portid="443"><state state="filtered" reason="no-response"/></port></ports>
+</host>
+<runstats><finished time="0"/><hosts up="2" down="0" total="2"/></runstats>
+</nmaprun>"""
+
+# reports every stdin host open on the -p port and logs its argv, one run per line
+FAKE_NMAP = """#!{python}
+import sys
+args = sys.argv[1:]
+with open({log!r}, "a") as f:
+    f.write(" ".join(args) + "\\n")
+port = args[args.index("-p") + 1]
+print('<nmaprun>')
+for host in sys.stdin.read().split():
+    print(f'<host><address addr="{{host}}" addrtype="ipv4"/><ports>'
+          f'<port protocol="tcp" portid="{{port}}"><state state="open"/></port></ports></host>')
+print('</nmaprun>')
+"""
+
+
+def fake_scanner(tmp: Path) -> NmapBatchScanner:
+    log = tmp / "runs.log"
+    exe = tmp / "nmap"
+    exe.write_text(FAKE_NMAP.format(python=sys.executable, log=str(log)))
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    return NmapBatchScanner(nmap_path=str(exe), batch_size=100)
+
+
+def async_engine_uses_scanner(tmp: Path) -> None:
+    """health_check_nodes routes tcp_check probes through the shared scanner, with the node timeout."""
+    scanner = nmap_batch._default = fake_scanner(tmp)
+    health.ASYNC_CHECKERS["tcp_check"] = health.nmap_tcp_check_async
+    health._NMAP_CHECKERS = ("tcp_check",)
+    nodes = [{"config": {"type": "ss", "server": f"10.0.{i // 250}.{i % 250 + 1}", "port": 443, "timeout": 4}}
+             for i in range(250)]
+    results = health.health_check_nodes(nodes, coalesce=False)
+    assert all(r["ok"] for r in results), results[:3]
+    runs = (tmp / "runs.log").read_text().splitlines()
+    assert len(runs) == 3, runs     # 250 probes → batches of 100
+    assert all("--host-timeout 4000ms" in run for run in runs), runs
+    assert scanner.wait_time(4) == 4 + nmap_batch.PROCESS_SLACK
+    assert scanner.wait_time() == scanner.process_timeout
+
+if __name__ == "__main__":
+    states = parse_xml(SAMPLE)
+    assert states[("104.16.1.1", 443, "tcp")] == "open"
+    assert states[("example.com", 443, "tcp")] == "open"
+    assert states[("10.0.0.7", 443, "tcp")] == "filtered"
+    print("parse_xml ok")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        async_engine_uses_scanner(Path(tmp))
+    print("async engine → batched nmap ok")
+
+    if not NMAP_PATH:
+        print("nmap not installed; skipping live scan")
+        sys.exit(0)
+    import socket
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    port = server.getsockname()[1]
+    scanner = NmapBatchScanner(batch_size=2)
+    result = scanner.scan([("127.0.0.1", port, "tcp"), ("localhost", port, "tcp"), ("127.0.0.1", 9, "tcp")])
+    print(result)
+    assert result[("127.0.0.1", port, "tcp")] == "open"
+    assert result[("127.0.0.1", 9, "tcp")] in ("closed", "filtered")
+    assert scanner.check("127.0.0.1", port)
+    assert UNKNOWN not in result.values()
+    print("live scan ok")
@@ -0,0 +1,43 @@
+# Memory: parsers.node.ProxyNode vs the nested dicts parse_link returns (tracemalloc)
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from parsers import parse_links
+from parsers.node import ProxyNode
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "input"
+FILES = ["ss.txt", "trojan.txt", "hysteria.txt", "test_links.txt"]
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    objs = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objs, size, elapsed
+
+
+if __name__ == "__main__":
+    lines = [l for f in FILES for l in (INPUT_DIR / f).read_text(encoding="utf-8").splitlines() if l.strip()]
+    for n in parse_links(lines, workers=1):
+        if n:
+            back = ProxyNode.from_dict(n).to_dict()
+            assert back == n and json.dumps(back) == json.dumps(n), f"lossy or reordered round trip: {n['raw']}"
+
+    # both built from the same input lines; what is left allocated is the resident cost
+    dicts, dict_size, t_dict = measure(lambda: [n for n in parse_links(lines, workers=1) if n])
+    del dicts
+    nodes, node_size, t_node = measure(
+        lambda: [ProxyNode.from_dict(n) for n in parse_links(lines, workers=1) if n])
+    print(f"{len(nodes)} nodes")
+    print(f"nested dicts  {dict_size / 1024 / 1024:7.2f} MiB  {dict_size / len(nodes):6.0f} B/node")
+    print(f"ProxyNode     {node_size / 1024 / 1024:7.2f} MiB  {node_size / len(nodes):6.0f} B/node"
+          f"  (x{dict_size / node_size:.1f} smaller)")
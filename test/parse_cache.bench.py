@@ -0,0 +1,54 @@
+# Benchmark: parse cache (parsers.cache) — cold, on-disk and in-memory hits vs no cache
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import parsers
+from parsers import parse_link, parse_links
+from parsers.cache import ParseCache
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "input"
+FILES = ["ss.txt", "vmess.txt", "vless.txt", "trojan.txt", "hysteria.txt"]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    lines = [l for f in FILES if (INPUT_DIR / f).exists()
+             for l in (INPUT_DIR / f).read_text(encoding="utf-8").splitlines() if l.strip()]
+    expected, base = timed(lambda: list(parse_links(lines, workers=1, cache=False)))
+    print(f"{len(lines):,} links")
+    print(f"no cache        {len(lines)/base:10,.0f} links/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "parse_cache.sqlite3"
+        parsers.cache._default = ParseCache(db)             # cold: parse + write
+        out, t = timed(lambda: list(parse_links(lines, workers=1)))
+        assert out == expected, "cold output mismatch"
+        print(f"cold            {len(lines)/t:10,.0f} links/s")
+        out, t = timed(lambda: list(parse_links(lines, workers=1)))   # LRU hits
+        assert out == expected, "lru output mismatch"
+        print(f"warm (memory)   {len(lines)/t:10,.0f} links/s")
+        parsers.cache._default.close()
+
+        parsers.cache._default = ParseCache(db)             # fresh process: disk hits
+        out, t = timed(lambda: list(parse_links(lines, workers=1)))
+        assert out == expected, "disk output mismatch"
+        print(f"warm (disk)     {len(lines)/t:10,.0f} links/s")
+        out, t = timed(lambda: [parse_link(l) for l in lines])
+        assert out == expected, "parse_link output mismatch"
+        print(f"parse_link hit  {len(lines)/t:10,.0f} links/s")
+
+        out[0]["meta"]["latency_ms"] = 1                    # callers get private copies
+        assert "latency_ms" not in parse_link(lines[0])["meta"]
+        parsers.cache._default.close()
+        parsers.cache._default = ParseCache(db, version="other")   # parser change → empty
+        assert not parsers.cache._default.get_many([parsers.cache.link_key(lines[0].strip())])
+        parsers.cache._default.close()
+        parsers.cache._default = None
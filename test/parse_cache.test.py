@@ -0,0 +1,42 @@
+# parsers.cache: one shared ParseCache used from many threads (parse_link, get/put/flush)
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import parsers
+from parsers import parse_link
+from parsers.cache import ParseCache, link_key
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "input"
+
+if __name__ == "__main__":
+    links = [l for f in ("ss.txt", "trojan.txt") for l in (INPUT_DIR / f).read_text(encoding="utf-8").splitlines()
+             if l.strip()][:2_000]
+    expected = [parse_link(l, cache=False) for l in links]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parsers.cache._default = ParseCache(Path(tmp) / "parse_cache.sqlite3")   # opened on the main thread
+
+        # a plain thread (the reported failure: sqlite3.ProgrammingError)
+        box = {}
+        worker = threading.Thread(target=lambda: box.update(node=parse_link(links[0])))
+        worker.start()
+        worker.join()
+        assert box["node"] == expected[0]
+
+        # many threads at once, cold then warm, with a concurrent flush
+        for _ in range(2):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                flusher = pool.submit(parsers.cache._default.flush)
+                out = list(pool.map(parse_link, links))
+                flusher.result()
+            assert out == expected
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pool.submit(parsers.cache._default.flush).result()
+            assert pool.submit(parsers.cache._default.get_many, [link_key(l) for l in links]).result()
+        parsers.cache._default.close()
+        parsers.cache._default = None
+    print("parse cache threads ok")
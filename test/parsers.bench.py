@@ -0,0 +1,34 @@
+# Benchmark: parsers.parse_links (batch, dict dispatch) vs a parse_link loop, parse cache off
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from parsers import parse_link, parse_links
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "input"
+FILES = ["ss.txt", "trojan.txt", "hysteria.txt"]
+TARGET = 250_000   # corpus is repeated up to this many links
+ROUNDS = 3
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    lines = [l for f in FILES for l in (INPUT_DIR / f).read_text(encoding="utf-8").splitlines() if l.strip()]
+    corpus = (lines * (TARGET // len(lines) + 1))[:TARGET]
+    assert list(parse_links(lines, workers=1, cache=False)) == [parse_link(l, cache=False) for l in lines], "output mismatch"
+    assert list(parse_links(corpus, workers=2, cache=False)) == list(parse_links(corpus, workers=1, cache=False)), "pool output mismatch"
+
+    loop = best_of(lambda: [parse_link(l, cache=False) for l in corpus])
+    print(f"parse_link loop       {len(corpus)/loop:10,.0f} links/s")
+    for workers in (1, 2, 4):
+        t = best_of(lambda: sum(1 for _ in parse_links(corpus, workers=workers, cache=False)))
+        print(f"parse_links workers={workers} {len(corpus)/t:10,.0f} links/s")
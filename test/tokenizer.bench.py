@@ -0,0 +1,59 @@
+# Micro-benchmark: utils/tokenizer.py vs the old per-line PATTERNS loop
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.tokenizer import group_links, iter_tokens
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "input"
+FILES = ["ss.txt", "trojan.txt"]
+ROUNDS = 5
+
+# The loop extract_links used before the tokenizer
+OLD_PATTERNS = {
+    "ss":       re.compile(r"^ss://.+",          re.MULTILINE),
+    "vmess":    re.compile(r"^vmess://.+",       re.MULTILINE),
+    "vless":    re.compile(r"^vless://.+",       re.MULTILINE),
+    "trojan":   re.compile(r"^trojan://.+",      re.MULTILINE),
+    "hysteria": re.compile(r"^hysteria2?://.+",  re.MULTILINE),
+    "reality":  re.compile(r"^reality://.+",     re.MULTILINE),
+    "http":     re.compile(r"^https?://.+",      re.MULTILINE),
+}
+
+
+def old_extract_links(text):
+    links = defaultdict(list)
+    for line in text.splitlines():
+        line = line.strip()
+        for proto, pat in OLD_PATTERNS.items():
+            if pat.match(line):
+                links[proto].append(line)
+                break
+    return links
+
+
+def new_extract_links(text):
+    return group_links(iter_tokens(text))
+
+
+def best_of(fn, text):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    texts = {name: (INPUT_DIR / name).read_text(encoding="utf-8") for name in FILES}
+    texts["mixed"] = "\n".join(texts.values())
+    for name, text in texts.items():
+        lines = text.count("\n") + 1
+        assert old_extract_links(text) == new_extract_links(text), f"output mismatch on {name}"
+        old = best_of(old_extract_links, text)
+        new = best_of(new_extract_links, text)
+        print(f"{name:10} {lines:6} lines | old {old*1000:7.1f}ms | tokenizer {new*1000:7.1f}ms | x{old/new:.1f}")
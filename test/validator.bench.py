@@ -0,0 +1,63 @@
+# Benchmark: compiled per-type validators (ckecker.validator) vs jsonschema.validate per node, on data/json/ss.json,
+# and validate_configs / invalid_configs process-pool scaling on a 100k-node input
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from jsonschema import ValidationError, validate
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ckecker.validator import SCHEMA, invalid_configs, logger, validate_config, validate_configs, validate_many
+from parsers import parse_links
+
+DATA = Path(__file__).resolve().parent.parent / "data" / "json" / "ss.json"
+BULK = 100_000
+
+
+def legacy_validate_config(config_dict):
+    """The previous implementation: a fresh validator and the full oneOf per call."""
+    try:
+        validate(instance=config_dict, schema=SCHEMA)
+        return True, None
+    except ValidationError as e:
+        return False, str(e)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    logger.setLevel(logging.WARNING)   # per-node DEBUG lines would dominate both timings
+    nodes = json.loads(DATA.read_text(encoding="utf-8"))
+    n = min(len(nodes), 500)            # legacy path is slow; time it on a prefix
+    legacy, t_legacy = timed(lambda: [legacy_validate_config(x)[0] for x in nodes[:n]])
+    single, t_single = timed(lambda: [validate_config(x)[0] for x in nodes])
+    bulk, t_bulk = timed(lambda: validate_many(nodes))
+    assert legacy == single[:n] == [r["valid"] for r in bulk][:n], "verdict mismatch"
+    print(f"{len(nodes):,} nodes, {sum(single):,} valid")
+    print(f"jsonschema.validate  {n/t_legacy:10,.0f} nodes/s  (first {n:,})")
+    print(f"validate_config      {len(nodes)/t_single:10,.0f} nodes/s  (x{(len(nodes)/t_single)/(n/t_legacy):.0f})")
+    print(f"validate_many        {len(nodes)/t_bulk:10,.0f} nodes/s  (x{(len(nodes)/t_bulk)/(n/t_legacy):.0f})")
+
+    parsed = [n for n in parse_links((x["raw"] for x in nodes), cache=False) if n]   # carry the parser marker
+    out, t = timed(lambda: validate_many(parsed))
+    assert all(r["valid"] for r in out)
+    print(f"validate_many (parser-marked) {len(parsed)/t:10,.0f} nodes/s")
+
+    big = (nodes * (BULK // len(nodes) + 1))[:BULK]
+    big[7] = {**big[7], "config": {**big[7]["config"], "port": "x"}}
+    base = None
+    for workers in (1, 2, 4):
+        out, t = timed(lambda: validate_configs(big, max_workers=workers))
+        assert out[7] == {"index": 7, "valid": False, "error": validate_config(big[7])[1]}
+        assert sum(r["valid"] for r in out) == len(big) - 1
+        base = base or t
+        print(f"validate_configs workers={workers}  {len(big)/t:10,.0f} nodes/s  (x{base/t:.2f} vs 1 worker)")
+    out, t = timed(lambda: invalid_configs(big))
+    assert out == [(7, "type", "config.port")]
+    print(f"invalid_configs             {len(big)/t:10,.0f} nodes/s")
@@ -0,0 +1,84 @@
+"""
+b64stream.py - Incremental base64 subscription decoder
+
+Decodes a base64 subscription chunk by chunk and hands back complete text
+lines as soon as they are available, so a multi-megabyte subscription never
+has to exist as one encoded string, one decoded bytes object and one decoded
+str at the same time.  Only the undecoded remainder of a 4-char group, an
+unfinished UTF-8 sequence and the last partial line are carried between
+chunks.
+
+Whitespace is skipped; `=` ends a segment, so concatenated base64 blocks
+decode the same as they would one by one, and missing padding is tolerated.
+Any other non-alphabet byte is skipped too, but marks the stream `valid=False`.
+"""
+
+import binascii
+import codecs
+from typing import Iterable, Iterator, Union
+
+_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+_WHITESPACE = b" \t\r\n\v\f"
+_ALL = bytes(range(256))
+_NOT_ALPHABET = bytes(set(_ALL) - set(_ALPHABET + b"="))       # deleted before decoding
+_BASE64_TEXT = _ALPHABET + b"=" + _WHITESPACE                   # deleted to find stray bytes
+
+SNIFF_MIN = 16   # shorter bodies are never treated as base64 (same floor as radar)
+
+
+def looks_base64(head: bytes) -> bool:
+    """True if *head* (the first bytes of a body) is base64 text only."""
+    stripped = head.strip()
+    return len(stripped) >= SNIFF_MIN and not stripped.translate(None, _BASE64_TEXT)
+
+
+class Base64LineDecoder:
+    def __init__(self):
+        self._quad = b""                         # < 4 undecoded base64 chars
+        self._utf8 = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self._tail = ""                          # unfinished last line
+        self.valid = True
+
+    def _decode(self, data: bytes, final: bool) -> bytes:
+        out = []
+        segments = data.split(b"=")
+        for i, seg in enumerate(segments):
+            quad = self._quad + seg
+            closing = final or i < len(segments) - 1
+            cut = len(quad) if closing else len(quad) - len(quad) % 4
+            block, self._quad = quad[:cut], quad[cut:]
+            if closing and len(block) % 4 == 1:  # a lone 6-bit char carries no byte
+                block = block[:-1]
+            if block:
+                out.append(binascii.a2b_base64(block + b"=" * (-len(block) % 4)))
+        return b"".join(out)
+
+    def _lines(self, raw: bytes, final: bool) -> list[str]:
+        text = self._tail + self._utf8.decode(raw, final)
+        lines = text.split("\n")
+        self._tail = "" if final else lines.pop()
+        return lines
+
+    def feed(self, chunk: Union[bytes, str]) -> list[str]:
+        """Decode one chunk; returns the lines completed by it."""
+        if isinstance(chunk, str):
+            chunk = chunk.encode("ascii", "replace")
+        if self.valid and chunk.translate(None, _BASE64_TEXT):
+            self.valid = False
+        return self._lines(self._decode(chunk.translate(None, _NOT_ALPHABET), False), False)
+
+    def close(self) -> list[str]:
+        """Flush what is left once the input is exhausted."""
+        return [l for l in self._lines(self._decode(b"", True), True) if l]
+
+
+def iter_b64_lines(chunks: Iterable[Union[bytes, str]]) -> Iterator[str]:
+    decoder = Base64LineDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+def chunked(text: str, size: int = 1 << 16) -> Iterator[str]:
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
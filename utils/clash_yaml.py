@@ -0,0 +1,136 @@
+"""
+clash_yaml.py - Event-streaming Clash config reader
+
+`yaml.safe_load` builds the whole document in pure Python, including the
+`rules:` and `proxy-groups:` lists that extraction throws away.  This reader
+walks the parse events instead (libyaml's `CSafeLoader` when PyYAML was built
+with it) and only constructs Python objects for the items of the top-level
+`proxies:` sequence.  Everything else is skipped event by event, picking up
+the `url` / `path` scalars that `extract.find_urls` would have collected.
+
+Anchored nodes are always built, even inside skipped sections, so `<<: *x`
+merges and aliases inside `proxies` still resolve.
+"""
+
+from typing import Optional
+
+import yaml
+from yaml.events import (AliasEvent, MappingEndEvent, MappingStartEvent, ScalarEvent,
+                         SequenceEndEvent, SequenceStartEvent)
+from yaml.nodes import ScalarNode
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+URL_KEYS = ("url", "path")
+URL_PREFIXES = ("http://", "https://")
+
+
+class _Walker:
+    def __init__(self, text: str):
+        self.loader = Loader(text)
+        self.anchors: dict = {}
+        self.urls: set[str] = set()
+
+    def next(self):
+        return self.loader.get_event()
+
+    def _url(self, key, value) -> None:
+        if key in URL_KEYS and isinstance(value, str) and value.startswith(URL_PREFIXES):
+            self.urls.add(value.strip())
+
+    # ─── Build (proxies) ─────────────────────────────────────────────────
+    def scalar(self, ev: ScalarEvent):
+        tag = ev.tag
+        if tag is None or tag == "!":
+            tag = self.loader.resolve(ScalarNode, ev.value, ev.implicit)
+        ctor = self.loader.yaml_constructors.get(tag)
+        if ctor is None:
+            return ev.value
+        return ctor(self.loader, ScalarNode(tag, ev.value, ev.start_mark, ev.end_mark, style=ev.style))
+
+    def build(self, ev):
+        if isinstance(ev, AliasEvent):
+            return self.anchors.get(ev.anchor)
+        if isinstance(ev, ScalarEvent):
+            obj = self.scalar(ev)
+        elif isinstance(ev, SequenceStartEvent):
+            obj = []
+            while not self.loader.check_event(SequenceEndEvent):
+                obj.append(self.build(self.next()))
+            self.next()
+        elif isinstance(ev, MappingStartEvent):
+            obj = {}
+            while not self.loader.check_event(MappingEndEvent):
+                key = self.build(self.next())
+                value = self.build(self.next())
+                if key == "<<":
+                    for src in value if isinstance(value, list) else [value]:
+                        if isinstance(src, dict):
+                            for k, v in src.items():
+                                obj.setdefault(k, v)
+                    continue
+                obj[key] = value
+                self._url(key, value)
+            self.next()
+        else:
+            raise yaml.YAMLError(f"unexpected event {ev}")
+        if getattr(ev, "anchor", None):
+            self.anchors[ev.anchor] = obj
+        return obj
+
+    # ─── Skip (everything else) ──────────────────────────────────────────
+    def skip(self, ev) -> None:
+        if getattr(ev, "anchor", None) and not isinstance(ev, AliasEvent):
+            self.build(ev)
+        elif isinstance(ev, SequenceStartEvent):
+            while not self.loader.check_event(SequenceEndEvent):
+                self.skip(self.next())
+            self.next()
+        elif isinstance(ev, MappingStartEvent):
+            while not self.loader.check_event(MappingEndEvent):
+                key_ev = self.next()
+                key = key_ev.value if isinstance(key_ev, ScalarEvent) else None
+                if not isinstance(key_ev, ScalarEvent):
+                    self.skip(key_ev)
+                value_ev = self.next()
+                if key in URL_KEYS and isinstance(value_ev, ScalarEvent):
+                    self._url(key, value_ev.value)
+                else:
+                    self.skip(value_ev)
+            self.next()
+
+    # ─── Document ────────────────────────────────────────────────────────
+    def run(self) -> Optional[list]:
+        proxies = None
+        self.next()                               # StreamStart
+        if self.loader.check_event(yaml.StreamEndEvent):
+            return None
+        self.next()                               # DocumentStart
+        root = self.next()
+        if not isinstance(root, MappingStartEvent):
+            return None
+        while not self.loader.check_event(MappingEndEvent):
+            key_ev = self.next()
+            value_ev = self.next()
+            if isinstance(key_ev, ScalarEvent) and key_ev.value == "proxies":
+                proxies = self.build(value_ev)
+            else:
+                self.skip(value_ev)
+        return proxies
+
+
+def scan_clash_yaml(text: str) -> tuple[list, set[str]]:
+    """Return (items of the top-level `proxies:` list, child URLs in the file).
+
+    A file that is not a mapping, or fails to parse, gives ([], set()).
+    """
+    walker = _Walker(text)
+    try:
+        proxies = walker.run()
+    except (yaml.YAMLError, TypeError):
+        return [], set()
+    finally:
+        walker.loader.dispose()
+    if not isinstance(proxies, list):
+        return [], walker.urls
+    return proxies, walker.urls
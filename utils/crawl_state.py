@@ -0,0 +1,174 @@
+"""
+crawl_state.py - Persistent crawl state (SQLite)
+
+Keeps the subscription crawl resumable across runs:
+
+- `frontier` – URLs queued in the current run and not fetched yet.
+- `pages`    – one row per URL ever visited: last status, content hash,
+               timestamps, consecutive failures and a retry-after time.
+- `edges`    – parent → child links discovered by `find_urls` / http lines,
+               kept as a record.  Resuming does not read them: children are
+               enqueued in the same transaction that marks their parent done,
+               so they are already in the interrupted run's frontier or pages.
+- `runs`     – one row per crawl; a run without `finished_at` was interrupted.
+
+A crawl that is killed leaves its run open.  The next crawl picks it up:
+pages already visited in that run are replayed from the HTTP cache instead
+of being refetched, and only the remaining frontier goes to the network.
+Results are committed every `checkpoint_every` pages or `checkpoint_interval`
+seconds, whichever comes first (the crawler polls `maybe_checkpoint` while
+slow fetches are in flight), and once the roots are queued, so even a run
+killed before its first page resumes.
+
+Children that keep failing are skipped until their backoff
+(`BACKOFF_BASE * 2**(failures-1)`, capped at `BACKOFF_MAX`) expires.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+STATE_DB = Path(__file__).resolve().parent.parent / "data" / "cache" / "crawl_state.sqlite3"
+
+BACKOFF_BASE = 3600          # seconds after the first failure
+BACKOFF_MAX = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    url   TEXT PRIMARY KEY,
+    type  TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    seq   INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url          TEXT PRIMARY KEY,
+    type         TEXT,
+    depth        INTEGER,
+    status       TEXT,               -- 'ok' | 'error'
+    content_hash TEXT,
+    error        TEXT,
+    first_seen   REAL,
+    last_fetched REAL,
+    last_ok      REAL,
+    fail_count   INTEGER NOT NULL DEFAULT 0,
+    retry_after  REAL,
+    run_id       INTEGER,            -- last run that visited the page
+    seq          INTEGER             -- discovery order inside that run
+);
+CREATE TABLE IF NOT EXISTS edges (
+    parent TEXT NOT NULL,
+    child  TEXT NOT NULL,
+    PRIMARY KEY (parent, child)
+);
+"""
+
+
+class CrawlState:
+    def __init__(self, path: Path = STATE_DB, checkpoint_every: int = 20, checkpoint_interval: float = 5.0):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(_SCHEMA)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.run_id: Optional[int] = None
+        self._seq = 0
+        self._dirty = 0
+        self._committed_at = time.monotonic()
+
+    # ─── Runs ────────────────────────────────────────────────────────────
+    def resume(self) -> bool:
+        """Attach to an interrupted run if there is one, else start a new run.
+        Returns True when resuming."""
+        row = self.db.execute(
+            "SELECT id FROM runs WHERE finished_at IS NULL ORDER BY id DESC LIMIT 1").fetchone()
+        if row:
+            self.run_id = row[0]
+            self._seq = self.db.execute(
+                "SELECT MAX(m) FROM (SELECT MAX(seq) m FROM frontier "
+                "UNION ALL SELECT MAX(seq) FROM pages WHERE run_id = ?)", (self.run_id,)
+            ).fetchone()[0] or 0
+            return True
+        self.db.execute("DELETE FROM frontier")
+        self.run_id = self.db.execute("INSERT INTO runs (started_at) VALUES (?)", (time.time(),)).lastrowid
+        self._seq = 0
+        self.db.commit()
+        return False
+
+    def entries(self) -> list[tuple[str, str, int, Optional[str], Optional[str], int]]:
+        """(url, type, depth, status, error, seq) for every URL of the current run in
+        discovery order; status and error are None for URLs still in the frontier."""
+        return self.db.execute(
+            "SELECT url, type, depth, NULL, NULL, seq FROM frontier "
+            "UNION ALL SELECT url, type, depth, status, error, seq FROM pages "
+            "WHERE run_id = ? AND url NOT IN (SELECT url FROM frontier) ORDER BY 6",
+            (self.run_id,),
+        ).fetchall()
+
+    def finish(self) -> None:
+        self.db.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), self.run_id))
+        self.db.execute("DELETE FROM frontier")
+        self.db.commit()
+
+    def checkpoint(self) -> None:
+        self.db.commit()
+        self._dirty = 0
+        self._committed_at = time.monotonic()
+
+    def maybe_checkpoint(self) -> None:
+        """Commit if pages are pending and `checkpoint_every` / `checkpoint_interval` is reached."""
+        if self._dirty and (self._dirty >= self.checkpoint_every
+                            or time.monotonic() - self._committed_at >= self.checkpoint_interval):
+            self.checkpoint()
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    # ─── Frontier / pages ────────────────────────────────────────────────
+    def enqueue(self, url: str, typ: str, depth: int) -> None:
+        self._seq += 1
+        self.db.execute(
+            "INSERT OR REPLACE INTO frontier (url, type, depth, seq) VALUES (?, ?, ?, ?)",
+            (url, typ, depth, self._seq))
+
+    def is_dead(self, url: str, now: Optional[float] = None) -> bool:
+        row = self.db.execute(
+            "SELECT retry_after FROM pages WHERE url = ? AND status = 'error'", (url,)).fetchone()
+        return bool(row and row[0] and row[0] > (now or time.time()))
+
+    def done(self, url: str, typ: str, depth: int, status: str, content_hash: Optional[str] = None,
+             error: Optional[str] = None, children: Iterable[str] = (), fetched: bool = True) -> None:
+        """Record the outcome of one page and drop it from the frontier.
+        `fetched=False` marks a page served from the cache: it counts as
+        visited in this run but its fetch timestamps are left alone."""
+        now = time.time()
+        row = self.db.execute(
+            "SELECT seq FROM frontier WHERE url = ? UNION ALL "
+            "SELECT seq FROM pages WHERE url = ? AND run_id = ?", (url, url, self.run_id)).fetchone()
+        seq = row[0] if row else self._seq
+        prev = self.db.execute(
+            "SELECT fail_count, first_seen, last_fetched, last_ok FROM pages WHERE url = ?", (url,)).fetchone()
+        fail_count, first_seen, last_fetched, last_ok = prev or (0, now, None, None)
+        if fetched:
+            last_fetched = now
+            fail_count = 0 if status == "ok" else fail_count + 1
+            if status == "ok":
+                last_ok = now
+        retry = None if status == "ok" else now + min(BACKOFF_BASE * 2 ** (fail_count - 1), BACKOFF_MAX)
+        self.db.execute(
+            "INSERT OR REPLACE INTO pages (url, type, depth, status, content_hash, error, first_seen, "
+            "last_fetched, last_ok, fail_count, retry_after, run_id, seq) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, typ, depth, status, content_hash, error, first_seen, last_fetched, last_ok,
+             fail_count, retry, self.run_id, seq))
+        self.db.executemany("INSERT OR IGNORE INTO edges (parent, child) VALUES (?, ?)",
+                            ((url, c) for c in children))
+        self.db.execute("DELETE FROM frontier WHERE url = ?", (url,))
+        self._dirty += 1
+        self.maybe_checkpoint()
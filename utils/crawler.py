@@ -0,0 +1,268 @@
+"""
+crawler.py - Asynchronous subscription crawler
+
+Fetches subscription URLs with aiohttp and hands every body to a callback
+that returns the child URLs found in it.  The frontier is a priority heap
+ordered by crawl depth (breadth-first), so root sources are always served
+before the nested files they point at.
+
+Limits:
+- `concurrency`  – global cap on requests in flight.
+- `per_host`     – simultaneous requests to one host; a saturated host is
+                   parked and other hosts keep being served, so one big
+                   mirror (gitlab.com) cannot stall the whole crawl.
+- `max_depth`    – roots are depth 0; children deeper than this are dropped.
+
+The crawler only schedules and fetches; what to do with a body (extraction,
+report entries, ...) is decided by the `on_page` / `on_error` callbacks.
+With an `HttpCache` attached, requests are conditional and `on_page` gets a
+Page flagged `unchanged` (body None on 304) so it can reuse stored results.
+
+Bodies that start out as pure base64 are decoded chunk by chunk
+(`utils/b64stream.py`) and tokenized line by line, and `on_page` receives
+`page.tokens` instead of `page.body`.  The raw chunks are spooled (in memory
+up to `SPOOL_SIZE`, then to a temporary file) until the end of the body: if
+non-base64 text turns up later, the page falls back to the buffered path
+(`page.body` as text) so those lines are not lost.
+
+With a `CrawlState` attached (`utils/crawl_state.py`) the frontier and every
+fetch outcome are persisted: an interrupted crawl resumes where it stopped,
+replaying the pages it already visited from the HTTP cache, and children that
+keep failing are skipped until their backoff expires.
+
+With a `Scheduler` (`utils/scheduler.py`) URLs that are not due yet are served
+from the cache instead of fetched, due roots are queued by priority, and once
+the optional `budget` (seconds) is spent the rest of the frontier is served
+from the cache as well.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import tempfile
+import time
+from itertools import count
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from utils.b64stream import Base64LineDecoder, looks_base64
+from utils.crawl_state import CrawlState
+from utils.http_cache import HttpCache, Page
+from utils.scheduler import Scheduler
+from utils.tokenizer import scan_lines
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (proxy-collector)"}
+SNIFF_SIZE = 4096          # bytes read before deciding whether to stream-decode
+CHUNK_SIZE = 1 << 16
+SPOOL_SIZE = 1 << 20       # raw bytes of a streamed body held in memory before spilling to disk
+
+# on_page(url, typ, page, depth) -> iterable of (child_url, child_type)
+PageHandler = Callable[[str, str, Page, int], Iterable[tuple[str, str]]]
+# on_error(url, typ, exc)
+ErrorHandler = Callable[[str, str, BaseException], None]
+
+
+def _decode(raw: bytes, charset: Optional[str]) -> str:
+    try:
+        return raw.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+class Crawler:
+    def __init__(self, on_page: PageHandler, on_error: Optional[ErrorHandler] = None, *,
+                 concurrency: int = 32, per_host: int = 4, max_depth: int = 3,
+                 timeout: float = 30, headers: Optional[dict] = None,
+                 cache: Optional[HttpCache] = None, state: Optional[CrawlState] = None,
+                 schedule: Optional[Scheduler] = None, budget: Optional[float] = None):
+        self.on_page = on_page
+        self.on_error = on_error
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self.cache = cache
+        self.state = state
+        self.schedule = schedule
+        self.budget = budget
+        self.deadline: Optional[float] = None
+
+        self.seen: dict[str, int] = {}            # url -> depth, in discovery order
+        self._frontier: list[tuple[int, int, str, str]] = []
+        self._seq = count()
+        self._active: dict[str, int] = {}         # host -> requests in flight
+
+    # ─── Frontier ────────────────────────────────────────────────────────
+    def push(self, url: str, typ: str, depth: int = 0) -> bool:
+        """Queue *url* unless it was already seen or is beyond max_depth."""
+        if url in self.seen or depth > self.max_depth:
+            return False
+        if depth and self.state and self.state.is_dead(url):
+            return False
+        self.seen[url] = depth
+        heapq.heappush(self._frontier, (depth, next(self._seq), url, typ))
+        if self.state:
+            self.state.enqueue(url, typ, depth)
+        return True
+
+    def _restore(self) -> None:
+        """Rebuild an interrupted run: queued URLs go back on the frontier,
+        visited ones are replayed from the cache (or refetched if it is gone)."""
+        entries = self.state.entries()
+        for url, _, depth, *_ in entries:
+            self.seen[url] = depth
+        for url, typ, depth, status, error, _ in entries:
+            if status == "error":
+                if self.on_error:
+                    self.on_error(url, typ, RuntimeError(error))
+            elif status is None or not self._replay(url, typ, depth):
+                heapq.heappush(self._frontier, (depth, next(self._seq), url, typ))
+
+    def _replay(self, url: str, typ: str, depth: int) -> bool:
+        """Hand the cached copy of *url* to on_page without a request.
+        False if there is no usable cached result."""
+        page = self.cache.cached(url) if self.cache else None
+        if page is None:
+            return False
+        try:
+            children = list(self.on_page(url, typ, page, depth) or ())
+        except Exception:
+            return False
+        self._expand(url, typ, depth, page, children)
+        return True
+
+    def _expand(self, url: str, typ: str, depth: int, page: Page, children: list) -> None:
+        for child, child_typ in children:
+            self.push(child, child_typ, depth + 1)
+        if self.state:
+            self.state.done(url, typ, depth, "ok", page.hash, children=[c for c, _ in children],
+                            fetched=not page.replayed)
+
+    def _take_ready(self, in_flight: int) -> list[tuple[int, str, str]]:
+        """Pop as many jobs as the global and per-host limits allow."""
+        ready, parked = [], []
+        while self._frontier and in_flight + len(ready) < self.concurrency:
+            item = heapq.heappop(self._frontier)
+            over = self._over_budget()
+            if over or (self.schedule and not self.schedule.due(item[2])):
+                # served from the cache; past the budget, uncached URLs are left for the next run
+                if self._replay(item[2], item[3], item[0]) or over:
+                    continue
+            host = urlsplit(item[2]).hostname or ""
+            if self._active.get(host, 0) >= self.per_host:
+                parked.append(item)
+                continue
+            self._active[host] = self._active.get(host, 0) + 1
+            ready.append((item[0], item[2], item[3]))
+        for item in parked:
+            heapq.heappush(self._frontier, item)
+        return ready
+
+    def _over_budget(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    # ─── Fetch ───────────────────────────────────────────────────────────
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> Page:
+        headers = self.cache.conditional_headers(url) if self.cache else None
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 304 and self.cache:
+                return self.cache.page(url, 304, resp.headers)
+            resp.raise_for_status()
+
+            digest = hashlib.sha256()
+            head = b""
+            while len(head) < SNIFF_SIZE and not resp.content.at_eof():
+                head += await resp.content.read(SNIFF_SIZE - len(head))
+            digest.update(head)
+
+            if looks_base64(head):
+                decoder = Base64LineDecoder()
+                # raw bytes are only needed if the body stops being base64 part way
+                with tempfile.SpooledTemporaryFile(SPOOL_SIZE) as spool:
+                    spool.write(head)
+                    tokens, raw_lines = scan_lines(decoder.feed(head))
+                    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                        digest.update(chunk)
+                        spool.write(chunk)
+                        if decoder.valid:
+                            found, n = scan_lines(decoder.feed(chunk))
+                            tokens += found
+                            raw_lines += n
+                    if decoder.valid:
+                        found, n = scan_lines(decoder.close())
+                        fields = {"tokens": tokens + found, "raw_lines": raw_lines + n}
+                        text = None
+                    else:
+                        # base64-looking head, plain text later: the decoder would drop or garble
+                        # those lines, so hand over the whole body as text like the buffered path
+                        spool.seek(0)
+                        text = _decode(spool.read(), resp.charset)
+                        fields = {}
+            else:
+                rest = await resp.content.read()
+                digest.update(rest)
+                text = _decode(head + rest, resp.charset)
+                fields = {}
+
+            if self.cache:
+                return self.cache.page(url, resp.status, resp.headers, digest.hexdigest(), text, **fields)
+            return Page(url, text, hash=digest.hexdigest(), **fields)
+
+    async def _visit(self, session: aiohttp.ClientSession, depth: int, url: str, typ: str):
+        host = urlsplit(url).hostname or ""
+        try:
+            page = await self.fetch(session, url)
+            self._expand(url, typ, depth, page, list(self.on_page(url, typ, page, depth) or ()))
+        except Exception as e:
+            if self.state:
+                self.state.done(url, typ, depth, "error", error=str(e) or type(e).__name__)
+            if self.on_error:
+                self.on_error(url, typ, e)
+        finally:
+            self._active[host] -= 1
+
+    # ─── Run ─────────────────────────────────────────────────────────────
+    async def run(self, seeds: Iterable[tuple[str, str]] = ()):
+        if self.budget is not None:
+            self.deadline = time.monotonic() + self.budget
+        if self.state and self.state.resume():
+            self._restore()
+        seeds = list(seeds)
+        for url, typ in seeds:
+            self.push(url, typ, 0)
+        if self.state:
+            self.state.checkpoint()     # the queued roots survive a kill before the first page
+        if self.schedule:
+            # fetch the most productive roots first; `seen` keeps the seed order
+            rank = {u: i for i, u in enumerate(self.schedule.order(u for u, _ in seeds))}
+            self._frontier = sorted((d, rank.get(u, n), u, t) for d, n, u, t in self._frontier)
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=self.headers) as session:
+            tasks: set[asyncio.Task] = set()
+            while self._frontier or tasks:
+                for depth, url, typ in self._take_ready(len(tasks)):
+                    tasks.add(asyncio.create_task(self._visit(session, depth, url, typ)))
+                if not tasks:
+                    break
+                # wake up at least every checkpoint_interval so finished pages are committed
+                # even while slow fetches are still in flight
+                _, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED,
+                                              timeout=self.state.checkpoint_interval if self.state else None)
+                if self.state:
+                    self.state.maybe_checkpoint()
+        if self.state:
+            self.state.finish()
+
+
+def crawl(seeds: Iterable[tuple[str, str]], on_page: PageHandler,
+          on_error: Optional[ErrorHandler] = None, **kwargs) -> Crawler:
+    """Run a crawl to completion and return the finished Crawler."""
+    crawler = Crawler(on_page, on_error, **kwargs)
+    asyncio.run(crawler.run(seeds))
+    return crawler
@@ -6,6 +6,9 @@ Proxy Collector & Reporter
 
 This script recursively fetches proxy subscription files, extracts individual
 proxy links, and produces per‑protocol text files plus a detailed JSON report.
+Each body is fetched once: it is classified with `radar.detect_type` and
+extracted straight away, so the radar summary (urls_type.json) is written as a
+by-product of the same run.
 
 Supported input formats (auto‑detected):
 
@@ -17,23 +20,51 @@ Supported input formats (auto‑detected):
 | *(fallback)*          | any                | Treated as plain text; every line scanned for patterns  |
 
 Nested `url` or `path` keys inside YAML/JSON are queued and processed, enabling
-fully recursive crawling from a single master URL.
+fully recursive crawling from a single master URL.  Fetching is done by the
+asyncio crawler in `utils/crawler.py` (global + per-host concurrency caps and
+a crawl depth limit, see the settings below).
 
 Outputs
 -------
 * **data/input/<proto>.txt** – one file per protocol (ss, vmess, vless, trojan, …)
 * **data/input/report.json** – timestamped report with totals + child counts
+* **data/json/urls_type.json** – radar summary for the root URLs in urls.txt
+
+Fetches are conditional (ETag / Last-Modified, see `utils/http_cache.py`); a
+source whose body did not change reuses its previously extracted links.
+Sources are refetched on an adaptive schedule (`utils/scheduler.py`): ones
+that rarely change are fetched less and less often, productive ones first.
+Sources whose links are (nearly) all found in another source are flagged as
+mirrors in report.json (MinHash signatures, `utils/minhash.py`).  Before the
+txt files are written, equivalent nodes are collapsed by their parser
+fingerprint (`parsers/fingerprint.py`), so the same server reached through a
+link, a Clash proxy and a sing-box outbound is kept once; each report entry
+carries its `dup_ratio`.
+Crawl progress is checkpointed to `data/cache/crawl_state.sqlite3` (see
+`utils/crawl_state.py`), so an interrupted run resumes instead of starting over.
 """
 
+import sys
 import json
 import base64
-import re
-import yaml
-import requests
 from collections import defaultdict
 from pathlib import Path
+from typing import Optional
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.crawler import crawl
+from utils.crawl_state import CrawlState
+from utils.scheduler import Scheduler
+from utils.minhash import find_mirrors, signature, to_hex
+from parsers import dedupe_links
+from utils.http_cache import HttpCache
+from utils.b64stream import chunked, iter_b64_lines
+from utils.clash_yaml import scan_clash_yaml
+from utils.singbox_json import SingboxReader, collect_urls
+from utils.radar import detect_base64_tokens, detect_type
+from utils.tokenizer import group_links, iter_line_tokens, iter_tokens
+
 # ─── Paths ───────────────────────────────────────────────────────────────
 BASE_DIR    = Path(__file__).resolve().parent
 INPUT_DIR   = (BASE_DIR / "../data/input").resolve()
@@ -44,20 +75,18 @@ INPUT_DIR.mkdir(parents=True, exist_ok=True)
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 JSON_DIR.mkdir(parents=True, exist_ok=True)
 
-TYPE_JSON   = JSON_DIR / "urls_type.json"     # input list
+URLS_FILE   = (BASE_DIR / "../urls.txt").resolve()  # root sources
+TYPE_JSON   = JSON_DIR / "urls_type.json"     # radar summary (by-product)
 OUTPUT_DIR  = INPUT_DIR                       # proxy txt files go here
 REPORT_JSON = INPUT_DIR / "report.json"       # final report
 
-# ─── Patterns ────────────────────────────────────────────────────────────
-PATTERNS = {
-    "ss":       re.compile(r"^ss://.+",          re.MULTILINE),
-    "vmess":    re.compile(r"^vmess://.+",       re.MULTILINE),
-    "vless":    re.compile(r"^vless://.+",       re.MULTILINE),
-    "trojan":   re.compile(r"^trojan://.+",      re.MULTILINE),
-    "hysteria": re.compile(r"^hysteria2?://.+",  re.MULTILINE),
-    "reality":  re.compile(r"^reality://.+",     re.MULTILINE),
-    "http":     re.compile(r"^https?://.+",      re.MULTILINE),  # catch child URLs
-}
+# ─── Crawl settings ──────────────────────────────────────────────────────
+MAX_CONCURRENCY = 32      # requests in flight overall
+PER_HOST_LIMIT  = 4       # requests in flight per host
+MAX_DEPTH       = 3       # roots are depth 0
+FETCH_TIMEOUT   = 30      # seconds per request
+RUN_BUDGET      = 40 * 60 # seconds of fetching per run; the rest is served from the cache
+MIRROR_ACTION   = None    # sources mirroring another one: None (flag only) | "demote" | "skip"
 
 # ─── Helpers ─────────────────────────────────────────────────────────────
 
@@ -70,41 +99,31 @@ def guess_type(url: str, default: str = "subscription_plain") -> str:
     return default
 
 
+def count_new_links(links: dict, previous: Optional[dict]) -> int:
+    """Proxy links in *links* that the *previous* cache entry did not have."""
+    old = {l for p, lst in (previous or {}).get("links", {}).items() if p != "http" for l in lst}
+    return sum(1 for p, lst in links.items() if p != "http" for l in lst if l not in old)
+
+
 def find_urls(obj) -> set[str]:
     """Recursively collect all string fields called 'url' or 'path'."""
     found: set[str] = set()
-
-    def dig(o):
-        if isinstance(o, dict):
-            for k, v in o.items():
-                if k in ("url", "path") and isinstance(v, str) and v.startswith(("http://", "https://")):
-                    found.add(v.strip())
-                dig(v)
-        elif isinstance(o, list):
-            for itm in o:
-                dig(itm)
-
-    dig(obj)
+    collect_urls(obj, found)
     return found
 
 
 def extract_links(text: str):
-    links: defaultdict[str, list[str]] = defaultdict(list)
-    for line in text.splitlines():
-        line = line.strip()
-        for proto, pat in PATTERNS.items():
-            if pat.match(line):
-                links[proto].append(line)
-                break
-    return links
+    return group_links(iter_tokens(text))
 
 
 def extract_from_clash_yaml(text: str):
     links: defaultdict[str, list[str]] = defaultdict(list)
     extra: set[str] = set()
     try:
-        data = yaml.safe_load(text)
-        for proxy in data.get("proxies", []):
+        proxies, extra = scan_clash_yaml(text)
+        for proxy in proxies:
+            if not isinstance(proxy, dict):
+                continue
             ptype = proxy.get("type")
             if ptype == "ss":
                 userinfo = f"{proxy.get('cipher','')}:{proxy.get('password','')}"
@@ -117,7 +136,6 @@ def extract_from_clash_yaml(text: str):
                 links["vless"].append(f"vless://{proxy.get('uuid')}@{proxy.get('server')}:{proxy.get('port')}")
             elif ptype == "trojan":
                 links["trojan"].append(f"trojan://{proxy.get('password')}@{proxy.get('server')}:{proxy.get('port')}")
-        extra |= find_urls(data)
     except Exception:
         pass
     return links, extra
@@ -127,8 +145,10 @@ def extract_from_singbox_json(text: str):
     links: defaultdict[str, list[str]] = defaultdict(list)
     extra: set[str] = set()
     try:
-        data = json.loads(text)
-        for ob in data.get("outbounds", []):
+        reader = SingboxReader(text)
+        for ob in reader.outbounds():
+            if not isinstance(ob, dict):
+                continue
             otype = ob.get("type")
             server = ob.get("server")
             port   = ob.get("server_port") or ob.get("port")
@@ -145,96 +165,138 @@ def extract_from_singbox_json(text: str):
                 links["vless"].append(f"vless://{ob.get('uuid')}@{server}:{port}")
             elif otype == "trojan":
                 links["trojan"].append(f"trojan://{ob.get('password')}@{server}:{port}")
-        extra |= find_urls(data)
+        extra |= reader.urls
     except Exception:
         pass
     return links, extra
 
 
-def fetch(url: str) -> str:
-    r = requests.get(url, timeout=30, headers={
-        "User-Agent": "Mozilla/5.0 (proxy-collector)"
-    })
-    r.raise_for_status()
-    return r.text
+def extract_content(content: str, typ: str):
+    """Run the extractor matching *typ*; returns (links, extra child URLs)."""
+    links, extra = defaultdict(list), set()
+
+    if typ.startswith("subscription_base64"):
+        links = group_links(iter_line_tokens(iter_b64_lines(chunked(content))))
+
+    elif typ.startswith("subscription"):
+        links = extract_links(content)
+
+    elif typ == "clash_yaml":
+        links, extra = extract_from_clash_yaml(content)
+
+    elif typ == "singbox_json":
+        links, extra = extract_from_singbox_json(content)
+
+    else:
+        links = extract_links(content)
+
+    return links, extra
 
 # ─── Main ────────────────────────────────────────────────────────────────
 
 def main():
-    if not TYPE_JSON.exists():
-        print(f"❌ {TYPE_JSON} not found")
+    if not URLS_FILE.exists():
+        print(f"❌ {URLS_FILE} not found")
         return
 
-    type_list = json.loads(TYPE_JSON.read_text(encoding="utf-8"))
+    with open(URLS_FILE, encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    roots = set(urls)
 
-    all_links: defaultdict[str, list[str]] = defaultdict(list)
+    found: dict[str, dict] = {}
     report_entries: dict = {}
-    queue: list[tuple[str, str]] = []
-    seen: set[str] = set()
-
-    # Support both: list of dicts, or {"items": [dict, ...]} structure
-    items = type_list
-    if isinstance(type_list, dict) and "items" in type_list:
-        items = type_list["items"]
-
-    for item in items:
-        if isinstance(item, dict) and item.get("type") != "error":
-            queue.append((item["url"], item.get("type", "unknown")))
+    radar_items: dict[str, dict] = {}
+
+    cache = HttpCache("extract")
+    state = CrawlState()
+    schedule = Scheduler(state.db)
+
+    def on_page(url, typ, page, depth):
+        entry = cache.reuse(url, page) if page.unchanged else None
+        previous = None if page.unchanged else cache.get(url)
+        if entry and "links" in entry and "detect" in entry:
+            detected = entry["detect"]
+            links = defaultdict(list, entry["links"])
+            extra = set(entry["extra"])
+        elif page.tokens is not None:   # base64 body, decoded while streaming
+            detected = detect_base64_tokens(page.tokens, page.raw_lines)
+            links, extra = group_links(page.tokens), set()
+            cache.put(url, page, detect=detected, links=links, extra=[])
+        else:
+            if page.body is None:
+                cache.drop(url)   # next run fetches unconditionally
+                raise ValueError("304 Not Modified but no cached links")
+            detected = detect_type(page.body, url)
+            links, extra = extract_content(page.body, detected["type"])
+            cache.put(url, page, detect=detected, links=links, extra=sorted(extra))
+        typ = detected["type"]
+        found[url] = links
+        if not page.replayed:
+            schedule.record(url, changed=not page.unchanged, new_links=count_new_links(links, previous))
+        if url in roots:
+            radar_items[url] = {"url": url, **detected}
+
+        report_entries[url] = {
+            "type": typ,
+            "total": sum(len(v) for p, v in links.items() if p != "http"),
+            "children": len(extra) + len(links.get("http", [])),
+            "per_protocol": {p: len(lst) for p, lst in links.items() if p != "http" and lst},
+        }
+
+        children = [(u, guess_type(u)) for u in links.get("http", [])]
+        children += [(ex, guess_type(ex)) for ex in extra]
+        return children
+
+    def on_error(url, typ, e):
+        report_entries[url] = {"type": typ, "error": str(e) or type(e).__name__}
+        if url in roots:
+            radar_items[url] = {"url": url, "type": "error", "error": str(e) or type(e).__name__}
+
+    crawler = crawl(
+        [(u, "unknown") for u in urls], on_page, on_error,
+        concurrency=MAX_CONCURRENCY, per_host=PER_HOST_LIMIT,
+        max_depth=MAX_DEPTH, timeout=FETCH_TIMEOUT, cache=cache, state=state,
+        schedule=schedule, budget=RUN_BUDGET,
+    )
 
-    while queue:
-        url, typ = queue.pop(0)
-        if url in seen:
+    # near-duplicate sources
+    sources = {}
+    for url in crawler.seen:
+        proxies = [l for p, lst in found.get(url, {}).items() if p != "http" for l in lst]
+        sig = signature(proxies)
+        if sig:
+            sources[url] = (sig, len(set(proxies)))
+            report_entries[url]["minhash"] = to_hex(sig)
+    mirrors = find_mirrors(sources)
+    for url, (original, share) in mirrors.items():
+        report_entries[url]["mirror_of"] = original
+        report_entries[url]["containment"] = share
+        if MIRROR_ACTION in ("demote", "skip"):
+            schedule.demote(url)
+    state.close()
+
+    # merge in discovery order so the output does not depend on fetch timing
+    # and collapse equivalent nodes (same parser fingerprint) across sources
+    all_links: defaultdict[str, list[str]] = defaultdict(list)
+    fingerprints: set[str] = set()
+    duplicates = 0
+    for url in crawler.seen:
+        if MIRROR_ACTION == "skip" and url in mirrors:
             continue
-        seen.add(url)
-
-        try:
-            content = fetch(url)
-            links, extra = defaultdict(list), set()
-
-            if typ.startswith("subscription"):
-                decoded = None
-                try:
-                    decoded = base64.b64decode(content).decode(errors="ignore")
-                except Exception:
-                    pass
-                links = extract_links(decoded or content)
-
-            elif typ == "clash_yaml":
-                links, extra = extract_from_clash_yaml(content)
-
-            elif typ == "singbox_json":
-                links, extra = extract_from_singbox_json(content)
-
-            else:
-                links = extract_links(content)
-
-            # process links
-            for proto, lst in links.items():
-                if proto == "http":
-                    for u in lst:
-                        if u not in seen:
-                            queue.append((u, guess_type(u)))
-                else:
-                    all_links[proto].extend(lst)
-
-            report_entries[url] = {
-                "type": typ,
-                "total": sum(len(v) for p, v in links.items() if p != "http"),
-                "children": len(extra) + len(links.get("http", [])),
-                "per_protocol": {p: len(lst) for p, lst in links.items() if p != "http" and lst},
-            }
-
-            for ex in extra:
-                if ex not in seen:
-                    queue.append((ex, guess_type(ex)))
-
-        except Exception as e:
-            report_entries[url] = {"type": typ, "error": str(e)}
+        total = dups = 0
+        for proto, lst in found.get(url, {}).items():
+            if proto != "http":
+                kept, n = dedupe_links(lst, fingerprints)
+                all_links[proto].extend(kept)
+                total += len(lst)
+                dups += n
+        if total:
+            report_entries[url]["dup_ratio"] = round(dups / total, 3)
+        duplicates += dups
+    report_entries = {u: report_entries[u] for u in crawler.seen if u in report_entries}
 
     # save proxies
     for proto, lst in all_links.items():
-        if proto == "http":
-            continue  # not proxy links
         (OUTPUT_DIR / f"{proto}.txt").write_text("\n".join(lst), encoding="utf-8")
 
     # Calculate summary info
@@ -248,6 +310,8 @@ def main():
         "total_urls_processed": total_urls_processed,
         "total_nodes": total_nodes,
         "per_protocol": per_protocol,
+        "duplicates": duplicates,
+        "mirrors": len(mirrors),
         "last_update": last_update
     }
 
@@ -258,7 +322,21 @@ def main():
         encoding="utf-8"
     )
 
-    print(f"✅ Finished. Proxies saved to {OUTPUT_DIR}, report → {REPORT_JSON}")
+    # radar summary for the roots, same layout radar.py writes
+    radar_report = {
+        "summary": {
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "total_urls": len(urls),
+            "total_processed": len(radar_items),
+        },
+        "items": [radar_items[u] for u in dict.fromkeys(urls) if u in radar_items],
+    }
+    TYPE_JSON.write_text(
+        json.dumps(radar_report, ensure_ascii=False, indent=2),
+        encoding="utf-8"
+    )
+
+    print(f"✅ Finished. Proxies saved to {OUTPUT_DIR}, report → {REPORT_JSON}, types → {TYPE_JSON}")
 
 
 if __name__ == "__main__":
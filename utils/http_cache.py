@@ -0,0 +1,129 @@
+"""
+http_cache.py - On-disk HTTP validator cache
+
+Keeps, per URL, the ETag / Last-Modified validators and a SHA-256 of the last
+body, together with whatever the caller derived from that body (extracted
+links, radar detection, ...).  Later fetches send `If-None-Match` /
+`If-Modified-Since`; a 304, or a 200 whose body hash did not change, comes
+back as an *unchanged* Page so the caller can skip decoding and extraction
+and reuse the stored result.
+
+Entries live in `data/cache/http/<namespace>/<sha1(url)>.json`.  Each consumer
+(extract, radar) uses its own namespace so one of them refreshing the
+validators can never make the other reuse a result built from an older body.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache" / "http"
+_META_KEYS = ("url", "etag", "last_modified", "hash", "fetched_at")
+
+
+@dataclass
+class Page:
+    url: str
+    body: Optional[str]               # None on 304 or when streamed (see tokens)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    hash: Optional[str] = None
+    unchanged: bool = False
+    # base64 subscriptions decoded while streaming: (protocol, link) tokens
+    # and the number of non-blank decoded lines; the body is never kept
+    tokens: Optional[list] = None
+    raw_lines: int = 0
+    replayed: bool = False            # served from the cache, no request was made
+
+
+def body_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+class HttpCache:
+    def __init__(self, namespace: str, root: Path = CACHE_DIR):
+        self.dir = Path(root) / namespace
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.dir / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            return json.loads(self._path(url).read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def put(self, url: str, page: Page, **data) -> dict:
+        """Store the validators of *page* plus the caller's derived *data*."""
+        entry = {
+            "url": url,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "hash": page.hash,
+            "fetched_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            **data,
+        }
+        path = self._path(url)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        return entry
+
+    def drop(self, url: str) -> None:
+        self._path(url).unlink(missing_ok=True)
+
+    def reuse(self, url: str, page: Page) -> Optional[dict]:
+        """Return the stored entry for an unchanged *page*, refreshing its
+        validators when the server rotated them without changing the body."""
+        entry = self.get(url)
+        if entry and (entry.get("etag"), entry.get("last_modified")) != (page.etag, page.last_modified):
+            data = {k: v for k, v in entry.items() if k not in _META_KEYS}
+            entry = self.put(url, page, **data)
+        return entry
+
+    def conditional_headers(self, url: str) -> dict:
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def page(self, url: str, status: int, headers, digest: Optional[str] = None,
+             text: Optional[str] = None, **extra) -> Page:
+        """Build a Page from a finished response and flag it when nothing changed."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if status == 304:
+            entry = self.get(url) or {}
+            return Page(url, None, etag or entry.get("etag"),
+                        last_modified or entry.get("last_modified"),
+                        entry.get("hash"), unchanged=True)
+        entry = self.get(url)
+        unchanged = bool(entry) and entry.get("hash") == digest
+        return Page(url, text, etag, last_modified, digest, unchanged=unchanged, **extra)
+
+    def cached(self, url: str) -> Optional[Page]:
+        """An unchanged Page for *url* built from its entry, without a request."""
+        entry = self.get(url)
+        if not entry:
+            return None
+        return Page(url, None, entry.get("etag"), entry.get("last_modified"), entry.get("hash"),
+                    unchanged=True, replayed=True)
+
+    def fetch(self, url: str, headers: Optional[dict] = None, timeout: float = 30) -> Page:
+        """Blocking conditional GET through `requests`."""
+        r = requests.get(url, timeout=timeout, headers={**(headers or {}), **self.conditional_headers(url)})
+        if r.status_code == 304:
+            return self.page(url, 304, r.headers)
+        r.raise_for_status()
+        return self.page(url, r.status_code, r.headers, body_hash(r.content), r.text)
@@ -0,0 +1,122 @@
+"""
+minhash.py - Near-duplicate source detection (MinHash + LSH)
+
+Many sources are mirrors or supersets of each other.  Each source's link set
+is reduced to a one-permutation MinHash signature: every canonical link is
+hashed once (64-bit blake2b), the top bits pick one of `BINS` bins and the
+bin keeps its minimum low 32 bits.  Empty bins are filled by rotation
+densification, so small sets still give full signatures.
+
+Candidate pairs come from LSH banding (`BANDS` bands of `ROWS` bins): two
+sources share a bucket with high probability once their Jaccard similarity
+passes roughly (1/BANDS)**(1/ROWS) ≈ 0.42.  A candidate is a mirror when the
+estimated share of its links found in the other source (containment) is at
+least `MIRROR_CONTAINMENT`; the smaller source (or the later one, on a tie)
+is the mirror.
+
+Links are canonicalized first: the `#name` fragment is dropped and vmess
+JSON is compared without its `ps` name, so renamed copies still match.
+"""
+
+import base64
+import hashlib
+import json
+from collections import defaultdict
+from typing import Iterable, Optional
+
+BINS = 128
+BANDS = 32
+ROWS = BINS // BANDS
+MIRROR_CONTAINMENT = 0.9
+
+_BIN_SHIFT = 64 - (BINS.bit_length() - 1)   # top bits of the hash select the bin
+_MASK = 0xFFFFFFFF
+_EMPTY = _MASK + 1
+_ROTATE = 0x9E3779B1                        # offset added per densification step
+
+
+def canonical_link(link: str) -> str:
+    link = link.strip().split("#", 1)[0]
+    if link.startswith("vmess://"):
+        try:
+            body = link[8:]
+            cfg = json.loads(base64.b64decode(body + "=" * (-len(body) % 4)))
+            cfg.pop("ps", None)
+            return "vmess://" + json.dumps(cfg, sort_keys=True, separators=(",", ":"))
+        except Exception:
+            pass
+    return link
+
+
+def signature(links: Iterable[str]) -> Optional[list[int]]:
+    """One-permutation MinHash of the canonical *links*; None for an empty set."""
+    bins = [_EMPTY] * BINS
+    for link in {canonical_link(l) for l in links}:
+        h = int.from_bytes(hashlib.blake2b(link.encode(), digest_size=8).digest(), "big")
+        b, v = h >> _BIN_SHIFT, h & _MASK
+        if v < bins[b]:
+            bins[b] = v
+    if all(v == _EMPTY for v in bins):
+        return None
+    # densification: an empty bin borrows from the next filled bin to its right
+    src = bins[:]
+    for i in range(BINS):
+        dist = 0
+        while src[(i + dist) % BINS] == _EMPTY:
+            dist += 1
+        bins[i] = (src[(i + dist) % BINS] + _ROTATE * dist) & _MASK
+    return bins
+
+
+def to_hex(sig: list[int]) -> str:
+    return "".join(f"{v:08x}" for v in sig)
+
+
+def from_hex(text: str) -> list[int]:
+    return [int(text[i:i + 8], 16) for i in range(0, len(text), 8)]
+
+
+def jaccard(a: list[int], b: list[int]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / BINS
+
+
+def containment(j: float, size_a: int, size_b: int) -> float:
+    """Estimated |A∩B| / |A| from Jaccard *j* and the set sizes."""
+    if not size_a:
+        return 0.0
+    return min(1.0, j * (size_a + size_b) / ((1 + j) * size_a))
+
+
+def find_mirrors(sources: dict[str, tuple[list[int], int]]) -> dict[str, tuple[str, float]]:
+    """*sources* maps url -> (signature, link count), in report order.
+
+    Returns {mirror_url: (original_url, containment)}; originals are never
+    mirrors themselves, chains resolve to the first original.
+    """
+    order = {u: i for i, u in enumerate(sources)}
+    buckets = defaultdict(list)
+    for url, (sig, _) in sources.items():
+        for band in range(BANDS):
+            buckets[(band, tuple(sig[band * ROWS:(band + 1) * ROWS]))].append(url)
+
+    pairs = {}
+    for members in buckets.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if (a, b) in pairs:
+                    continue
+                (sa, na), (sb, nb) = sources[a], sources[b]
+                # the smaller set (later one on a tie) is the candidate mirror
+                small, big = (a, b) if (na, -order[a]) < (nb, -order[b]) else (b, a)
+                c = containment(jaccard(sa, sb), sources[small][1], sources[big][1])
+                pairs[(a, b)] = (small, big, c)
+
+    mirrors: dict[str, tuple[str, float]] = {}
+    for small, big, c in sorted(pairs.values(), key=lambda p: -p[2]):
+        if c >= MIRROR_CONTAINMENT and small not in mirrors:
+            mirrors[small] = (big, round(c, 3))
+    for url, (big, c) in mirrors.items():
+        while big in mirrors:
+            big = mirrors[big][0]
+        mirrors[url] = (big, c)
+    return mirrors
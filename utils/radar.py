@@ -7,80 +7,104 @@ Responsibilities:
 - Fetches URLs concurrently.
 - Detects proxy type and protocol(s) using regex and content analysis.
 - Handles base64-encoded and plain text subscriptions.
+- Sends conditional requests; unchanged sources reuse the cached detection.
 - Outputs a structured JSON report.
 
 """
 
+import sys
 import requests
 import json
 import re
-import base64
+import threading
+from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.http_cache import HttpCache
+from utils.b64stream import chunked, iter_b64_lines
+from utils.singbox_json import SingboxReader
+from utils.tokenizer import PROXY_PROTOCOLS, classify, count_nonblank, iter_tokens, scan_lines
+
 URLS_FILE = "../urls.txt"
 OUTPUT_FILE = "../data/json/urls_type.json"
 
-# Regex patterns for proxy types
+# Conditional fetches: unchanged sources reuse their last detection result.
+# Created on first fetch, so importing radar (utils/extract.py does) touches no disk.
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def radar_cache():
+    """The shared HttpCache("radar"), created on first use."""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache("radar")
+        return _http_cache
+
+# Regex patterns for structured formats; proxy links are matched by utils/tokenizer.py
 PATTERNS = {
-    "vmess": re.compile(r"^vmess://", re.MULTILINE),
-    "vless": re.compile(r"^vless://", re.MULTILINE),
-    "trojan": re.compile(r"^trojan://", re.MULTILINE),
-    "ss": re.compile(r"^ss://", re.MULTILINE),
-    "reality": re.compile(r"^reality://", re.MULTILINE),
-    "hysteria": re.compile(r"^hysteria2?://", re.MULTILINE),
     "clash_yaml": re.compile(r"(?i)(proxies:|proxy-groups:|^#yaml|\.ya?ml$)", re.MULTILINE),
     "json": re.compile(r"^\s*\{.*\}\s*$", re.DOTALL),
-    "singbox_json": re.compile(r'"outbounds"\s*:\s*\[', re.MULTILINE),  # Detect Singbox structure
 }
+# sniffs the first non-blank character in place (text.lstrip() would copy the whole body)
+_OBJECT_START = re.compile(r"\s*\{")
 
 
 def is_base64(s):
+    """Character-level check only; decoding happens once, in detect_type."""
     s = s.strip()
     if len(s) < 16:
         return False
-    if not re.fullmatch(r'[A-Za-z0-9+/=\n\r]+', s):
-        return False
-    try:
-        base64.b64decode(s, validate=True)
-        return True
-    except Exception:
-        return False
+    return bool(re.fullmatch(r'[A-Za-z0-9+/=\n\r]+', s))
 
 
-def detect_subscription_type(decoded):
-    lines = [l.strip() for l in decoded.splitlines() if l.strip()]
-    protocols = set()
-    for l in lines:
-        for t, pat in PATTERNS.items():
-            if t not in ("clash_yaml", "json") and pat.match(l):
-                protocols.add(t)
+def detect_subscription_type(decoded, protocols=None, raw_lines=None):
+    if protocols is None:
+        protocols = {p for p, _ in iter_tokens(decoded) if p in PROXY_PROTOCOLS}
     return {
         "category": "subscription",
         "protocols": sorted(protocols),
         "valid": bool(protocols),
-        "raw_lines": len(lines)
+        "raw_lines": count_nonblank(decoded) if raw_lines is None else raw_lines
     }
 
 
+def detect_base64_tokens(tokens, raw_lines):
+    """Detection result for a base64 subscription already decoded and tokenized
+    (by the streaming decoder), so the body is never decoded a second time."""
+    protocols = {p for p, _ in tokens if p in PROXY_PROTOCOLS}
+    sub_type = detect_subscription_type("", protocols, raw_lines)
+    sub_type.update({
+        "type": "subscription_base64" if sub_type["valid"] else "subscription_base64_invalid",
+        "encoding": "base64",
+        "format": "subscription_list",
+        "description": "Base64-encoded subscription list (each line is a proxy link, protocols detected)"
+    })
+    return sub_type
+
+
 def detect_type(text, url=None):
-    # 1. Singbox JSON (special structure)
-    if PATTERNS["singbox_json"].search(text):
+    # 1. Singbox JSON (special structure), read as a stream of outbounds
+    if _OBJECT_START.match(text):
+        reader = SingboxReader(text)
         try:
-            data = json.loads(text)
-            if isinstance(data, dict) and "outbounds" in data:
-                outbounds = data["outbounds"]
-                protocols = set()
-                for node in outbounds:
-                    proto = node.get("type")
-                    if proto:
-                        protocols.add(proto)
+            protocols = set()
+            count = 0
+            for node in reader.outbounds():
+                count += 1
+                proto = node.get("type")
+                if proto:
+                    protocols.add(proto)
+            if reader.has_outbounds:
                 return {
                     "category": "json",
                     "type": "singbox_json",
                     "format": "object",
                     "encoding": "plain",
                     "protocols": sorted(protocols),
-                    "description": f"Singbox JSON config with {len(outbounds)} outbounds ({', '.join(sorted(protocols))})"
+                    "description": f"Singbox JSON config with {count} outbounds ({', '.join(sorted(protocols))})"
                 }
         except Exception:
             pass
@@ -105,15 +129,8 @@ def detect_type(text, url=None):
     # 4. Base64 subscription
     if is_base64(text):
         try:
-            decoded = base64.b64decode(text.strip()).decode(errors="ignore")
-            sub_type = detect_subscription_type(decoded)
-            sub_type.update({
-                "type": "subscription_base64" if sub_type["valid"] else "subscription_base64_invalid",
-                "encoding": "base64",
-                "format": "subscription_list",
-                "description": "Base64-encoded subscription list (each line is a proxy link, protocols detected)"
-            })
-            return sub_type
+            tokens, raw_lines = scan_lines(iter_b64_lines(chunked(text)))
+            return detect_base64_tokens(tokens, raw_lines)
         except Exception:
             return {
                 "category": "subscription",
@@ -125,35 +142,33 @@ def detect_type(text, url=None):
                 "description": "Invalid base64-encoded subscription list"
             }
     # 5. Plain text subscription (multi-line)
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-    if lines:
-        valid_lines = []
-        invalid_lines = []
-        for l in lines:
-            if any(PATTERNS[t].match(l) for t in PATTERNS if t not in ("clash_yaml", "json", "singbox_json")):
-                valid_lines.append(l)
-            else:
-                invalid_lines.append(l)
-        if len(valid_lines) >= 2:  # At least two valid links to detect subscription
-            sub_type = detect_subscription_type("\n".join(valid_lines))
-            sub_type.update({
-                "type": "subscription_plain" if sub_type["valid"] else "subscription_plain_invalid",
-                "encoding": "plain",
-                "format": "subscription_list",
-                "description": f"Plain text subscription list (valid proxy links: {len(valid_lines)}, ignored lines: {len(invalid_lines)})"
-            })
-            return sub_type
+    protocols = set()
+    valid = 0
+    for proto, _ in iter_tokens(text):
+        if proto in PROXY_PROTOCOLS:
+            protocols.add(proto)
+            valid += 1
+    if valid >= 2:  # At least two valid links to detect subscription
+        invalid = count_nonblank(text) - valid
+        sub_type = detect_subscription_type(text, protocols, raw_lines=valid)
+        sub_type.update({
+            "type": "subscription_plain" if sub_type["valid"] else "subscription_plain_invalid",
+            "encoding": "plain",
+            "format": "subscription_list",
+            "description": f"Plain text subscription list (valid proxy links: {valid}, ignored lines: {invalid})"
+        })
+        return sub_type
     # 6. Single proxy link
-    for t, pat in PATTERNS.items():
-        if t not in ("clash_yaml", "json", "singbox_json") and pat.match(text.strip()):
-            return {
-                "category": "single_proxy",
-                "type": t,
-                "format": "single_proxy_link",
-                "encoding": "plain",
-                "protocols": [t],
-                "description": f"Single {t} proxy link"
-            }
+    t = classify(text.strip())
+    if t in PROXY_PROTOCOLS:
+        return {
+            "category": "single_proxy",
+            "type": t,
+            "format": "single_proxy_link",
+            "encoding": "plain",
+            "protocols": [t],
+            "description": f"Single {t} proxy link"
+        }
     # 7. Unknown
     return {
         "category": "unknown",
@@ -170,12 +185,19 @@ def fetch_and_detect(url):
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
-        resp = requests.get(url, timeout=15, headers=headers)
-        resp.raise_for_status()
-        content = resp.text
-        ftype = detect_type(content, url)
+        http_cache = radar_cache()
+        page = http_cache.fetch(url, headers=headers, timeout=15)
+        if page.unchanged:
+            entry = http_cache.reuse(url, page)
+            if entry and "result" in entry:
+                return entry["result"]
+        if page.body is None:
+            http_cache.drop(url)
+            raise ValueError("304 Not Modified but no cached result")
+        ftype = detect_type(page.body, url)
         result = {"url": url}
         result.update(ftype)
+        http_cache.put(url, page, result=result)
         return result
     except Exception as e:
         return {"url": url, "type": "error", "error": str(e)}
@@ -0,0 +1,125 @@
+"""
+singbox_json.py - Streaming reader for sing-box configs
+
+Walks a sing-box JSON document without `json.loads`-ing all of it: the
+top-level object is scanned key by key and `outbounds[*]` is decoded and
+yielded one element at a time (`JSONDecoder.raw_decode` at the element
+offset).  Other top-level arrays/objects are also consumed one element or
+member at a time, so the largest Python object alive is a single outbound or
+rule, not the whole config.
+
+Child subscription URLs (`url` / `path` string fields starting with
+http(s)://, the same rule as `extract.find_urls`) are collected into
+`reader.urls` during the same pass.
+"""
+
+import json
+import re
+from typing import Iterator
+
+URL_KEYS = ("url", "path")
+URL_PREFIXES = ("http://", "https://")
+
+_WS = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def collect_urls(obj, found: set[str]) -> None:
+    """Add every `url` / `path` http(s) string inside *obj* to *found*."""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if k in URL_KEYS and isinstance(v, str) and v.startswith(URL_PREFIXES):
+                found.add(v.strip())
+            collect_urls(v, found)
+    elif isinstance(obj, list):
+        for itm in obj:
+            collect_urls(itm, found)
+
+
+class SingboxReader:
+    def __init__(self, text: str):
+        self.text = text
+        self.urls: set[str] = set()
+        self.has_outbounds = False   # top-level "outbounds" array seen
+
+    def _ws(self, idx: int) -> int:
+        return _WS.match(self.text, idx).end()
+
+    def _expect(self, idx: int, chars: str) -> tuple[str, int]:
+        idx = self._ws(idx)
+        ch = self.text[idx:idx + 1]
+        if not ch or ch not in chars:
+            raise ValueError(f"expected one of {chars!r} at offset {idx}")
+        return ch, idx + 1
+
+    def _value(self, key, idx: int):
+        obj, idx = _decoder.raw_decode(self.text, idx)
+        if key in URL_KEYS and isinstance(obj, str) and obj.startswith(URL_PREFIXES):
+            self.urls.add(obj.strip())
+        collect_urls(obj, self.urls)
+        return obj, idx
+
+    def _object(self, idx: int, member) -> Iterator:
+        """Walk the members of an object whose '{' was consumed.  *member(key,
+        offset)* is a generator that consumes the value and returns its end."""
+        idx = self._ws(idx)
+        if self.text.startswith("}", idx):
+            return idx + 1
+        while True:
+            key, idx = _decoder.raw_decode(self.text, self._ws(idx))
+            _, idx = self._expect(idx, ":")
+            idx = yield from member(key, self._ws(idx))
+            ch, idx = self._expect(idx, ",}")
+            if ch == "}":
+                return idx
+
+    def _array(self, idx: int) -> Iterator:
+        """Decode and yield the elements of an array whose '[' was consumed."""
+        idx = self._ws(idx)
+        if self.text.startswith("]", idx):
+            return idx + 1
+        while True:
+            obj, idx = self._value(None, self._ws(idx))
+            yield obj
+            ch, idx = self._expect(idx, ",]")
+            if ch == "]":
+                return idx
+
+    def _leaf(self, key, idx: int) -> Iterator:
+        return self._value(key, idx)[1]
+        yield  # unreachable; makes this a generator for `yield from`
+
+    def _other(self, key, idx: int) -> int:
+        """Consume a top-level value other than outbounds, one level deep."""
+        ch = self.text[idx:idx + 1]
+        if ch == "[":
+            return _drain(self._array(idx + 1))
+        if ch == "{":
+            return _drain(self._object(idx + 1, self._leaf))
+        return self._value(key, idx)[1]
+
+    def _top(self, key, idx: int) -> Iterator:
+        if key == "outbounds" and self.text.startswith("[", idx):
+            self.has_outbounds = True
+            return (yield from self._array(idx + 1))
+        return self._other(key, idx)
+
+    def outbounds(self) -> Iterator[dict]:
+        """Yield each element of the top-level `outbounds` array.
+
+        Raises ValueError if the text is not a well-formed JSON object; the
+        error surfaces only once the bad offset is reached.
+        """
+        _, idx = self._expect(0, "{")
+        end = self._ws((yield from self._object(idx, self._top)))
+        if end != len(self.text):
+            raise ValueError(f"extra data at offset {end}")
+
+
+def _drain(gen) -> int:
+    """Exhaust a walker generator and return its end offset."""
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
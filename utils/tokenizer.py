@@ -0,0 +1,87 @@
+"""
+tokenizer.py - Single-pass proxy link tokenizer
+
+Finds every line of a text buffer that starts with a known scheme
+(`ss://`, `vmess://`, ... and `http(s)://` for child subscriptions) with one
+combined regex, and maps the matched scheme to its protocol with a dict
+lookup.  Replaces the per-line loops that tried every pattern in turn in
+extract.py and radar.py.
+
+Semantics match the old loops: leading/trailing whitespace is ignored, the
+scheme must be at the start of the line and be followed by at least one
+non-space character.
+"""
+
+import re
+from collections import defaultdict
+from typing import Iterable, Iterator, Optional
+
+# scheme -> protocol bucket
+SCHEMES = {
+    "ss": "ss",
+    "vmess": "vmess",
+    "vless": "vless",
+    "trojan": "trojan",
+    "hysteria": "hysteria",
+    "hysteria2": "hysteria",
+    "reality": "reality",
+    "http": "http",       # child URLs, not proxies
+    "https": "http",
+}
+PROXY_PROTOCOLS = frozenset(p for p in SCHEMES.values() if p != "http")
+
+_ALT = "|".join(sorted(SCHEMES, key=len, reverse=True))
+# `.*\S` (not `[^\r\n]*`) keeps the engine on its fast "any but newline" path
+LINK_RE = re.compile(r"^[^\S\n]*((" + _ALT + r")://.*\S)", re.MULTILINE)
+_NONBLANK_RE = re.compile(r"^[^\S\n]*\S", re.MULTILINE)
+
+
+def iter_tokens(text: str) -> Iterator[tuple[str, str]]:
+    """Yield (protocol, link) for every link line in *text*, in order."""
+    schemes = SCHEMES
+    for link, scheme in LINK_RE.findall(text):
+        yield schemes[scheme], link
+
+
+def iter_line_tokens(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Same as iter_tokens, for text that arrives line by line (streamed)."""
+    match, schemes = LINK_RE.match, SCHEMES
+    for line in lines:
+        m = match(line)
+        if m:
+            yield schemes[m.group(2)], m.group(1)
+
+
+def scan_lines(lines: Iterable[str]) -> tuple[list[tuple[str, str]], int]:
+    """Tokenize streamed lines; also returns how many were non-blank."""
+    match, schemes = LINK_RE.match, SCHEMES
+    tokens, nonblank = [], 0
+    for line in lines:
+        if line and not line.isspace():
+            nonblank += 1
+            m = match(line)
+            if m:
+                tokens.append((schemes[m.group(2)], m.group(1)))
+    return tokens, nonblank
+
+
+def tokenize(text: str) -> list[tuple[str, str]]:
+    schemes = SCHEMES
+    return [(schemes[scheme], link) for link, scheme in LINK_RE.findall(text)]
+
+
+def group_links(tokens: Iterable[tuple[str, str]]) -> defaultdict[str, list[str]]:
+    links: defaultdict[str, list[str]] = defaultdict(list)
+    for proto, link in tokens:
+        links[proto].append(link)
+    return links
+
+
+def classify(line: str) -> Optional[str]:
+    """Protocol of a single link, or None."""
+    m = LINK_RE.match(line)
+    return SCHEMES[m.group(2)] if m else None
+
+
+def count_nonblank(text: str) -> int:
+    return len(_NONBLANK_RE.findall(text))